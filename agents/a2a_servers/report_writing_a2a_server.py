@@ -1,7 +1,7 @@
 """Report Writing Agent A2A Server - 보고서 작성 에이전트를 A2A 서버로 래핑"""
 import os
 import json
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, List, Tuple
 from datetime import datetime
 from uuid import uuid4
 
@@ -42,6 +42,8 @@ from a2a.types import (
     UnsupportedOperationError,
 )
 
+from langchain_core.messages import AIMessageChunk
+
 from agents.agent.report_writing_agent import ReportWritingAgent, ReportWritingState
 from agents.graph_builders import create_azure_llm
 from langgraph.checkpoint.memory import InMemorySaver
@@ -69,6 +71,121 @@ class ReportWritingAgentExecutor(AgentExecutor):
             )
             self.graph = self.agent.build_graph()
     
+    @staticmethod
+    def _parse_request(parts: List[Part]) -> Tuple[str, Any, str]:
+        """메시지 파트에서 (프로젝트 이름, 실행 계획, 조사 요약) 추출"""
+        project_name = ""
+        execution_plan = {}
+        research_summary = ""
+        
+        for part in parts:
+            if isinstance(part.root, TextPart):
+                project_name = part.root.text
+            elif isinstance(part.root, DataPart):
+                data = part.root.data
+                if isinstance(data, dict):
+                    if "project_name" in data:
+                        project_name = data["project_name"]
+                    if "execution_plan" in data:
+                        execution_plan = data["execution_plan"]
+                    if "research_summary" in data:
+                        research_summary = data["research_summary"]
+        
+        return project_name, execution_plan, research_summary
+    
+    @staticmethod
+    def _build_result(project_name: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        """그래프 최종 상태에서 응답 데이터 구성"""
+        return {
+            "project_name": project_name,
+            "report_title": f"{project_name} 프로젝트 보고서",
+            "report_content": values.get("final_report", ""),
+            "report_sections": [section.title for section in values.get("sections", [])],
+            "quality_score": values.get("quality_score", 0.0),
+            "generated_at": datetime.now().isoformat()
+        }
+    
+    async def _stream_report(
+        self, project_name: str, execution_plan: Any, research_summary: str, thread_id: str
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        보고서 작성 그래프를 스트리밍으로 실행
+        
+        노드 완료 시 진행 상황("progress"), 초안 섹션("section", 개요 순서대로),
+        초안 섹션이 모두 나간 시점("draft_complete"), 최종 다듬기 LLM 토큰("token"),
+        마지막으로 전체 결과("result")를 내보냅니다.
+        """
+        if self.graph is None:
+            await self.initialize()
+        
+        initial_state = ReportWritingState(
+            topic=project_name,
+            research_data=json.dumps({
+                "execution_plan": execution_plan,
+                "research_summary": research_summary
+            }, ensure_ascii=False),
+            messages=[]
+        )
+        write_node = self.agent.get_node_name("WRITE_SECTIONS")
+        finalize_node = self.agent.get_node_name("FINALIZE")
+        
+        # 먼저 끝난 섹션은 앞 섹션이 나올 때까지 보관해 개요 순서대로 내보냄
+        pending: Dict[int, Dict[str, Any]] = {}
+        next_order = 0
+        draft_complete = False
+        final_values: Dict[str, Any] = {}
+        
+        async for mode, payload in self.graph.astream(
+            initial_state,
+            config={"configurable": {"thread_id": thread_id}},
+            stream_mode=["updates", "custom", "messages", "values"]
+        ):
+            if mode == "values":
+                final_values = payload
+            
+            elif mode == "custom":
+                # 수정 단계에서 다시 쓴 섹션은 최종 보고서에 반영되므로 초안 스트림에서는 제외
+                if draft_complete or payload.get("event") != "section_completed":
+                    continue
+                pending[payload["order"]] = payload
+                while next_order in pending:
+                    section = pending.pop(next_order)
+                    next_order += 1
+                    yield {"type": "section", "order": section["order"], "content": section["markdown"]}
+            
+            elif mode == "messages":
+                chunk, metadata = payload
+                if (
+                    isinstance(chunk, AIMessageChunk)
+                    and metadata.get("langgraph_node") == finalize_node
+                    and isinstance(chunk.content, str)
+                    and chunk.content
+                ):
+                    yield {"type": "token", "content": chunk.content}
+            
+            else:
+                for node, update in payload.items():
+                    if not update:
+                        continue
+                    if node == write_node and not draft_complete:
+                        # 작성에 실패한 섹션은 건너뛰고 남은 섹션을 순서대로 내보냄
+                        for order in sorted(pending):
+                            yield {"type": "section", "order": order, "content": pending[order]["markdown"]}
+                        pending.clear()
+                        draft_complete = True
+                        yield {"type": "draft_complete", "content": f"초안 섹션 {len(update.get('sections', []))}개 작성 완료"}
+                    elif update.get("report_outline") and node == self.agent.get_node_name("STRUCTURE"):
+                        yield {"type": "progress", "content": f"보고서 개요 작성 완료: {len(update['report_outline'])}개 섹션"}
+                    elif node == self.agent.get_node_name("REVIEW_QUALITY"):
+                        status = "수정 진행" if update.get("needs_revision") else "승인"
+                        yield {"type": "progress", "content": f"품질 검토: {update.get('quality_score', 0.0) * 100:.0f}점 ({status})"}
+        
+        yield {
+            "type": "result",
+            "content": f"{project_name} 프로젝트의 보고서가 성공적으로 작성되었습니다.",
+            "data": self._build_result(project_name, final_values)
+        }
+    
     async def execute(self, context: RequestContext, event_queue: EventQueue):
         """A2A 프로토콜에 따른 execute 메서드 구현"""
         # 에이전트 초기화
@@ -83,69 +200,57 @@ class ReportWritingAgentExecutor(AgentExecutor):
         
         try:
             # 메시지에서 데이터 추출
-            project_name = ""
-            execution_plan = {}
-            research_summary = ""
-            
-            if context.message and context.message.parts:
-                for part in context.message.parts:
-                    if isinstance(part.root, TextPart):
-                        project_name = part.root.text
-                    elif isinstance(part.root, DataPart):
-                        data = part.root.data
-                        if isinstance(data, dict):
-                            if "project_name" in data:
-                                project_name = data["project_name"]
-                            if "execution_plan" in data:
-                                execution_plan = data["execution_plan"]
-                            if "research_summary" in data:
-                                research_summary = data["research_summary"]
-            
-            # LangGraph 에이전트 실행
-            initial_state = ReportWritingState(
-                topic=project_name,  # topic 파라미터 사용
-                # research_data 파라미터 사용
-                research_data=json.dumps({
-                    "execution_plan": execution_plan,
-                    "research_summary": research_summary
-                }),
-                messages=[]
+            project_name, execution_plan, research_summary = self._parse_request(
+                context.message.parts if context.message else []
             )
             
-            # graph가 None이 아닌지 확인
-            if self.graph is None:
-                await self.initialize()
-            
-            # 비동기적으로 실행
-            final_state = await self.graph.ainvoke(
-                initial_state,
-                config={"configurable": {"thread_id": task_id}}
-            )
-            
-            # 결과 구성
-            report_content = final_state.get("final_report", {})
-            result = {
-                "project_name": project_name,
-                "report_title": report_content.get("title", f"{project_name} 프로젝트 보고서"),
-                "report_content": report_content,
-                "report_sections": list(report_content.keys()) if isinstance(report_content, dict) else [],
-                "generated_at": datetime.now().isoformat()
-            }
+            # 초안 섹션은 완성되는 대로 개요 순서에 맞춰 report_draft 아티팩트에 이어 붙이고,
+            # 최종 다듬기 토큰은 final_report 아티팩트로 보냄
+            artifact_ids = {"report_draft": str(uuid4()), "final_report": str(uuid4())}
+            started = {"report_draft": False, "final_report": False}
             
-            # 응답 메시지 생성
-            summary_text = f"{project_name} 프로젝트의 보고서가 성공적으로 작성되었습니다."
+            async def append_chunk(name: str, text: str, last_chunk: bool = False) -> None:
+                await task_updater.add_artifact(
+                    parts=[Part(root=TextPart(text=text))],
+                    artifact_id=artifact_ids[name],
+                    name=name,
+                    append=started[name],
+                    last_chunk=last_chunk
+                )
+                started[name] = True
             
-            # 태스크 완료
-            await task_updater.update_status(
-                TaskState.completed,
-                message=task_updater.new_agent_message(
-                    parts=[
-                        Part(root=TextPart(text=summary_text)),
-                        Part(root=DataPart(data=result))
-                    ]
-                ),
-                final=True  # Queue 종료를 명시
-            )
+            async for item in self._stream_report(project_name, execution_plan, research_summary, task_id):
+                if item["type"] == "section":
+                    if not started["report_draft"]:
+                        await append_chunk("report_draft", f"# {project_name}\n")
+                    await append_chunk("report_draft", item["content"])
+                elif item["type"] == "draft_complete":
+                    if started["report_draft"]:
+                        await append_chunk("report_draft", "", last_chunk=True)
+                elif item["type"] == "token":
+                    await append_chunk("final_report", item["content"])
+                elif item["type"] == "progress":
+                    await task_updater.update_status(
+                        TaskState.working,
+                        message=task_updater.new_agent_message(
+                            parts=[Part(root=TextPart(text=item["content"]))]
+                        )
+                    )
+                else:
+                    if started["final_report"]:
+                        await append_chunk("final_report", "", last_chunk=True)
+                    
+                    # 태스크 완료
+                    await task_updater.update_status(
+                        TaskState.completed,
+                        message=task_updater.new_agent_message(
+                            parts=[
+                                Part(root=TextPart(text=item["content"])),
+                                Part(root=DataPart(data=item["data"]))
+                            ]
+                        ),
+                        final=True  # Queue 종료를 명시
+                    )
             
         except Exception as e:
             # 오류 처리
@@ -181,22 +286,7 @@ class ReportWritingAgentExecutor(AgentExecutor):
         await self.initialize()
         
         # 메시지에서 데이터 추출
-        project_name = ""
-        execution_plan = {}
-        research_summary = ""
-        
-        for part in request.params.message.parts:
-            if isinstance(part.root, TextPart):
-                project_name = part.root.text
-            elif isinstance(part.root, DataPart):
-                data = part.root.data
-                if isinstance(data, dict):
-                    if "project_name" in data:
-                        project_name = data["project_name"]
-                    if "execution_plan" in data:
-                        execution_plan = data["execution_plan"]
-                    if "research_summary" in data:
-                        research_summary = data["research_summary"]
+        project_name, execution_plan, research_summary = self._parse_request(request.params.message.parts)
         
         # 새로운 태스크 생성 (태스크는 핸들러가 관리)
         task_id = str(uuid4())
@@ -211,10 +301,10 @@ class ReportWritingAgentExecutor(AgentExecutor):
             # LangGraph 에이전트 실행
             initial_state = ReportWritingState(
                 topic=project_name,  # topic 파라미터 사용
-                research_data={  # research_data 파라미터 사용
+                research_data=json.dumps({  # research_data는 문자열 필드
                     "execution_plan": execution_plan,
                     "research_summary": research_summary
-                },
+                }, ensure_ascii=False),
                 messages=[]
             )
             
@@ -229,14 +319,7 @@ class ReportWritingAgentExecutor(AgentExecutor):
             )
             
             # 결과 구성
-            report_content = final_state.get("final_report", {})
-            result = {
-                "project_name": project_name,
-                "report_title": report_content.get("title", f"{project_name} 프로젝트 보고서"),
-                "report_content": report_content,
-                "report_sections": list(report_content.keys()) if isinstance(report_content, dict) else [],
-                "generated_at": datetime.now().isoformat()
-            }
+            result = self._build_result(project_name, final_state)
             
             # 응답 메시지 생성
             summary_text = f"{project_name} 프로젝트의 보고서가 성공적으로 작성되었습니다."
@@ -281,22 +364,7 @@ class ReportWritingAgentExecutor(AgentExecutor):
         await self.initialize()
         
         # 메시지에서 데이터 추출
-        project_name = ""
-        execution_plan = {}
-        research_summary = ""
-        
-        for part in request.params.message.parts:
-            if isinstance(part.root, TextPart):
-                project_name = part.root.text
-            elif isinstance(part.root, DataPart):
-                data = part.root.data
-                if isinstance(data, dict):
-                    if "project_name" in data:
-                        project_name = data["project_name"]
-                    if "execution_plan" in data:
-                        execution_plan = data["execution_plan"]
-                    if "research_summary" in data:
-                        research_summary = data["research_summary"]
+        project_name, execution_plan, research_summary = self._parse_request(request.params.message.parts)
         
         # 새로운 태스크 생성
         task_id = str(uuid4())
@@ -323,98 +391,23 @@ class ReportWritingAgentExecutor(AgentExecutor):
         )
         
         try:
-            # LangGraph 에이전트 실행
-            initial_state = ReportWritingState(
-                topic=project_name,  # topic 파라미터 사용
-                research_data={  # research_data 파라미터 사용
-                    "execution_plan": execution_plan,
-                    "research_summary": research_summary
-                },
-                messages=[]
-            )
-            
-            # graph가 None이 아닌지 확인
-            if self.graph is None:
-                await self.initialize()
-            
-            # 스트리밍으로 실행
-            async for chunk in self.graph.astream(
-                initial_state,
-                config={"configurable": {"thread_id": task_id}}
-            ):
-                # 중간 상태 업데이트 전송
-                if "executive_summary" in chunk and chunk["executive_summary"]:
-                    update_message = Message(
-                        role=Role.agent,
-                        parts=[Part(root=TextPart(text="경영진 요약 작성 중..."))],
-                        messageId=str(uuid4())
-                    )
-                    yield SendStreamingMessageResponse(
-                        root=SendStreamingMessageSuccessResponse(
-                            id=request.id,
-                            result=update_message
+            # 진행 상황, 완성된 초안 섹션, 최종 보고서 토큰을 받는 즉시 메시지로 전송
+            async for item in self._stream_report(project_name, execution_plan, research_summary, task_id):
+                parts = [Part(root=TextPart(text=item["content"]))]
+                if item["type"] == "result":
+                    parts.append(Part(root=DataPart(data=item["data"])))
+                
+                yield SendStreamingMessageResponse(
+                    root=SendStreamingMessageSuccessResponse(
+                        id=request.id,
+                        result=Message(
+                            role=Role.agent,
+                            parts=parts,
+                            messageId=str(uuid4()),
+                            metadata={"event": item["type"]}
                         )
                     )
-                    
-                elif "sections" in chunk and chunk["sections"]:
-                    section_count = len(chunk["sections"])
-                    update_message = Message(
-                        role=Role.agent,
-                        parts=[Part(root=TextPart(text=f"보고서 섹션 작성 중: {section_count}개 섹션 완료"))],
-                        messageId=str(uuid4())
-                    )
-                    yield SendStreamingMessageResponse(
-                        root=SendStreamingMessageSuccessResponse(
-                            id=request.id,
-                            result=update_message
-                        )
-                    )
-                    
-                elif "final_report" in chunk and chunk["final_report"]:
-                    update_message = Message(
-                        role=Role.agent,
-                        parts=[Part(root=TextPart(text="최종 보고서 생성 중..."))],
-                        messageId=str(uuid4())
-                    )
-                    yield SendStreamingMessageResponse(
-                        root=SendStreamingMessageSuccessResponse(
-                            id=request.id,
-                            result=update_message
-                        )
-                    )
-            
-            # 최종 상태 가져오기
-            final_state = await self.graph.aget_state(
-                config={"configurable": {"thread_id": task_id}}
-            )
-            
-            # 결과 구성
-            report_content = final_state.values.get("final_report", {})
-            result = {
-                "project_name": project_name,
-                "report_title": report_content.get("title", f"{project_name} 프로젝트 보고서"),
-                "report_content": report_content,
-                "report_sections": list(report_content.keys()) if isinstance(report_content, dict) else [],
-                "generated_at": datetime.now().isoformat()
-            }
-            
-            # 최종 결과 전송
-            summary_text = f"{project_name} 프로젝트의 보고서가 성공적으로 작성되었습니다."
-            final_message = Message(
-                role=Role.agent,
-                parts=[
-                    Part(root=TextPart(text=summary_text)),
-                    Part(root=DataPart(data=result))
-                ],
-                messageId=str(uuid4())
-            )
-            
-            yield SendStreamingMessageResponse(
-                root=SendStreamingMessageSuccessResponse(
-                    id=request.id,
-                    result=final_message
                 )
-            )
             
         except Exception as e:
             # 오류 메시지 전송
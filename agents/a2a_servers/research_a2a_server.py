@@ -1,6 +1,6 @@
 """Research Agent A2A Server - 자료조사 에이전트를 A2A 서버로 래핑"""
 import os
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 from uuid import uuid4
 
 from a2a.server.agent_execution.agent_executor import AgentExecutor
@@ -35,6 +35,8 @@ from a2a.types import (
     UnsupportedOperationError,
 )
 
+from langchain_core.messages import AIMessageChunk
+
 from agents.agent.research_agent import ResearchAgent, ResearchState
 from agents.graph_builders import create_azure_llm
 from agents.tools.mcp_client import get_mcp_client
@@ -71,6 +73,76 @@ class ResearchAgentExecutor(AgentExecutor):
             )
             self.graph = self.agent.build_graph()
     
+    @staticmethod
+    def _build_result(values: Dict[str, Any]) -> Dict[str, Any]:
+        """그래프 최종 상태에서 응답 데이터 구성"""
+        return {
+            "search_keywords": values.get("search_keywords", []),
+            "web_results": [r.dict() for r in values.get("web_results", [])],
+            "vector_results": [r.dict() for r in values.get("vector_results", [])],
+            "aggregated_results": [r.dict() for r in values.get("aggregated_results", [])],
+            "research_summary": values.get("research_summary", ""),
+            "sources_cited": values.get("sources_cited", [])
+        }
+    
+    async def _stream_research(self, query: str, thread_id: str) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        자료조사 그래프를 스트리밍으로 실행
+        
+        노드 완료 시 진행 상황("progress"), 요약 노드의 LLM 토큰("token"),
+        마지막으로 전체 결과("result")를 순서대로 내보냅니다.
+        """
+        if self.graph is None:
+            await self.initialize()
+        
+        initial_state = ResearchState(
+            research_query=query,
+            messages=[]
+        )
+        config = {"configurable": {"thread_id": thread_id}}
+        summarize_node = self.agent.get_node_name("SUMMARIZE")
+        final_values: Dict[str, Any] = {}
+        
+        # updates: 노드별 상태 변경, messages: 노드 안에서 호출한 LLM의 토큰 청크, values: 전체 상태
+        async for mode, payload in self.graph.astream(
+            initial_state,
+            config=config,
+            stream_mode=["updates", "messages", "values"]
+        ):
+            if mode == "values":
+                final_values = payload
+                continue
+            if mode == "messages":
+                chunk, metadata = payload
+                # 키워드 추출 등 다른 노드의 LLM 출력과 노드가 반환한 완성 메시지는 제외
+                if (
+                    isinstance(chunk, AIMessageChunk)
+                    and metadata.get("langgraph_node") == summarize_node
+                    and isinstance(chunk.content, str)
+                    and chunk.content
+                ):
+                    yield {"type": "token", "content": chunk.content}
+                continue
+            
+            for update in payload.values():
+                if not update:
+                    continue
+                if update.get("search_keywords"):
+                    keywords = ", ".join(update["search_keywords"][:3])
+                    yield {"type": "progress", "content": f"검색 키워드 추출: {keywords}..."}
+                elif "web_results" in update:
+                    yield {"type": "progress", "content": f"웹 검색 완료: {len(update['web_results'])}개 결과"}
+                elif "vector_results" in update:
+                    yield {"type": "progress", "content": f"벡터 검색 완료: {len(update['vector_results'])}개 결과"}
+                elif "aggregated_results" in update:
+                    yield {"type": "progress", "content": f"결과 통합 완료: {len(update['aggregated_results'])}개 자료, 요약 작성 중..."}
+        
+        yield {
+            "type": "result",
+            "content": final_values.get("research_summary") or "조사가 완료되었습니다.",
+            "data": self._build_result(final_values)
+        }
+    
     async def execute(self, context: RequestContext, event_queue: EventQueue):
         """A2A 프로토콜에 따른 execute 메서드 구현"""
         # 에이전트 초기화
@@ -92,46 +164,49 @@ class ResearchAgentExecutor(AgentExecutor):
                     if isinstance(part.root, TextPart):
                         message_text += part.root.text
             
-            # LangGraph 에이전트 실행
-            initial_state = ResearchState(
-                research_query=message_text,
-                messages=[]
-            )
-            
-            # graph가 None이 아닌지 확인
-            if self.graph is None:
-                await self.initialize()
-            
-            # 비동기적으로 실행
-            final_state = await self.graph.ainvoke(
-                initial_state,
-                config={"configurable": {"thread_id": task_id}}
-            )
+            # 요약 토큰은 하나의 아티팩트에 이어 붙이는 청크로 바로 전송
+            summary_artifact_id = str(uuid4())
+            summary_started = False
             
-            # 결과 구성
-            result = {
-                "search_keywords": final_state.get("search_keywords", []),
-                "web_results": [r.dict() for r in final_state.get("web_results", [])],
-                "vector_results": [r.dict() for r in final_state.get("vector_results", [])],
-                "aggregated_results": [r.dict() for r in final_state.get("aggregated_results", [])],
-                "research_summary": final_state.get("research_summary", ""),
-                "sources_cited": final_state.get("sources_cited", [])
-            }
-            
-            # 응답 메시지 생성
-            summary_text = final_state.get("research_summary", "조사가 완료되었습니다.")
-            
-            # 태스크 완료
-            await task_updater.update_status(
-                TaskState.completed,
-                message=task_updater.new_agent_message(
-                    parts=[
-                        Part(root=TextPart(text=summary_text)),
-                        Part(root=DataPart(data=result))
-                    ]
-                ),
-                final=True  # Queue 종료를 명시
-            )
+            async for item in self._stream_research(message_text, task_id):
+                if item["type"] == "token":
+                    await task_updater.add_artifact(
+                        parts=[Part(root=TextPart(text=item["content"]))],
+                        artifact_id=summary_artifact_id,
+                        name="research_summary",
+                        append=summary_started,
+                        last_chunk=False
+                    )
+                    summary_started = True
+                elif item["type"] == "progress":
+                    await task_updater.update_status(
+                        TaskState.working,
+                        message=task_updater.new_agent_message(
+                            parts=[Part(root=TextPart(text=item["content"]))]
+                        )
+                    )
+                else:
+                    if summary_started:
+                        # 요약 아티팩트 종료 표시
+                        await task_updater.add_artifact(
+                            parts=[Part(root=TextPart(text=""))],
+                            artifact_id=summary_artifact_id,
+                            name="research_summary",
+                            append=True,
+                            last_chunk=True
+                        )
+                    
+                    # 태스크 완료 (전체 요약과 결과 데이터 포함)
+                    await task_updater.update_status(
+                        TaskState.completed,
+                        message=task_updater.new_agent_message(
+                            parts=[
+                                Part(root=TextPart(text=item["content"])),
+                                Part(root=DataPart(data=item["data"]))
+                            ]
+                        ),
+                        final=True  # Queue 종료를 명시
+                    )
             
         except Exception as e:
             # 오류 처리
@@ -264,109 +339,23 @@ class ResearchAgentExecutor(AgentExecutor):
         )
         
         try:
-            # LangGraph 에이전트 실행
-            initial_state = ResearchState(
-                research_query=message_text,
-                messages=[]
-            )
-            
-            # graph가 None이 아닌지 확인
-            if self.graph is None:
-                await self.initialize()
-            
-            # 스트리밍으로 실행
-            async for chunk in self.graph.astream_events(
-                initial_state,
-                config={"configurable": {"thread_id": task_id}}
-            ):
-                # 중간 상태 업데이트 전송
-                if "search_keywords" in chunk and chunk["search_keywords"]:
-                    keywords = ", ".join(chunk["search_keywords"][:3])
-                    update_message = Message(
-                        role=Role.agent,
-                        parts=[Part(root=TextPart(text=f"검색 키워드 추출: {keywords}..."))],
-                        messageId=str(uuid4())
-                    )
-                    yield SendStreamingMessageResponse(
-                        root=SendStreamingMessageSuccessResponse(
-                            id=request.id,
-                            result=update_message
-                        )
-                    )
-                    
-                elif "web_results" in chunk and chunk["web_results"]:
-                    count = len(chunk["web_results"])
-                    update_message = Message(
-                        role=Role.agent,
-                        parts=[Part(root=TextPart(text=f"웹 검색 완료: {count}개 결과"))],
-                        messageId=str(uuid4())
-                    )
-                    yield SendStreamingMessageResponse(
-                        root=SendStreamingMessageSuccessResponse(
-                            id=request.id,
-                            result=update_message
-                        )
-                    )
-                    
-                elif "vector_results" in chunk and chunk["vector_results"]:
-                    count = len(chunk["vector_results"])
-                    update_message = Message(
-                        role=Role.agent,
-                        parts=[Part(root=TextPart(text=f"벡터 검색 완료: {count}개 결과"))],
-                        messageId=str(uuid4())
-                    )
-                    yield SendStreamingMessageResponse(
-                        root=SendStreamingMessageSuccessResponse(
-                            id=request.id,
-                            result=update_message
-                        )
-                    )
-                    
-                elif "research_summary" in chunk and chunk["research_summary"]:
-                    update_message = Message(
-                        role=Role.agent,
-                        parts=[Part(root=TextPart(text="조사 결과 요약 중..."))],
-                        messageId=str(uuid4())
-                    )
-                    yield SendStreamingMessageResponse(
-                        root=SendStreamingMessageSuccessResponse(
-                            id=request.id,
-                            result=update_message
+            # 진행 상황과 요약 토큰을 받는 즉시 메시지로 전송
+            async for item in self._stream_research(message_text, task_id):
+                parts = [Part(root=TextPart(text=item["content"]))]
+                if item["type"] == "result":
+                    parts.append(Part(root=DataPart(data=item["data"])))
+                
+                yield SendStreamingMessageResponse(
+                    root=SendStreamingMessageSuccessResponse(
+                        id=request.id,
+                        result=Message(
+                            role=Role.agent,
+                            parts=parts,
+                            messageId=str(uuid4()),
+                            metadata={"event": item["type"]}
                         )
                     )
-            
-            # 최종 상태 가져오기
-            final_state = await self.graph.aget_state(
-                config={"configurable": {"thread_id": task_id}}
-            )
-            
-            # 결과 구성
-            result = {
-                "search_keywords": final_state.values.get("search_keywords", []),
-                "web_results": [r.dict() for r in final_state.values.get("web_results", [])],
-                "vector_results": [r.dict() for r in final_state.values.get("vector_results", [])],
-                "aggregated_results": [r.dict() for r in final_state.values.get("aggregated_results", [])],
-                "research_summary": final_state.values.get("research_summary", ""),
-                "sources_cited": final_state.values.get("sources_cited", [])
-            }
-            
-            # 최종 결과 전송
-            summary_text = final_state.values.get("research_summary", "조사가 완료되었습니다.")
-            final_message = Message(
-                role=Role.agent,
-                parts=[
-                    Part(root=TextPart(text=summary_text)),
-                    Part(root=DataPart(data=result))
-                ],
-                messageId=str(uuid4())
-            )
-            
-            yield SendStreamingMessageResponse(
-                root=SendStreamingMessageSuccessResponse(
-                    id=request.id,
-                    result=final_message
                 )
-            )
             
         except Exception as e:
             # 오류 메시지 전송
@@ -1,16 +1,19 @@
 """계획 수립 에이전트: 사용자 요청을 분석하고 작업 계획을 수립하는 에이전트"""
-from typing import Any, ClassVar, List, Dict, Literal, cast
+import json
+import re
+from typing import Any, ClassVar, List, Dict, Literal, Optional, cast
 from enum import Enum
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.runnables import RunnableConfig
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import AIMessage, BaseMessage
 from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph, END
 from langgraph.store.base import BaseStore
 from pydantic import BaseModel, Field
 
 from agents.base import BaseAgent, BaseState
+from agents.base.llm_client import LLM_CACHE_DIR
 
 
 class TaskType(str, Enum):
@@ -64,6 +67,8 @@ class PlanningAgent(BaseAgent):
         max_retry_attempts: int = 2,
         agent_name: str = "PlanningAgent",
         is_debug: bool = True,
+        llm_cache_size: int = 0,
+        llm_cache_dir: str | None = LLM_CACHE_DIR,
     ) -> None:
         super().__init__(
             model=model,
@@ -76,6 +81,8 @@ class PlanningAgent(BaseAgent):
             max_retry_attempts=max_retry_attempts,
             agent_name=agent_name,
             is_debug=is_debug,
+            llm_cache_size=llm_cache_size,
+            llm_cache_dir=llm_cache_dir,
         )
 
     def init_nodes(self, graph: StateGraph):
@@ -107,9 +114,7 @@ class PlanningAgent(BaseAgent):
     async def analyze_request(self, state: PlanningState, config: RunnableConfig) -> PlanningState:
         """사용자 요청 분석"""
         try:
-            prompt = f"""다음 사용자 요청을 분석하고 주요 의도와 목표를 파악하세요:
-
-사용자 요청: {state.user_request}
+            instructions = """사용자 요청을 분석하고 주요 의도와 목표를 파악하세요.
 
 다음 사항을 분석하세요:
 1. 주요 목표는 무엇인가?
@@ -119,7 +124,9 @@ class PlanningAgent(BaseAgent):
 
 분석 결과를 간결하게 요약하세요."""
 
-            response = await self.model.ainvoke([HumanMessage(content=prompt)], config)
+            response = await self.llm.ainvoke(
+                instructions, f"사용자 요청: {state.user_request}", config, name="analyze_request"
+            )
             state.analyzed_intent = response.content
             
             if self.is_debug:
@@ -136,10 +143,7 @@ class PlanningAgent(BaseAgent):
     async def create_plan(self, state: PlanningState, config: RunnableConfig) -> PlanningState:
         """작업 계획 생성"""
         try:
-            prompt = f"""다음 분석된 의도를 바탕으로 구체적인 작업 계획을 수립하세요:
-
-원본 요청: {state.user_request}
-분석된 의도: {state.analyzed_intent}
+            instructions = """분석된 의도를 바탕으로 구체적인 작업 계획을 수립하세요.
 
 다음 형식으로 작업들을 생성하세요:
 1. 각 작업은 명확한 목표와 설명을 가져야 합니다
@@ -149,38 +153,38 @@ class PlanningAgent(BaseAgent):
 
 JSON 형식으로 작업 목록을 반환하세요:
 [
-  {{
+  {
     "id": "task_1",
     "type": "research",
     "description": "작업 설명",
     "priority": 5,
     "dependencies": [],
     "assigned_agent": "research_agent",
-    "parameters": {{}}
-  }}
+    "parameters": {}
+  }
 ]"""
 
-            response = await self.model.ainvoke([HumanMessage(content=prompt)], config)
+            response = await self.llm.ainvoke(
+                instructions,
+                f"원본 요청: {state.user_request}\n분석된 의도: {state.analyzed_intent}",
+                config,
+                name="create_plan",
+                # 파싱에 실패하는 응답은 캐시하지 않아 재실행 시 같은 오류가 반복되지 않음
+                cacheable=self._is_valid_plan,
+            )
             
             # 응답을 파싱하여 작업 목록 생성
-            import json
-            import re
-            
-            # JSON 블록 추출
-            json_match = re.search(r'\[.*\]', str(response.content), re.DOTALL)
-            if json_match:
-                tasks_data = json.loads(json_match.group())
-                state.tasks = [Task(**task_data) for task_data in tasks_data]
+            tasks = self._parse_tasks(str(response.content))
+            if tasks is not None:
+                state.tasks = tasks
             
             # 실행 계획 설명 생성
-            plan_prompt = f"""다음 작업들에 대한 전체 실행 계획을 간단히 설명하세요:
-
-작업 목록:
-{json.dumps([task.dict() for task in state.tasks], ensure_ascii=False, indent=2)}
-
-계획을 2-3문장으로 요약하세요."""
-
-            plan_response = await self.model.ainvoke([HumanMessage(content=plan_prompt)], config)
+            plan_response = await self.llm.ainvoke(
+                "주어진 작업들에 대한 전체 실행 계획을 2-3문장으로 간단히 요약하세요.",
+                f"작업 목록:\n{json.dumps([task.dict() for task in state.tasks], ensure_ascii=False, indent=2)}",
+                config,
+                name="summarize_plan",
+            )
             state.execution_plan = cast(str, plan_response.content)
             
             if self.is_debug:
@@ -195,16 +199,27 @@ JSON 형식으로 작업 목록을 반환하세요:
                 print(f"[{self.agent_name}] 계획 생성 중 오류: {e}")
             raise e
 
+    @staticmethod
+    def _parse_tasks(content: str) -> Optional[List[Task]]:
+        """응답의 JSON 블록을 작업 목록으로 변환 (JSON 블록이 없으면 None)"""
+        json_match = re.search(r'\[.*\]', content, re.DOTALL)
+        if not json_match:
+            return None
+        tasks_data = json.loads(json_match.group())
+        return [Task(**task_data) for task_data in tasks_data]
+
+    def _is_valid_plan(self, response: BaseMessage) -> bool:
+        """작업 목록으로 파싱되는 응답인지 확인"""
+        try:
+            return self._parse_tasks(str(response.content)) is not None
+        except (ValueError, TypeError):
+            return False
+
     async def review_plan(self, state: PlanningState, config: RunnableConfig) -> PlanningState:
         """계획 검토 및 승인"""
         try:
             # 계획 품질 검토
-            review_prompt = f"""다음 계획을 검토하고 품질을 평가하세요:
-
-원본 요청: {state.user_request}
-분석된 의도: {state.analyzed_intent}
-실행 계획: {state.execution_plan}
-작업 수: {len(state.tasks)}
+            instructions = """주어진 계획을 검토하고 품질을 평가하세요.
 
 다음 기준으로 평가하세요:
 1. 계획이 사용자 요청을 충족하는가?
@@ -214,7 +229,15 @@ JSON 형식으로 작업 목록을 반환하세요:
 
 계획이 적절하면 "승인", 수정이 필요하면 "수정필요"로 답하고 이유를 설명하세요."""
 
-            response = await self.model.ainvoke([HumanMessage(content=review_prompt)], config)
+            response = await self.llm.ainvoke(
+                instructions,
+                f"""원본 요청: {state.user_request}
+분석된 의도: {state.analyzed_intent}
+실행 계획: {state.execution_plan}
+작업 수: {len(state.tasks)}""",
+                config,
+                name="review_plan",
+            )
             
             # 승인 여부 판단
             if "승인" in response.content and "수정필요" not in response.content:
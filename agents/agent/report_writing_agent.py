@@ -1,16 +1,22 @@
 """보고서 작성 에이전트: 수집된 정보를 바탕으로 구조화된 보고서를 생성하는 에이전트"""
+import asyncio
+import re
+import time
 from typing import Any, ClassVar, List, Dict, Literal
 from datetime import datetime
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.runnables import RunnableConfig
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import AIMessage
 from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, END
 from langgraph.store.base import BaseStore
 from pydantic import BaseModel, Field
 
 from agents.base import BaseAgent, BaseState
+from agents.base.llm_client import LLM_CACHE_DIR
+from agents.utils.retrieval import build_index, chunk_text, flatten_research_data
 
 
 class ReportSection(BaseModel):
@@ -25,6 +31,7 @@ class ReportWritingState(BaseState):
     """보고서 작성 에이전트의 상태"""
     topic: str = Field(description="보고서 주제")
     research_data: str = Field(description="조사된 데이터")
+    research_chunks: List[str] = Field(default_factory=list, description="섹션별 검색을 위해 나눈 조사 데이터 청크")
     report_outline: List[str] = Field(default_factory=list, description="보고서 개요")
     sections: List[ReportSection] = Field(default_factory=list, description="보고서 섹션")
     draft_report: str = Field(default="", description="초안")
@@ -33,12 +40,17 @@ class ReportWritingState(BaseState):
     report_metadata: Dict[str, Any] = Field(default_factory=dict, description="보고서 메타데이터")
     quality_score: float = Field(default=0.0, description="품질 점수")
     needs_revision: bool = Field(default=False, description="수정 필요 여부")
+    review_feedback: str = Field(default="", description="품질 검토 전체 피드백")
+    section_feedback: Dict[int, str] = Field(default_factory=dict, description="섹션 순서별 수정 사유")
+    sections_to_revise: List[int] = Field(default_factory=list, description="다시 작성할 섹션 순서 (비어 있으면 전체)")
+    revision_count: int = Field(default=0, description="수정 횟수")
 
 
 class ReportWritingAgent(BaseAgent):
     """보고서 작성 에이전트"""
     
     NODE_NAMES: ClassVar[dict[str, str]] = {
+        "PREPARE_DATA": "prepare_research_data",
         "STRUCTURE": "structure_content",
         "WRITE_SECTIONS": "write_sections",
         "COMPILE_DRAFT": "compile_draft",
@@ -58,7 +70,39 @@ class ReportWritingAgent(BaseAgent):
         max_retry_attempts: int = 2,
         agent_name: str = "ReportWritingAgent",
         is_debug: bool = True,
+        max_concurrent_sections: int = 4,
+        section_rate_limit: float = 0.0,
+        section_max_retries: int = 2,
+        section_retry_backoff: float = 1.0,
+        max_revisions: int = 2,
+        chunk_chars: int = 600,
+        passages_per_section: int = 4,
+        llm_cache_size: int = 0,
+        llm_cache_dir: str | None = LLM_CACHE_DIR,
     ) -> None:
+        """
+        보고서 작성 에이전트 초기화
+        
+        Args:
+            max_concurrent_sections: 동시에 작성할 최대 섹션 수
+            section_rate_limit: 섹션 작성 LLM 호출의 초당 최대 시작 수 (0이면 제한 없음)
+            section_max_retries: 섹션별 재시도 횟수 (실패한 섹션만 다시 작성)
+            section_retry_backoff: 재시도 대기 시간(초), 시도할 때마다 두 배로 늘어남
+            max_revisions: 품질 검토 후 섹션을 다시 작성하는 최대 횟수
+            chunk_chars: 조사 데이터 청크의 목표 길이(문자)
+            passages_per_section: 섹션 프롬프트에 넣을 관련 청크 수 (BM25 상위)
+            llm_cache_size: LLM 응답 메모리 캐시 크기 (기본값 0: 사용 안 함)
+            llm_cache_dir: LLM 응답 디스크 캐시 디렉터리 (기본값: LLM_CACHE_DIR 환경 변수)
+        """
+        self.max_concurrent_sections = max_concurrent_sections
+        self.section_rate_limit = section_rate_limit
+        self.section_max_retries = section_max_retries
+        self.section_retry_backoff = section_retry_backoff
+        self.max_revisions = max_revisions
+        self.chunk_chars = chunk_chars
+        self.passages_per_section = passages_per_section
+        self._rate_limit_lock = asyncio.Lock()
+        self._next_call_at = 0.0
         super().__init__(
             model=model,
             state_schema=state_schema,
@@ -70,16 +114,20 @@ class ReportWritingAgent(BaseAgent):
             max_retry_attempts=max_retry_attempts,
             agent_name=agent_name,
             is_debug=is_debug,
+            llm_cache_size=llm_cache_size,
+            llm_cache_dir=llm_cache_dir,
         )
 
     def init_nodes(self, graph: StateGraph):
         """그래프에 노드 초기화"""
+        prepare_node = self.get_node_name("PREPARE_DATA")
         structure_node = self.get_node_name("STRUCTURE")
         write_sections_node = self.get_node_name("WRITE_SECTIONS")
         compile_draft_node = self.get_node_name("COMPILE_DRAFT")
         review_quality_node = self.get_node_name("REVIEW_QUALITY")
         finalize_node = self.get_node_name("FINALIZE")
         
+        graph.add_node(prepare_node, self.prepare_research_data)
         graph.add_node(structure_node, self.structure_content)
         graph.add_node(write_sections_node, self.write_sections)
         graph.add_node(compile_draft_node, self.compile_draft)
@@ -88,6 +136,7 @@ class ReportWritingAgent(BaseAgent):
 
     def init_edges(self, graph: StateGraph):
         """그래프에 엣지 초기화"""
+        prepare_node = self.get_node_name("PREPARE_DATA")
         structure_node = self.get_node_name("STRUCTURE")
         write_sections_node = self.get_node_name("WRITE_SECTIONS")
         compile_draft_node = self.get_node_name("COMPILE_DRAFT")
@@ -95,7 +144,8 @@ class ReportWritingAgent(BaseAgent):
         finalize_node = self.get_node_name("FINALIZE")
         
         # 워크플로우 정의
-        graph.set_entry_point(structure_node)
+        graph.set_entry_point(prepare_node)
+        graph.add_edge(prepare_node, structure_node)
         graph.add_edge(structure_node, write_sections_node)
         graph.add_edge(write_sections_node, compile_draft_node)
         graph.add_edge(compile_draft_node, review_quality_node)
@@ -112,15 +162,28 @@ class ReportWritingAgent(BaseAgent):
         
         graph.add_edge(finalize_node, END)
 
+    async def prepare_research_data(self, state: ReportWritingState, config: RunnableConfig) -> ReportWritingState:
+        """조사 데이터 전체를 청크로 분할 (섹션 작성 시 BM25로 관련 청크만 검색)"""
+        try:
+            state.research_chunks = chunk_text(
+                flatten_research_data(state.research_data), chunk_chars=self.chunk_chars
+            )
+            
+            if self.is_debug:
+                print(f"[{self.agent_name}] 조사 데이터 분할 완료:")
+                print(f"  청크 수: {len(state.research_chunks)} (원문 {len(state.research_data)} 문자)")
+            
+            return state
+            
+        except Exception as e:
+            if self.is_debug:
+                print(f"[{self.agent_name}] 조사 데이터 분할 중 오류: {e}")
+            raise e
+
     async def structure_content(self, state: ReportWritingState, config: RunnableConfig) -> ReportWritingState:
         """콘텐츠 구조화 및 개요 작성"""
         try:
-            prompt = f"""다음 주제와 조사 데이터를 바탕으로 체계적인 보고서 개요를 작성하세요:
-
-주제: {state.topic}
-
-조사 데이터:
-{state.research_data[:2000]}...
+            instructions = """주제와 조사 데이터를 바탕으로 체계적인 보고서 개요를 작성하세요.
 
 다음 형식으로 보고서 개요를 작성하세요:
 1. 제목
@@ -133,7 +196,14 @@ class ReportWritingAgent(BaseAgent):
 
 각 섹션의 제목과 간단한 설명을 포함하세요."""
 
-            response = await self.model.ainvoke([HumanMessage(content=prompt)], config)
+            response = await self.llm.ainvoke(
+                instructions,
+                f"주제: {state.topic}\n\n조사 데이터:\n{state.research_data[:2000]}...",
+                config,
+                name="structure_content",
+                # 개요 항목이 없는 응답은 캐시하지 않음
+                cacheable=lambda message: bool(str(message.content).strip()),
+            )
             
             # 개요 파싱
             outline_lines = response.content.strip().split('\n')
@@ -159,19 +229,96 @@ class ReportWritingAgent(BaseAgent):
             raise e
 
     async def write_sections(self, state: ReportWritingState, config: RunnableConfig) -> ReportWritingState:
-        """섹션별 내용 작성"""
+        """섹션별 내용 작성 (섹션을 동시에 작성하고 order로 순서 유지)
+        
+        수정 단계에서는 품질 검토가 지적한 섹션과 이전에 작성에 실패한 섹션만 다시 작성하고
+        나머지 섹션은 그대로 재사용합니다.
+        """
         try:
-            state.sections = []
+            existing = {section.order: section for section in state.sections}
+            if state.needs_revision:
+                state.revision_count += 1
+            if state.needs_revision and existing and state.sections_to_revise:
+                targets = sorted(
+                    set(state.sections_to_revise)
+                    | {i for i in range(len(state.report_outline)) if i not in existing}
+                )
+                kept = [section for order, section in existing.items() if order not in targets]
+            else:
+                targets = list(range(len(state.report_outline)))
+                kept = []
             
-            for i, outline_item in enumerate(state.report_outline):
-                # 각 섹션에 대한 내용 생성
-                section_prompt = f"""다음 섹션에 대한 내용을 작성하세요:
-
-섹션: {outline_item}
-주제: {state.topic}
+            # stream_mode="custom"으로 실행하면 완성된 섹션을 바로 받아볼 수 있음
+            stream_writer = get_stream_writer()
+            
+            # 청크 인덱스는 한 번만 만들고 모든 섹션(과 수정 단계)이 공유
+            index = build_index(tuple(state.research_chunks)) if state.research_chunks else None
+            semaphore = asyncio.Semaphore(max(1, self.max_concurrent_sections))
+            
+            async def write(order: int) -> ReportSection:
+                outline_item = state.report_outline[order]
+                if index is not None:
+                    hits = index.search(f"{outline_item} {state.topic}", top_k=self.passages_per_section)
+                    # 관련 청크가 없으면 앞부분 청크로 대체하고, 원문 순서대로 배치
+                    indices = sorted(i for i, _ in hits) or list(range(min(self.passages_per_section, len(index.documents))))
+                    reference = "\n\n".join(index.documents[i] for i in indices)
+                else:
+                    reference = f"{state.research_data[:1500]}..."
+                
+                async with semaphore:
+                    section = await self._write_section(
+                        state, order, outline_item, reference, config,
+                        feedback=state.section_feedback.get(order, state.review_feedback) if state.needs_revision else ""
+                    )
+                stream_writer({
+                    "event": "section_completed",
+                    "order": section.order,
+                    "title": section.title,
+                    "markdown": f"{self.section_heading(section)}\n{section.content}",
+                    "revision": state.revision_count,
+                })
+                return section
+            
+            results = await asyncio.gather(*(write(order) for order in targets), return_exceptions=True)
+            
+            written = [result for result in results if isinstance(result, ReportSection)]
+            failed = [
+                state.report_outline[order] for order, result in zip(targets, results)
+                if not isinstance(result, ReportSection)
+            ]
+            if failed and not written and not kept:
+                # 모든 섹션이 실패한 경우에만 노드 실패로 처리
+                raise next(result for result in results if isinstance(result, BaseException))
+            
+            state.sections = sorted(kept + written, key=lambda x: x.order)
+            state.report_metadata["failed_sections"] = failed
+            
+            if self.is_debug:
+                if kept:
+                    print(f"[{self.agent_name}] 섹션 수정: {len(targets)}개 다시 작성, {len(kept)}개 재사용")
+                if failed:
+                    print(f"[{self.agent_name}] 작성 실패 섹션 {len(failed)}개: {', '.join(failed)}")
+            
+            return state
+            
+        except Exception as e:
+            if self.is_debug:
+                print(f"[{self.agent_name}] 섹션 작성 중 오류: {e}")
+            raise e
 
-참고 데이터:
-{state.research_data[:1500]}...
+    async def _write_section(
+        self,
+        state: ReportWritingState,
+        order: int,
+        outline_item: str,
+        reference: str,
+        config: RunnableConfig,
+        feedback: str = "",
+    ) -> ReportSection:
+        """섹션 하나 작성 (실패 시 지수 백오프로 재시도, feedback이 있으면 프롬프트에 반영)"""
+        # 각 섹션에 대한 내용 생성
+        # 지시문은 모든 섹션이 같고, 입력도 섹션마다 같은 주제를 앞에 두어 공통 접두어를 늘림
+        instructions = """보고서의 한 섹션에 대한 내용을 작성하세요.
 
 다음 사항을 고려하세요:
 1. 명확하고 간결한 문장 사용
@@ -179,30 +326,61 @@ class ReportWritingAgent(BaseAgent):
 3. 논리적 흐름 유지
 4. 전문적인 어조
 
-200-500단어로 작성하세요."""
+200-500단어로 작성하세요.
+품질 검토 피드백이 주어지면 이전 초안의 지적 사항을 반영하세요."""
+        section_input = f"주제: {state.topic}\n섹션: {outline_item}\n\n참고 데이터:\n{reference}"
+        if feedback:
+            section_input += f"\n\n품질 검토 피드백:\n{feedback}"
 
-                response = await self.model.ainvoke([HumanMessage(content=section_prompt)], config)
-                
-                # 섹션 제목 추출 (개요에서 번호와 제목 분리)
-                title_parts = outline_item.split('.', 1)
-                title = title_parts[1].strip() if len(title_parts) > 1 else outline_item
-                
-                section = ReportSection(
-                    title=title,
-                    content=response.content,
-                    order=i
+        # 섹션 제목 추출 (개요에서 번호와 제목 분리)
+        title_parts = outline_item.split('.', 1)
+        title = title_parts[1].strip() if len(title_parts) > 1 else outline_item
+        
+        for attempt in range(self.section_max_retries + 1):
+            try:
+                await self._wait_for_rate_limit()
+                # 수정 단계에서는 같은 피드백이 반복돼도 캐시된 초안 대신 새로 작성
+                response = await self.llm.ainvoke(
+                    instructions, section_input, config, name="write_section",
+                    use_cache=state.revision_count == 0,
                 )
-                state.sections.append(section)
-                
+                break
+            except Exception as e:
+                if attempt >= self.section_max_retries:
+                    raise
+                delay = self.section_retry_backoff * (2 ** attempt)
                 if self.is_debug:
-                    print(f"[{self.agent_name}] 섹션 작성 완료: {title}")
-            
-            return state
-            
-        except Exception as e:
-            if self.is_debug:
-                print(f"[{self.agent_name}] 섹션 작성 중 오류: {e}")
-            raise e
+                    print(f"[{self.agent_name}] 섹션 작성 재시도 ({attempt + 1}/{self.section_max_retries}, {delay:.1f}초 후): {title} - {e}")
+                await asyncio.sleep(delay)
+        
+        if self.is_debug:
+            print(f"[{self.agent_name}] 섹션 작성 완료: {title}")
+        
+        return ReportSection(
+            title=title,
+            content=response.content,
+            order=order
+        )
+
+    async def _wait_for_rate_limit(self) -> None:
+        """섹션 LLM 호출 시작 간격을 1/section_rate_limit초 이상으로 유지"""
+        if self.section_rate_limit <= 0:
+            return
+        async with self._rate_limit_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_call_at)
+            self._next_call_at = start_at + 1.0 / self.section_rate_limit
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+    @staticmethod
+    def section_heading(section: ReportSection) -> str:
+        """섹션 제목 줄 (요약·서론·본론·결론·권고는 ##, 나머지는 ###)"""
+        if "요약" in section.title or "Executive" in section.title:
+            return f"\n## {section.title}\n"
+        if any(keyword in section.title for keyword in ["서론", "본론", "결론", "권고"]):
+            return f"\n## {section.title}\n"
+        return f"\n### {section.title}\n"
 
     async def compile_draft(self, state: ReportWritingState, config: RunnableConfig) -> ReportWritingState:
         """초안 편집"""
@@ -217,14 +395,7 @@ class ReportWritingAgent(BaseAgent):
             
             # 섹션들을 순서대로 추가
             for section in sorted(state.sections, key=lambda x: x.order):
-                # 섹션 제목 레벨 결정
-                if "요약" in section.title or "Executive" in section.title:
-                    draft_parts.append(f"\n## {section.title}\n")
-                elif any(keyword in section.title for keyword in ["서론", "본론", "결론", "권고"]):
-                    draft_parts.append(f"\n## {section.title}\n")
-                else:
-                    draft_parts.append(f"\n### {section.title}\n")
-                
+                draft_parts.append(self.section_heading(section))
                 draft_parts.append(section.content)
             
             # 인용 추가 (있는 경우)
@@ -247,12 +418,16 @@ class ReportWritingAgent(BaseAgent):
             raise e
 
     async def review_quality(self, state: ReportWritingState, config: RunnableConfig) -> ReportWritingState:
-        """품질 검토"""
+        """품질 검토 (전체 점수와 섹션별 판정)"""
         try:
-            review_prompt = f"""다음 보고서 초안의 품질을 검토하고 평가하세요:
-
-보고서 초안:
-{state.draft_report[:3000]}...
+            # 모든 섹션이 검토 대상에 들어가도록 섹션마다 같은 길이씩 발췌
+            section_limit = max(200, 3000 // max(len(state.sections), 1))
+            sections_text = "\n\n".join(
+                f"[섹션 {i + 1}] {section.title}\n{section.content[:section_limit]}"
+                for i, section in enumerate(state.sections)
+            )
+            
+            instructions = """보고서 초안의 품질을 검토하고 평가하세요.
 
 다음 기준으로 평가하세요:
 1. 구조와 논리적 흐름 (20점)
@@ -263,33 +438,56 @@ class ReportWritingAgent(BaseAgent):
 
 총 100점 만점으로 점수를 매기고, 80점 이상이면 "승인", 
 그 미만이면 "수정필요"로 판단하세요. 
-개선이 필요한 부분을 구체적으로 지적하세요.
+각 섹션도 "승인" 또는 "수정필요"로 판정하고, 수정이 필요한 섹션은 이유를 구체적으로 적으세요.
 
 형식:
 점수: XX/100
 판정: 승인/수정필요
+섹션별 판정:
+[1] 승인
+[2] 수정필요 - 이유
+...
 피드백: ..."""
 
-            response = await self.model.ainvoke([HumanMessage(content=review_prompt)], config)
+            response = await self.llm.ainvoke(
+                instructions,
+                f"보고서 주제: {state.topic}\n\n보고서 섹션:\n{sections_text}\n\n참고문헌: {len(state.citations)}개",
+                config,
+                name="review_quality",
+                # 수정 후 재검토는 항상 새로 평가하고, 점수를 읽을 수 없는 응답은 캐시하지 않음
+                use_cache=state.revision_count == 0,
+                cacheable=lambda message: re.search(r'점수[:\s]*(\d+)', str(message.content)) is not None,
+            )
             
             # 점수 추출
-            import re
             score_match = re.search(r'점수[:\s]*(\d+)', response.content)
             if score_match:
                 state.quality_score = float(score_match.group(1)) / 100.0
             
+            # 섹션별 판정 추출 ([번호]는 정렬된 섹션 목록의 위치)
+            section_feedback: Dict[int, str] = {}
+            for match in re.finditer(r'^[ \t]*\[(?:섹션[ \t]*)?(\d+)\][ \t]*(승인|수정필요)[ \t]*[-:]?[ \t]*(.*)$', response.content, re.MULTILINE):
+                index = int(match.group(1)) - 1
+                if match.group(2) == "수정필요" and 0 <= index < len(state.sections):
+                    section_feedback[state.sections[index].order] = match.group(3).strip() or response.content
+            
             # 수정 필요 여부 판단
-            if "수정필요" in response.content or state.quality_score < 0.8:
-                state.needs_revision = True
-                # 피드백을 연구 데이터에 추가하여 다음 작성에 반영
-                state.research_data += f"\n\n품질 검토 피드백:\n{response.content}"
-            else:
-                state.needs_revision = False
+            state.needs_revision = (
+                re.search(r'판정[:\s*]*수정필요', response.content) is not None
+                or state.quality_score < 0.8
+                or bool(section_feedback)
+            )
+            state.review_feedback = response.content if state.needs_revision else ""
+            state.section_feedback = section_feedback
+            # 섹션별 판정이 없으면 전체 섹션을 다시 작성
+            state.sections_to_revise = sorted(section_feedback)
             
             if self.is_debug:
                 print(f"[{self.agent_name}] 품질 검토 완료:")
                 print(f"  품질 점수: {state.quality_score * 100:.1f}/100")
                 print(f"  수정 필요: {state.needs_revision}")
+                if state.needs_revision:
+                    print(f"  수정 대상 섹션: {len(section_feedback) or len(state.sections)}/{len(state.sections)}")
             
             return state
             
@@ -302,9 +500,7 @@ class ReportWritingAgent(BaseAgent):
         """최종 보고서 완성"""
         try:
             # 최종 다듬기
-            finalize_prompt = f"""다음 보고서를 최종적으로 다듬어주세요:
-
-{state.draft_report}
+            instructions = """주어진 보고서를 최종적으로 다듬어주세요.
 
 다음 사항을 확인하고 개선하세요:
 1. 오탈자나 문법 오류 수정
@@ -314,8 +510,11 @@ class ReportWritingAgent(BaseAgent):
 
 최종 보고서를 완성된 형태로 반환하세요."""
 
-            response = await self.model.ainvoke([HumanMessage(content=finalize_prompt)], config)
-            state.final_report = response.content
+            # 토큰 단위로 받아 stream_mode="messages"로 실행한 호출자에게 바로 전달되도록 함
+            response = await self.llm.ainvoke(
+                instructions, state.draft_report, config, name="finalize_report", stream=True
+            )
+            state.final_report = response.content or state.draft_report
             
             # 메타데이터 업데이트
             state.report_metadata["finalized_at"] = datetime.now().isoformat()
@@ -339,5 +538,7 @@ class ReportWritingAgent(BaseAgent):
             raise e
 
     def should_revise(self, state: ReportWritingState) -> Literal["revise", "finalize"]:
-        """수정 필요 여부에 따라 다음 단계 결정"""
-        return "revise" if state.needs_revision else "finalize"
\ No newline at end of file
+        """수정 필요 여부에 따라 다음 단계 결정 (최대 수정 횟수를 넘으면 완성)"""
+        if state.needs_revision and state.revision_count < self.max_revisions:
+            return "revise"
+        return "finalize"
\ No newline at end of file
@@ -1,16 +1,26 @@
 """자료조사 에이전트: 웹 검색과 벡터 DB 검색을 통해 정보를 수집하는 에이전트"""
-from typing import Any, ClassVar, List, Dict, Optional
+import asyncio
+import hashlib
+import json
+import operator
+from collections import Counter, OrderedDict
+from typing import Annotated, Any, Awaitable, Callable, ClassVar, List, Dict, Literal, Optional
 from datetime import datetime
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.runnables import RunnableConfig
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import AIMessage
 from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph, END
 from langgraph.store.base import BaseStore
 from pydantic import BaseModel, Field
 
 from agents.base import BaseAgent, BaseState
+from agents.base.llm_client import LLM_CACHE_DIR
+from agents.core.constants import CACHE_MAX_SIZE
+from agents.utils.context_packer import get_tokenizer, pack_context
+from agents.utils.dedup import cluster_near_duplicates
+from agents.utils.keywords import extract_keywords as extract_keywords_locally, normalize_query
 
 
 class SearchResult(BaseModel):
@@ -23,12 +33,82 @@ class SearchResult(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict, description="추가 메타데이터")
 
 
+def _parse_mcp_results(results: Any) -> List[Dict[str, Any]]:
+    """MCP 도구 응답(딕셔너리 목록 또는 JSON 텍스트)을 딕셔너리 목록으로 변환"""
+    if isinstance(results, str):
+        try:
+            results = json.loads(results)
+        except json.JSONDecodeError:
+            return []
+    if isinstance(results, dict):
+        return [results]
+    parsed = []
+    for item in results or []:
+        if isinstance(item, str):
+            parsed.extend(_parse_mcp_results(item))
+        elif isinstance(item, dict):
+            parsed.append(item)
+    return parsed
+
+
+def _result_key(result: SearchResult) -> str:
+    """
+    키워드별 결과 목록을 합칠 때 같은 문서를 식별하는 키
+    
+    URL이 없는 결과(벡터 청크, Tavily AI 답변)는 제목이 같아도("제목 없음" 등) 다른 내용일 수 있으므로
+    document_id로, 그것도 없으면 제목과 내용 해시로 식별해 실제로 같은 결과만 합칩니다.
+    """
+    if result.url:
+        return result.url
+    document_id = result.metadata.get("document_id")
+    if document_id:
+        return f"{result.source}:doc:{document_id}"
+    content_hash = hashlib.sha1(result.content.encode("utf-8")).hexdigest()
+    return f"{result.source}:{result.title}:{content_hash}"
+
+
+def reciprocal_rank_fusion(result_lists: List[List[SearchResult]], k: int = 60) -> List[SearchResult]:
+    """
+    여러 순위 목록을 RRF(reciprocal rank fusion)로 합치기
+    
+    같은 문서는 하나로 합치고, 문서가 나온 목록마다 1/(k + 순위)를 더한 점수 순으로 정렬합니다.
+    relevance_score는 원래 점수 중 가장 높은 값을 유지하고, 융합 점수는 metadata["rrf_score"]에 기록합니다.
+    """
+    best: Dict[str, SearchResult] = {}
+    scores: Dict[str, float] = {}
+    keywords: Dict[str, List[str]] = {}
+    for results in result_lists:
+        for rank, result in enumerate(results):
+            key = _result_key(result)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank + 1)
+            if key not in best or result.relevance_score > best[key].relevance_score:
+                best[key] = result
+            keyword = result.metadata.get("keyword")
+            if keyword and keyword not in keywords.setdefault(key, []):
+                keywords[key].append(keyword)
+    
+    ordered = sorted(best, key=lambda key: scores[key], reverse=True)
+    return [
+        best[key].model_copy(update={"metadata": {
+            **best[key].metadata,
+            "keywords": keywords.get(key, []),
+            "rrf_score": round(scores[key], 6),
+        }})
+        for key in ordered
+    ]
+
+
 class ResearchState(BaseState):
-    """자료조사 에이전트의 상태"""
+    """
+    자료조사 에이전트의 상태
+    
+    web_results/vector_results는 노드가 반환한 목록을 이어 붙이는 채널이므로,
+    병렬 검색 노드는 전체 상태 대신 새로 찾은 결과만 반환합니다.
+    """
     research_query: str = Field(description="조사 주제/질문")
     search_keywords: List[str] = Field(default_factory=list, description="검색 키워드")
-    web_results: List[SearchResult] = Field(default_factory=list, description="웹 검색 결과")
-    vector_results: List[SearchResult] = Field(default_factory=list, description="벡터 검색 결과")
+    web_results: Annotated[List[SearchResult], operator.add] = Field(default_factory=list, description="웹 검색 결과")
+    vector_results: Annotated[List[SearchResult], operator.add] = Field(default_factory=list, description="벡터 검색 결과")
     aggregated_results: List[SearchResult] = Field(default_factory=list, description="통합 검색 결과")
     research_summary: str = Field(default="", description="조사 결과 요약")
     sources_cited: List[str] = Field(default_factory=list, description="인용된 출처")
@@ -58,7 +138,48 @@ class ResearchAgent(BaseAgent):
         agent_name: str = "ResearchAgent",
         is_debug: bool = True,
         mcp_client: Any = None,  # MCP 클라이언트는 나중에 주입
+        search_mode: Literal["fanout", "combined"] = "fanout",
+        max_concurrent_searches: int = 4,
+        search_deadline: float = 15.0,
+        results_per_keyword: int = 5,
+        dedup_threshold: float = 0.7,
+        context_token_budget: int = 3000,
+        keyword_extraction: Literal["auto", "local", "llm"] = "auto",
+        keyword_confidence_threshold: float = 0.5,
+        llm_cache_size: int = 0,
+        llm_cache_dir: str | None = LLM_CACHE_DIR,
     ) -> None:
+        """
+        자료조사 에이전트 초기화
+        
+        Args:
+            mcp_client: MCP 검색 클라이언트 (없으면 모의 결과 사용)
+            search_mode: "fanout"이면 키워드마다 따로 동시에 검색한 뒤 RRF로 합치고,
+                "combined"면 상위 3개 키워드를 하나의 쿼리로 묶어 검색
+            max_concurrent_searches: fanout 모드에서 동시에 실행할 최대 검색 수
+            search_deadline: fanout 모드의 검색 마감 시간(초), 늦은 키워드 결과는 버림
+            results_per_keyword: fanout 모드에서 키워드당 가져올 결과 수
+            dedup_threshold: 결과 통합 시 같은 내용으로 볼 추정 Jaccard 유사도 (MinHash)
+            context_token_budget: 요약 프롬프트에 넣을 검색 결과의 최대 토큰 수
+            keyword_extraction: "auto"면 로컬 추출기의 신뢰도가 낮을 때만 LLM 사용,
+                "local"/"llm"이면 해당 방식만 사용
+            keyword_confidence_threshold: auto 모드에서 로컬 추출 결과를 그대로 쓸 최소 신뢰도
+            llm_cache_size: LLM 응답 메모리 캐시 크기 (기본값 0: 사용 안 함)
+            llm_cache_dir: LLM 응답 디스크 캐시 디렉터리 (기본값: LLM_CACHE_DIR 환경 변수)
+        """
+        self.search_mode = search_mode
+        self.max_concurrent_searches = max_concurrent_searches
+        self.search_deadline = search_deadline
+        self.results_per_keyword = results_per_keyword
+        self.dedup_threshold = dedup_threshold
+        self.context_token_budget = context_token_budget
+        self.keyword_extraction = keyword_extraction
+        self.keyword_confidence_threshold = keyword_confidence_threshold
+        # 정규화한 조사 주제별 LLM 키워드 추출 결과
+        self._llm_keyword_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        # 토크나이저는 모델 이름별로 캐시되어 요약마다 다시 로드하지 않음
+        model_name = getattr(model, "model_name", None) or getattr(model, "model", None)
+        self.count_tokens = get_tokenizer(model_name if isinstance(model_name, str) else None)
         super().__init__(
             model=model,
             state_schema=state_schema,
@@ -70,6 +191,8 @@ class ResearchAgent(BaseAgent):
             max_retry_attempts=max_retry_attempts,
             agent_name=agent_name,
             is_debug=is_debug,
+            llm_cache_size=llm_cache_size,
+            llm_cache_dir=llm_cache_dir,
         )
         self.mcp_client = mcp_client
 
@@ -110,12 +233,44 @@ class ResearchAgent(BaseAgent):
         graph.add_edge(aggregate_node, summarize_node)
         graph.add_edge(summarize_node, END)
 
-    async def extract_keywords(self, state: ResearchState, config: RunnableConfig) -> ResearchState:
-        """검색 키워드 추출"""
+    async def extract_keywords(self, state: ResearchState, config: RunnableConfig) -> Dict[str, Any]:
+        """검색 키워드 추출 (로컬 추출기 우선, 모호한 주제만 LLM 사용)"""
         try:
-            prompt = f"""다음 조사 주제에서 효과적인 검색을 위한 키워드를 추출하세요:
+            method = "local"
+            search_keywords: List[str] = []
+            
+            if self.keyword_extraction != "llm":
+                extraction = extract_keywords_locally(state.research_query)
+                search_keywords = list(extraction.keywords)
+                if (
+                    self.keyword_extraction == "auto"
+                    and extraction.confidence < self.keyword_confidence_threshold
+                ):
+                    search_keywords = []
+            
+            if not search_keywords and self.keyword_extraction != "local":
+                method = "llm"
+                search_keywords = await self._extract_keywords_with_llm(state.research_query, config)
+            
+            if self.is_debug:
+                print(f"[{self.agent_name}] 키워드 추출 완료 ({method}):")
+                print(f"  키워드: {', '.join(search_keywords)}")
+            
+            return {"search_keywords": search_keywords}
+            
+        except Exception as e:
+            if self.is_debug:
+                print(f"[{self.agent_name}] 키워드 추출 중 오류: {e}")
+            raise e
 
-조사 주제: {state.research_query}
+    async def _extract_keywords_with_llm(self, research_query: str, config: RunnableConfig) -> List[str]:
+        """LLM으로 검색 키워드 추출 (정규화한 조사 주제별로 결과 재사용)"""
+        cache_key = normalize_query(research_query)
+        if cache_key in self._llm_keyword_cache:
+            self._llm_keyword_cache.move_to_end(cache_key)
+            return list(self._llm_keyword_cache[cache_key])
+        
+        instructions = """조사 주제에서 효과적인 검색을 위한 키워드를 추출하세요.
 
 다음 사항을 고려하세요:
 1. 핵심 개념과 용어
@@ -125,26 +280,24 @@ class ResearchAgent(BaseAgent):
 
 5-8개의 키워드를 쉼표로 구분하여 나열하세요."""
 
-            response = await self.model.ainvoke([HumanMessage(content=prompt)], config)
-            
-            # 키워드 파싱
-            keywords = [kw.strip() for kw in response.content.split(',')]
-            state.search_keywords = keywords[:8]  # 최대 8개로 제한
-            
-            if self.is_debug:
-                print(f"[{self.agent_name}] 키워드 추출 완료:")
-                print(f"  키워드: {', '.join(state.search_keywords)}")
-            
-            return state
-            
-        except Exception as e:
-            if self.is_debug:
-                print(f"[{self.agent_name}] 키워드 추출 중 오류: {e}")
-            raise e
+        response = await self.llm.ainvoke(
+            instructions, f"조사 주제: {research_query}", config, name="extract_keywords"
+        )
+        
+        # 키워드 파싱
+        keywords = [kw.strip() for kw in response.content.split(',') if kw.strip()]
+        search_keywords = keywords[:8]  # 최대 8개로 제한
+        
+        self._llm_keyword_cache[cache_key] = search_keywords
+        if len(self._llm_keyword_cache) > CACHE_MAX_SIZE:
+            self._llm_keyword_cache.popitem(last=False)
+        return list(search_keywords)
 
-    async def search_web(self, state: ResearchState, config: RunnableConfig) -> ResearchState:
-        """웹 검색 수행"""
+    async def search_web(self, state: ResearchState, config: RunnableConfig) -> Dict[str, Any]:
+        """웹 검색 수행 (새로 찾은 결과만 반환)"""
         try:
+            web_results: List[SearchResult] = []
+            
             # MCP 클라이언트가 없는 경우 모의 결과 생성
             if self.mcp_client is None:
                 # 실제 구현에서는 MCP 클라이언트를 통해 검색
@@ -153,7 +306,7 @@ class ResearchAgent(BaseAgent):
                 
                 # 모의 검색 결과
                 for i, keyword in enumerate(state.search_keywords[:3]):
-                    state.web_results.append(
+                    web_results.append(
                         SearchResult(
                             source="web",
                             title=f"{keyword}에 대한 웹 검색 결과 {i+1}",
@@ -163,6 +316,18 @@ class ResearchAgent(BaseAgent):
                             metadata={"search_date": datetime.now().isoformat()}
                         )
                     )
+            elif self.search_mode == "fanout":
+                # 키워드마다 따로 동시에 검색한 뒤 RRF로 합침
+                web_results.extend(await self._fan_out_search(
+                    state.search_keywords,
+                    lambda keyword: self.mcp_client.search_web(
+                        query=keyword,
+                        max_results=self.results_per_keyword,
+                        search_depth="basic"
+                    ),
+                    source="web",
+                    limit=10
+                ))
             else:
                 # 실제 MCP를 통한 웹 검색
                 # 키워드를 조합하여 하나의 통합 쿼리 생성
@@ -176,17 +341,7 @@ class ResearchAgent(BaseAgent):
                     )
                     
                     # 결과를 SearchResult 형태로 변환
-                    for result in results:
-                        state.web_results.append(
-                            SearchResult(
-                                source="web",
-                                title=result.get("title", "제목 없음"),
-                                content=result.get("content", ""),
-                                url=result.get("url"),
-                                relevance_score=result.get("score", 0.5),
-                                metadata=result.get("metadata", {})
-                            )
-                        )
+                    web_results.extend(self._to_search_results(results, "web"))
                 except Exception as mcp_error:
                     if self.is_debug:
                         print(f"[{self.agent_name}] MCP 웹 검색 오류: {mcp_error}")
@@ -194,18 +349,20 @@ class ResearchAgent(BaseAgent):
             
             if self.is_debug:
                 print(f"[{self.agent_name}] 웹 검색 완료:")
-                print(f"  결과 수: {len(state.web_results)}")
+                print(f"  결과 수: {len(web_results)}")
             
-            return state
+            return {"web_results": web_results}
             
         except Exception as e:
             if self.is_debug:
                 print(f"[{self.agent_name}] 웹 검색 중 오류: {e}")
             raise e
 
-    async def search_vector(self, state: ResearchState, config: RunnableConfig) -> ResearchState:
-        """벡터 DB 검색 수행"""
+    async def search_vector(self, state: ResearchState, config: RunnableConfig) -> Dict[str, Any]:
+        """벡터 DB 검색 수행 (새로 찾은 결과만 반환)"""
         try:
+            vector_results: List[SearchResult] = []
+            
             # MCP 클라이언트가 없는 경우 모의 결과 생성
             if self.mcp_client is None:
                 if self.is_debug:
@@ -213,7 +370,7 @@ class ResearchAgent(BaseAgent):
                 
                 # 모의 검색 결과
                 for i, keyword in enumerate(state.search_keywords[:2]):
-                    state.vector_results.append(
+                    vector_results.append(
                         SearchResult(
                             source="vector",
                             title=f"{keyword}에 대한 문서 {i+1}",
@@ -226,6 +383,18 @@ class ResearchAgent(BaseAgent):
                             }
                         )
                     )
+            elif self.search_mode == "fanout":
+                # 키워드마다 따로 동시에 검색한 뒤 RRF로 합침
+                vector_results.extend(await self._fan_out_search(
+                    state.search_keywords,
+                    lambda keyword: self.mcp_client.search_vector(
+                        query=keyword,
+                        collection="default",
+                        top_k=self.results_per_keyword
+                    ),
+                    source="vector",
+                    limit=10
+                ))
             else:
                 # 실제 MCP를 통한 벡터 검색
                 # 키워드를 조합하여 검색
@@ -239,20 +408,7 @@ class ResearchAgent(BaseAgent):
                     )
                     
                     # 결과를 SearchResult 형태로 변환
-                    for result in results:
-                        # 오류 결과는 건너뛰기
-                        if "error" in result:
-                            continue
-                            
-                        state.vector_results.append(
-                            SearchResult(
-                                source="vector",
-                                title=result.get("title", "제목 없음"),
-                                content=result.get("content", ""),
-                                relevance_score=result.get("score", 0.5),
-                                metadata=result.get("metadata", {})
-                            )
-                        )
+                    vector_results.extend(self._to_search_results(results, "vector"))
                 except Exception as mcp_error:
                     if self.is_debug:
                         print(f"[{self.agent_name}] MCP 벡터 검색 오류: {mcp_error}")
@@ -260,16 +416,82 @@ class ResearchAgent(BaseAgent):
             
             if self.is_debug:
                 print(f"[{self.agent_name}] 벡터 검색 완료:")
-                print(f"  결과 수: {len(state.vector_results)}")
+                print(f"  결과 수: {len(vector_results)}")
             
-            return state
+            return {"vector_results": vector_results}
             
         except Exception as e:
             if self.is_debug:
                 print(f"[{self.agent_name}] 벡터 검색 중 오류: {e}")
             raise e
 
-    async def aggregate_results(self, state: ResearchState, config: RunnableConfig) -> ResearchState:
+    def _to_search_results(
+        self,
+        results: Any,
+        source: str,
+        keyword: Optional[str] = None
+    ) -> List[SearchResult]:
+        """MCP 검색 응답을 SearchResult 목록으로 변환 (오류 결과는 건너뜀)"""
+        converted = []
+        for result in _parse_mcp_results(results):
+            if "error" in result:
+                continue
+            metadata = dict(result.get("metadata") or {})
+            if keyword:
+                metadata["keyword"] = keyword
+            converted.append(
+                SearchResult(
+                    source=source,
+                    title=result.get("title", "제목 없음"),
+                    content=result.get("content", ""),
+                    url=result.get("url"),
+                    relevance_score=result.get("score", 0.5),
+                    metadata=metadata
+                )
+            )
+        return converted
+
+    async def _fan_out_search(
+        self,
+        keywords: List[str],
+        search: Callable[[str], Awaitable[Any]],
+        source: str,
+        limit: int
+    ) -> List[SearchResult]:
+        """
+        키워드마다 검색을 동시에 실행하고 결과 목록을 RRF로 합치기
+        
+        동시 검색 수는 max_concurrent_searches로 제한하고, search_deadline 안에
+        끝나지 않은 검색은 취소합니다. 전체 지연 시간은 가장 느린 검색 하나 수준입니다.
+        """
+        keywords = [keyword for keyword in dict.fromkeys(keywords) if keyword]
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_searches))
+        
+        async def run(keyword: str) -> Any:
+            async with semaphore:
+                return await search(keyword)
+        
+        tasks = [asyncio.ensure_future(run(keyword)) for keyword in keywords]
+        if not tasks:
+            return []
+        done, pending = await asyncio.wait(tasks, timeout=self.search_deadline)
+        for task in pending:
+            task.cancel()
+        
+        result_lists = []
+        for keyword, task in zip(keywords, tasks):
+            if task not in done:
+                if self.is_debug:
+                    print(f"[{self.agent_name}] '{keyword}' {source} 검색 마감 시간 초과")
+            elif task.exception() is not None:
+                if self.is_debug:
+                    print(f"[{self.agent_name}] '{keyword}' MCP {source} 검색 오류: {task.exception()}")
+            else:
+                result_lists.append(self._to_search_results(task.result(), source, keyword))
+        
+        return reciprocal_rank_fusion(result_lists)[:limit]
+
+    async def aggregate_results(self, state: ResearchState, config: RunnableConfig) -> Dict[str, Any]:
         """검색 결과 통합 및 중복 제거"""
         try:
             # 모든 결과를 하나의 리스트로 합치기
@@ -278,51 +500,67 @@ class ResearchAgent(BaseAgent):
             # 관련성 점수로 정렬
             all_results.sort(key=lambda x: x.relevance_score, reverse=True)
             
-            # 중복 제거 (제목과 내용의 유사성 기반)
-            seen_content = set()
+            # 근사 중복 제거 (MinHash 유사도 기반, 묶음마다 점수가 가장 높은 결과만 유지)
+            leaders = cluster_near_duplicates(
+                [f"{result.title}\n{result.content}" for result in all_results],
+                threshold=self.dedup_threshold
+            )
+            duplicate_counts = Counter(leaders)
+            seen_urls = set()
             unique_results = []
             
-            for result in all_results:
-                # 간단한 중복 체크 (실제로는 더 정교한 방법 필요)
-                content_hash = hash(result.title + result.content[:100])
-                if content_hash not in seen_content:
-                    seen_content.add(content_hash)
-                    unique_results.append(result)
+            for index, result in enumerate(all_results):
+                if leaders[index] != index or (result.url and result.url in seen_urls):
+                    continue
+                if result.url:
+                    seen_urls.add(result.url)
+                if duplicate_counts[index] > 1:
+                    result = result.model_copy(update={"metadata": {
+                        **result.metadata,
+                        "near_duplicates": duplicate_counts[index] - 1
+                    }})
+                unique_results.append(result)
             
             # 상위 10개 결과만 유지
-            state.aggregated_results = unique_results[:10]
+            aggregated_results = unique_results[:10]
             
             # 출처 수집
-            state.sources_cited = list(set([
+            sources_cited = list(set([
                 result.url or f"{result.source}:{result.title}"
-                for result in state.aggregated_results
+                for result in aggregated_results
             ]))
             
             if self.is_debug:
                 print(f"[{self.agent_name}] 결과 통합 완료:")
-                print(f"  통합 결과 수: {len(state.aggregated_results)}")
-                print(f"  인용 출처 수: {len(state.sources_cited)}")
+                print(f"  통합 결과 수: {len(aggregated_results)}")
+                print(f"  인용 출처 수: {len(sources_cited)}")
             
-            return state
+            return {
+                "aggregated_results": aggregated_results,
+                "sources_cited": sources_cited
+            }
             
         except Exception as e:
             if self.is_debug:
                 print(f"[{self.agent_name}] 결과 통합 중 오류: {e}")
             raise e
 
-    async def summarize_findings(self, state: ResearchState, config: RunnableConfig) -> ResearchState:
+    async def summarize_findings(self, state: ResearchState, config: RunnableConfig) -> Dict[str, Any]:
         """조사 결과 요약"""
         try:
-            # 검색 결과를 문자열로 정리
-            results_text = "\n\n".join([
-                f"[{i+1}] {result.title}\n출처: {result.source}\n내용: {result.content[:200]}..."
-                for i, result in enumerate(state.aggregated_results)
-            ])
+            # 토큰 예산을 관련성 점수에 비례해 나누고 결과마다 주제와 관련 있는 문장만 발췌
+            packed, used_tokens = pack_context(
+                query=" ".join([state.research_query, *state.search_keywords]),
+                items=[
+                    (f"[{i+1}] {result.title}\n출처: {result.source}\n내용:", result.content, result.relevance_score)
+                    for i, result in enumerate(state.aggregated_results)
+                ],
+                token_budget=self.context_token_budget,
+                count_tokens=self.count_tokens,
+            )
+            results_text = "\n\n".join(text for _, text in sorted(packed))
             
-            prompt = f"""다음 검색 결과를 바탕으로 '{state.research_query}'에 대한 종합적인 요약을 작성하세요:
-
-검색 결과:
-{results_text}
+            instructions = """검색 결과를 바탕으로 조사 주제에 대한 종합적인 요약을 작성하세요.
 
 요약 작성 시 다음 사항을 포함하세요:
 1. 핵심 발견사항
@@ -332,19 +570,28 @@ class ResearchAgent(BaseAgent):
 
 체계적이고 읽기 쉬운 형태로 작성하세요."""
 
-            response = await self.model.ainvoke([HumanMessage(content=prompt)], config)
-            state.research_summary = response.content
-            
-            # 최종 메시지 추가
-            state.messages.append(
-                AIMessage(content=f"조사 완료: {len(state.aggregated_results)}개의 관련 자료를 찾았습니다.\n\n{state.research_summary}")
+            # 토큰 단위로 받아 stream_mode="messages"로 실행한 호출자에게 바로 전달되도록 함
+            response = await self.llm.ainvoke(
+                instructions,
+                f"조사 주제: {state.research_query}\n\n검색 결과:\n{results_text}",
+                config,
+                name="summarize_findings",
+                stream=True,
             )
+            research_summary = response.content
             
             if self.is_debug:
                 print(f"[{self.agent_name}] 요약 완료:")
-                print(f"  요약 길이: {len(state.research_summary)} 문자")
+                print(f"  컨텍스트: {len(packed)}/{len(state.aggregated_results)}개 결과, {used_tokens}/{self.context_token_budget} 토큰")
+                print(f"  요약 길이: {len(research_summary)} 문자")
             
-            return state
+            # 최종 메시지 추가 (messages 채널에 이어 붙음)
+            return {
+                "research_summary": research_summary,
+                "messages": [
+                    AIMessage(content=f"조사 완료: {len(state.aggregated_results)}개의 관련 자료를 찾았습니다.\n\n{research_summary}")
+                ]
+            }
             
         except Exception as e:
             if self.is_debug:
@@ -1,4 +1,5 @@
 from .base_agent import BaseAgent
+from .llm_client import LLMClient, LLMCallRecord
 from .base_state import BaseState, BaseInputState, BaseOutputState
 
-__all__ = ["BaseAgent", "BaseState", "BaseInputState", "BaseOutputState"]
\ No newline at end of file
+__all__ = ["BaseAgent", "BaseState", "BaseInputState", "BaseOutputState", "LLMClient", "LLMCallRecord"]
\ No newline at end of file
@@ -6,6 +6,8 @@ from langgraph.graph import StateGraph
 from langgraph.store.base import BaseStore
 from langgraph.types import RetryPolicy
 
+from agents.base.llm_client import LLM_CACHE_DIR, LLMClient
+
 
 class BaseAgent:
     """
@@ -28,6 +30,8 @@ class BaseAgent:
         max_retry_attempts: int = 2,
         agent_name: str | None = None,
         is_debug: bool = True,
+        llm_cache_size: int = 0,
+        llm_cache_dir: str | None = LLM_CACHE_DIR,
     ) -> None:
         """
         베이스 그래프 에이전트 초기화.
@@ -43,6 +47,8 @@ class BaseAgent:
             max_retry_attempts: 최대 재시도 횟수
             agent_name: 에이전트 이름
             is_debug: 디버그 여부
+            llm_cache_size: LLM 응답 메모리 캐시 크기 (기본값 0: 사용 안 함, 예: CACHE_MAX_SIZE)
+            llm_cache_dir: LLM 응답 디스크 캐시 디렉터리 (기본값: LLM_CACHE_DIR 환경 변수)
         """
         self.model = model
         self.checkpointer = checkpointer
@@ -60,6 +66,14 @@ class BaseAgent:
         self.retry_policy = _retry_policy
         self.agent_name = agent_name
         self.is_debug = is_debug
+        # 노드의 LLM 호출은 self.llm을 거쳐 고정 지시문 우선 배치, 응답 캐시, 사용량 기록을 공유
+        self.llm = LLMClient(
+            model,
+            cache_size=llm_cache_size,
+            cache_dir=llm_cache_dir,
+            agent_name=agent_name or self.__class__.__name__,
+            is_debug=is_debug,
+        )
         self.build_graph()
 
     def get_node_name(self, key="DEFAULT") -> str:
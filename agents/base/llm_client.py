@@ -0,0 +1,244 @@
+"""
+에이전트 공용 LLM 호출 계층
+
+모든 LLM 호출을 [고정 지시문(SystemMessage), 가변 입력(HumanMessage)] 순서로 보내,
+지시문이 같은 호출끼리 프롬프트 앞부분이 일치하도록 합니다(OpenAI 등의 prompt caching 적중).
+응답 캐시를 켜면 모델·파라미터·메시지의 해시를 키로 메모리 LRU와 디스크 저장소에 응답을 저장하므로,
+실패 후 같은 주제를 다시 실행하면 이미 끝난 노드의 호출 비용을 다시 내지 않습니다.
+호출자가 파싱할 수 없는 응답은 저장하지 않아 실패한 응답이 재실행마다 반복되지 않습니다.
+호출마다 토큰 사용량과 지연 시간을 기록합니다.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.runnables import RunnableConfig
+
+
+# 디스크 캐시 기본 경로 (설정하지 않으면 디스크 캐시 사용 안 함)
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR")
+# 최근 호출 기록 보관 수
+MAX_CALL_RECORDS = 500
+
+
+class LLMCallRecord(NamedTuple):
+    """LLM 호출 한 건의 기록"""
+    name: str
+    cached: bool
+    input_tokens: int
+    output_tokens: int
+    cached_input_tokens: int  # 제공자 prompt caching으로 재사용된 입력 토큰
+    latency: float
+
+
+class LLMClient:
+    """고정 지시문을 앞에 두고 응답을 캐시하는 LLM 호출 래퍼"""
+
+    def __init__(
+        self,
+        model: BaseChatModel,
+        cache_size: int = 0,
+        cache_dir: str | None = LLM_CACHE_DIR,
+        agent_name: str | None = None,
+        is_debug: bool = False,
+    ) -> None:
+        """
+        LLM 호출 계층 초기화
+
+        Args:
+            model: 사용할 LLM 모델
+            cache_size: 메모리 응답 캐시 크기 (기본값 0: 메모리 캐시 사용 안 함)
+            cache_dir: 응답을 JSON 파일로 저장할 디렉터리 (None이면 디스크 캐시 사용 안 함)
+            agent_name: 디버그 출력에 쓸 에이전트 이름
+            is_debug: 디버그 여부
+        """
+        self.model = model
+        self.cache_size = cache_size
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.agent_name = agent_name
+        self.is_debug = is_debug
+        self._cache: OrderedDict[str, BaseMessage] = OrderedDict()
+        self.records: Deque[LLMCallRecord] = deque(maxlen=MAX_CALL_RECORDS)
+        self._model_key = self._describe_model(model)
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _describe_model(model: BaseChatModel) -> str:
+        """캐시 키에 넣을 모델 식별 정보 (클래스와 모델명·온도 등 파라미터)"""
+        try:
+            params = dict(model._identifying_params)
+        except Exception:
+            params = {}
+        return json.dumps(
+            {"class": type(model).__name__, "params": params},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+
+    @staticmethod
+    def build_messages(instructions: str, content: str) -> List[BaseMessage]:
+        """고정 지시문을 앞에, 호출마다 바뀌는 입력을 뒤에 둔 메시지 목록"""
+        return [SystemMessage(content=instructions), HumanMessage(content=content)]
+
+    def cache_key(self, messages: List[BaseMessage]) -> str:
+        """모델·파라미터·메시지 내용의 sha256"""
+        payload = json.dumps(
+            [self._model_key, [(message.type, message.content) for message in messages]],
+            ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def ainvoke(
+        self,
+        instructions: str,
+        content: str,
+        config: RunnableConfig | None = None,
+        name: str = "llm",
+        stream: bool = False,
+        use_cache: bool = True,
+        cacheable: Callable[[BaseMessage], bool] | None = None,
+    ) -> BaseMessage:
+        """
+        LLM 호출 (캐시에 같은 호출의 응답이 있으면 재사용)
+
+        Args:
+            instructions: 호출 종류마다 고정된 지시문 (작업 설명, 평가 기준, 출력 형식)
+            content: 호출마다 바뀌는 입력 (주제, 조사 데이터, 초안 등)
+            config: 노드의 RunnableConfig (콜백·스트리밍 전달용)
+            name: 통계와 디버그 출력에 쓸 호출 이름
+            stream: True이면 astream으로 받아 stream_mode="messages" 호출자에게 토큰을 전달
+            use_cache: False이면 캐시를 읽지 않고 항상 새로 호출 (응답은 새로 저장)
+            cacheable: 응답을 저장해도 되는지 판단하는 함수 (호출자가 파싱할 수 있는 응답만 True),
+                캐시에서 읽은 응답이 False이면 지우고 새로 호출
+
+        Returns:
+            LLM 응답 메시지 (스트리밍 시 청크를 합친 메시지)
+        """
+        messages = self.build_messages(instructions, content)
+        key = self.cache_key(messages)
+        started = time.monotonic()
+
+        if use_cache:
+            cached = await self._get(key)
+            if cached is not None and (cacheable is None or cacheable(cached)):
+                self._record(name, cached, True, time.monotonic() - started)
+                return cached
+            if cached is not None:
+                await self.invalidate(key)
+
+        if stream:
+            response = None
+            async for chunk in self.model.astream(messages, config):
+                response = chunk if response is None else response + chunk
+            if response is None:
+                raise ValueError("LLM 스트리밍 응답이 비어 있습니다.")
+        else:
+            response = await self.model.ainvoke(messages, config)
+
+        self._record(name, response, False, time.monotonic() - started)
+        if cacheable is None or cacheable(response):
+            await self._put(key, response)
+        return response
+
+    async def invalidate(self, key: str) -> None:
+        """캐시 항목 삭제 (메모리와 디스크)"""
+        self._cache.pop(key, None)
+        if self.cache_dir is not None:
+            try:
+                await asyncio.to_thread((self.cache_dir / f"{key}.json").unlink, True)
+            except OSError as e:
+                if self.is_debug:
+                    print(f"[{self.agent_name}] LLM 응답 캐시 삭제 실패: {e}")
+
+    async def _get(self, key: str) -> Optional[BaseMessage]:
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        if self.cache_dir is None:
+            return None
+
+        message = await asyncio.to_thread(self._read_file, key)
+        if message is not None:
+            self._remember(key, message)
+        return message
+
+    async def _put(self, key: str, message: BaseMessage) -> None:
+        self._remember(key, message)
+        if self.cache_dir is not None:
+            try:
+                await asyncio.to_thread(self._write_file, key, message)
+            except OSError as e:
+                if self.is_debug:
+                    print(f"[{self.agent_name}] LLM 응답 캐시 저장 실패: {e}")
+
+    def _remember(self, key: str, message: BaseMessage) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = message
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _read_file(self, key: str) -> Optional[BaseMessage]:
+        path = self.cache_dir / f"{key}.json"
+        try:
+            return messages_from_dict([json.loads(path.read_text(encoding="utf-8"))])[0]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            # 손상된 파일은 캐시 미스로 처리
+            return None
+
+    def _write_file(self, key: str, message: BaseMessage) -> None:
+        # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        path = self.cache_dir / f"{key}.json"
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(message_to_dict(message), ensure_ascii=False), encoding="utf-8")
+        os.replace(temp_path, path)
+
+    def _record(self, name: str, message: BaseMessage, cached: bool, latency: float) -> None:
+        usage = getattr(message, "usage_metadata", None) or {}
+        record = LLMCallRecord(
+            name=name,
+            cached=cached,
+            # 캐시 적중은 제공자에게 보낸 토큰이 없음
+            input_tokens=0 if cached else usage.get("input_tokens", 0),
+            output_tokens=0 if cached else usage.get("output_tokens", 0),
+            cached_input_tokens=0 if cached else (usage.get("input_token_details") or {}).get("cache_read", 0),
+            latency=latency,
+        )
+        self.records.append(record)
+
+        if self.is_debug:
+            if cached:
+                print(f"[{self.agent_name}] LLM 호출 ({name}): 캐시 적중")
+            else:
+                print(
+                    f"[{self.agent_name}] LLM 호출 ({name}): {latency:.2f}초, "
+                    f"입력 {record.input_tokens} (prompt cache {record.cached_input_tokens}) / 출력 {record.output_tokens} 토큰"
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        """최근 호출 기록의 합계 (호출 수, 캐시 적중 수, 토큰 수, 지연 시간)"""
+        calls = [record for record in self.records if not record.cached]
+        return {
+            "calls": len(self.records),
+            "cache_hits": len(self.records) - len(calls),
+            "input_tokens": sum(record.input_tokens for record in calls),
+            "cached_input_tokens": sum(record.cached_input_tokens for record in calls),
+            "output_tokens": sum(record.output_tokens for record in calls),
+            "total_latency": round(sum(record.latency for record in calls), 3),
+        }
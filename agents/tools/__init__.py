@@ -4,7 +4,8 @@ from .mcp_client import (
     get_mcp_client,
     search_vector,
     search_web,
-    search_all
+    search_all,
+    search_batch
 )
 
 __all__ = [
@@ -12,5 +13,6 @@ __all__ = [
     "get_mcp_client",
     "search_vector",
     "search_web",
-    "search_all"
+    "search_all",
+    "search_batch"
 ]
\ No newline at end of file
@@ -1,64 +1,561 @@
 """MCP 클라이언트 설정 - LangGraph 에이전트가 MCP 서버와 통신하기 위한 클라이언트"""
 import os
-from typing import Dict, Any, List
+import random
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 import asyncio
 
+import anyio
+import httpx
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
 from langchain_core.tools import BaseTool
+from mcp import ClientSession
+from mcp.types import Tool as MCPTool
 from dotenv import load_dotenv
 
+from agents.core.constants import SEARCH_TIMEOUT
+
 load_dotenv()
 
 
+# 서버별 도구 스키마 캐시 {서버 URL: (서버 이름:버전, 도구 목록)}
+# 재연결 시 서버 버전이 같으면 tools/list를 다시 호출하지 않음
+_tool_schema_cache: Dict[str, Tuple[str, List[MCPTool]]] = {}
+
+# 도구 호출 타임아웃(초) - 끊긴 세션에서 응답을 무한정 기다리지 않도록 함
+MCP_CALL_TIMEOUT = float(os.getenv("MCP_CALL_TIMEOUT", str(SEARCH_TIMEOUT)))
+
+# 연속 실패가 MCP_EJECT_FAILURES회 이상인 서버는 MCP_EJECT_SECONDS초 동안 부하 분산에서 제외
+MCP_EJECT_FAILURES = int(os.getenv("MCP_EJECT_FAILURES", "3"))
+MCP_EJECT_SECONDS = float(os.getenv("MCP_EJECT_SECONDS", "30"))
+
+# 세션이 끊긴 것으로 보고 재연결 후 한 번 재시도할 예외 (전송 계층·닫힌 스트림 오류만)
+# 타임아웃이나 JSON-RPC 오류 응답(McpError)은 세션이 살아 있으므로, 재연결하면
+# 같은 세션을 공유하는 다른 진행 중 호출까지 모두 실패하게 됨
+_SESSION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    httpx.TransportError,
+    ConnectionError,
+)
+
+# 서버 실패로 기록하고 다른 서버로 한 번 넘길 예외 (세션은 유지)
+# McpError는 요청 자체의 오류라 다른 서버에서도 같으므로 호출자에게 그대로 전달
+_CALL_ERRORS = _SESSION_ERRORS + (
+    asyncio.TimeoutError,
+    httpx.HTTPError,
+)
+
+
+class MCPConnection:
+    """
+    MCP 서버 하나와의 장기 세션
+    
+    MultiServerMCPClient.get_tools()의 도구는 호출마다 새 세션을 만들기 때문에,
+    세션 하나를 열어 두고 모든 도구 호출이 이 세션을 공유하도록 합니다.
+    (streamable HTTP 세션은 요청 ID로 동시 호출을 다중화함)
+    """
+    
+    def __init__(self, name: str, connection: Dict[str, Any]):
+        """
+        MCP 연결 초기화
+        
+        Args:
+            name: 서버 이름
+            connection: MultiServerMCPClient 연결 설정 (url, transport, headers)
+        """
+        self.name = name
+        self.connection = connection
+        self.url = connection.get("url", name)
+        self.session: Optional[ClientSession] = None
+        self.tools: Dict[str, BaseTool] = {}
+        self.server_version: Optional[str] = None
+        self.generation = 0
+        self.reconnects = 0
+        
+        # 부하 분산·헬스 상태
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.total_calls = 0
+        self.total_failures = 0
+        
+        self._task: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._lock = asyncio.Lock()
+    
+    @property
+    def connected(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+    
+    @property
+    def ejected(self) -> bool:
+        """연속 실패로 부하 분산에서 제외된 상태인지 여부"""
+        return time.monotonic() < self.ejected_until
+    
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+    
+    def record_failure(self) -> None:
+        """실패 기록 (연속 실패가 임계값에 도달하면 일정 시간 제외)"""
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= MCP_EJECT_FAILURES:
+            self.eject()
+    
+    def eject(self) -> None:
+        """MCP_EJECT_SECONDS초 동안 부하 분산에서 제외 (이후 호출 시 재연결 시도)"""
+        self.ejected_until = time.monotonic() + MCP_EJECT_SECONDS
+    
+    def stats(self) -> Dict[str, Any]:
+        """연결 상태"""
+        return {
+            "url": self.url,
+            "connected": self.connected,
+            "server_version": self.server_version,
+            "outstanding": self.outstanding,
+            "consecutive_failures": self.consecutive_failures,
+            "ejected": self.ejected,
+            "total_calls": self.total_calls,
+            "total_failures": self.total_failures,
+            "reconnects": self.reconnects,
+        }
+    
+    async def connect(self) -> None:
+        """세션이 없으면 연결 (이미 연결되어 있으면 무시)"""
+        async with self._lock:
+            if not self.connected:
+                await self._start()
+    
+    async def reconnect(self, generation: int) -> None:
+        """세션 재연결 (다른 코루틴이 이미 재연결했으면 무시)"""
+        async with self._lock:
+            if self.connected and self.generation != generation:
+                return
+            await self._stop()
+            await self._start()
+            self.reconnects += 1
+    
+    async def close(self) -> None:
+        """세션 종료"""
+        async with self._lock:
+            await self._stop()
+    
+    async def _start(self) -> None:
+        ready = asyncio.get_running_loop().create_future()
+        self._closing = asyncio.Event()
+        self._task = asyncio.create_task(self._run(ready))
+        try:
+            session, version = await ready
+        except Exception as e:
+            await self._stop()
+            # transport 예외 그룹 등을 재연결·장애 전환에서 다룰 수 있는 형태로 변환
+            raise ConnectionError(f"MCP 서버 연결 실패 ({self.url}): {e!r}") from e
+        except BaseException:
+            await self._stop()
+            raise
+        
+        self.session = session
+        self.server_version = version
+        self.tools = await self._load_tools(session, version)
+        self.generation += 1
+    
+    async def _run(self, ready: asyncio.Future) -> None:
+        """
+        세션 컨텍스트를 소유하는 백그라운드 작업
+        
+        transport의 anyio 취소 범위는 연 태스크에서 닫아야 하므로
+        세션을 별도 태스크에서 열고 close() 요청이 올 때까지 유지합니다.
+        """
+        client = MultiServerMCPClient(connections={self.name: self.connection})
+        try:
+            async with client.session(self.name, auto_initialize=False) as session:
+                result = await session.initialize()
+                info = result.serverInfo
+                ready.set_result((session, f"{info.name}:{info.version}"))
+                await self._closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                print(f"MCP 세션 종료 ({self.url}): {e}")
+        finally:
+            if not ready.done():
+                ready.cancel()
+            if self._task is asyncio.current_task():
+                self.session = None
+    
+    async def _stop(self) -> None:
+        if self._closing is not None:
+            self._closing.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+        self.session = None
+    
+    async def _load_tools(self, session: ClientSession, version: str) -> Dict[str, BaseTool]:
+        """도구 스키마 로드 (서버 버전이 같으면 캐시 사용) 후 현재 세션에 바인딩"""
+        cached = _tool_schema_cache.get(self.url)
+        if cached and cached[0] == version:
+            mcp_tools = cached[1]
+        else:
+            mcp_tools = (await session.list_tools()).tools
+            _tool_schema_cache[self.url] = (version, mcp_tools)
+        
+        return {
+            tool.name: convert_mcp_tool_to_langchain_tool(session, tool)
+            for tool in mcp_tools
+        }
+    
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """
+        도구 호출 (세션 오류 시 재연결 후 한 번 재시도)
+        
+        Raises:
+            KeyError: 서버에 해당 도구가 없는 경우
+            asyncio.TimeoutError: MCP_CALL_TIMEOUT 안에 응답이 없는 경우 (세션은 유지)
+            McpError: 서버가 JSON-RPC 오류로 응답한 경우
+        """
+        if not self.connected:
+            await self.connect()
+        
+        generation = self.generation
+        try:
+            return await asyncio.wait_for(self.tools[name].ainvoke(arguments), MCP_CALL_TIMEOUT)
+        except _SESSION_ERRORS as e:
+            print(f"MCP 세션 오류, 재연결 후 재시도 ({self.url}): {e!r}")
+            await self.reconnect(generation)
+            return await asyncio.wait_for(self.tools[name].ainvoke(arguments), MCP_CALL_TIMEOUT)
+
+
+class HedgePolicy:
+    """
+    헤지(hedged) 요청 정책
+    
+    도구별 최근 지연 시간의 p{percentile}까지 응답이 없으면 다른 서버로 같은 요청을 하나 더 보냅니다.
+    헤지 요청은 호출마다 budget개씩 쌓이는 토큰을 1개씩 쓰므로 추가 부하는 호출 수의
+    budget 비율(기본 10%)을 넘지 않습니다.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = 95.0,
+        budget: float = 0.1,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        window: int = 200,
+        max_tokens: float = 10.0
+    ):
+        """
+        헤지 정책 초기화
+        
+        Args:
+            enabled: 헤지 사용 여부
+            percentile: 헤지를 보낼 지연 시간 백분위
+            budget: 호출당 적립되는 헤지 토큰 (추가 요청 비율 상한)
+            min_samples: 헤지를 시작하기 위한 도구별 최소 지연 시간 표본 수
+            min_delay: 헤지 대기 시간 하한(초)
+            window: 도구별 지연 시간 표본 윈도우 크기
+            max_tokens: 적립할 수 있는 최대 헤지 토큰 (한가할 때 모인 토큰이 한 번에 쓰이지 않도록 제한)
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.window = window
+        self.max_tokens = max_tokens
+        self._latencies: Dict[str, deque] = {}
+        self._tokens = 0.0
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+    
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        """환경 변수(MCP_HEDGE_*)로 정책 생성"""
+        return cls(
+            enabled=os.getenv("MCP_HEDGE_ENABLED", "false").lower() == "true",
+            percentile=float(os.getenv("MCP_HEDGE_PERCENTILE", "95")),
+            budget=float(os.getenv("MCP_HEDGE_BUDGET", "0.1")),
+            min_samples=int(os.getenv("MCP_HEDGE_MIN_SAMPLES", "20")),
+        )
+    
+    def delay(self, tool: str) -> Optional[float]:
+        """헤지를 보내기까지 기다릴 시간(초), 표본이 부족하면 None"""
+        samples = self._latencies.get(tool)
+        if not self.enabled or not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(self.percentile / 100 * (len(ordered) - 1))))
+        return max(self.min_delay, ordered[index])
+    
+    def record(self, tool: str, latency: float) -> None:
+        """성공한 호출의 지연 시간 기록 및 헤지 토큰 적립"""
+        self._latencies.setdefault(tool, deque(maxlen=self.window)).append(latency)
+        self.calls += 1
+        self._tokens = min(self.max_tokens, self._tokens + self.budget)
+    
+    def try_hedge(self) -> bool:
+        """헤지 토큰이 있으면 1개 사용"""
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        self.hedged += 1
+        return True
+    
+    def stats(self) -> Dict[str, Any]:
+        """헤지 상태"""
+        return {
+            "enabled": self.enabled,
+            "percentile": self.percentile,
+            "budget": self.budget,
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "delay_s": {
+                tool: round(delay, 3)
+                for tool in self._latencies
+                if (delay := self.delay(tool)) is not None
+            },
+        }
+
+
+def _resolve_server_urls(
+    mcp_server_url: str | None = None,
+    mcp_server_urls: Sequence[str] | None = None
+) -> List[str]:
+    """MCP 서버 URL 목록 결정 (인자 > MCP_SERVER_URLS > MCP_SERVER_URL > localhost:8090)"""
+    if mcp_server_urls:
+        return list(mcp_server_urls)
+    if mcp_server_url:
+        return [mcp_server_url]
+    urls = [url.strip() for url in os.getenv("MCP_SERVER_URLS", "").split(",") if url.strip()]
+    return urls or [os.getenv("MCP_SERVER_URL", "http://localhost:8090/mcp")]
+
+
 class MCPSearchClient:
-    """MCP 검색 클라이언트"""
+    """
+    MCP 검색 클라이언트
     
-    def __init__(self, mcp_server_url: str | None = None, transport: str = "streamable_http"):
+    검색 서버가 여러 대(샤드/레플리카)면 서버마다 장기 세션을 열고,
+    호출마다 진행 중인 요청이 가장 적은 서버를 고릅니다(least-outstanding-requests).
+    연속으로 실패한 서버는 일정 시간 제외하고, 세션 오류가 나면 다른 서버로 한 번 넘깁니다.
+    """
+    
+    def __init__(
+        self,
+        mcp_server_url: str | None = None,
+        transport: str = "streamable_http",
+        client_id: str | None = None,
+        mcp_server_urls: Sequence[str] | None = None,
+        hedge: HedgePolicy | None = None
+    ):
         """
         MCP 검색 클라이언트 초기화
         
         Args:
             mcp_server_url: MCP 서버 URL (기본값: 환경변수 또는 localhost:8090)
             transport: Transport 유형 (stdio, streamable_http, sse)
+            client_id: 서버의 호출자별 요청 한도에 사용할 식별자 (기본값: 환경변수 MCP_CLIENT_ID)
+            mcp_server_urls: 여러 MCP 서버 URL (기본값: 환경변수 MCP_SERVER_URLS, 쉼표로 구분)
+            hedge: 헤지 요청 정책 (기본값: 환경변수 MCP_HEDGE_*, 서버가 2대 이상일 때만 동작)
         """
-        self.mcp_server_url = mcp_server_url or os.getenv("MCP_SERVER_URL", "http://localhost:8090/mcp")
+        self.mcp_server_urls = _resolve_server_urls(mcp_server_url, mcp_server_urls)
+        self.mcp_server_url = self.mcp_server_urls[0]
         self.transport = transport
-        self.client = None
-        self.tools = None
+        self.client_id = client_id or os.getenv("MCP_CLIENT_ID")
+        self.hedge = hedge or HedgePolicy.from_env()
+        self.connections: List[MCPConnection] = []
         self._initialized = False
+        self._init_lock = asyncio.Lock()
+    
+    def _connection_config(self, url: str) -> Dict[str, Any]:
+        """MultiServerMCPClient 연결 설정"""
+        config: Dict[str, Any] = {
+            "url": url,
+            "transport": self.transport,
+        }
+        
+        headers = {}
+        
+        # API 키가 필요한 경우
+        api_key = os.getenv("MCP_API_KEY")
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        
+        # 서버가 호출자별 요청 한도를 적용할 수 있도록 식별자 전달
+        if self.client_id:
+            headers["X-Client-Id"] = self.client_id
+        
+        if headers:
+            config["headers"] = headers
+        return config
     
     async def initialize(self) -> None:
-        """클라이언트 초기화 및 도구 로드"""
+        """클라이언트 초기화 및 도구 로드 (동시에 호출되어도 한 번만 연결)"""
         if self._initialized:
             return
         
-        try:
-            # MCP 클라이언트 설정
-            config = {
-                "search": {
-                    "url": self.mcp_server_url,
-                    "transport": self.transport,
-                }
-            }
+        async with self._init_lock:
+            if self._initialized:
+                return
+            
+            self.connections = [
+                MCPConnection(f"search-{index}", self._connection_config(url))
+                for index, url in enumerate(self.mcp_server_urls)
+            ]
             
-            # API 키가 필요한 경우
-            api_key = os.getenv("MCP_API_KEY")
-            if api_key:
-                config["search"]["headers"] = f"Authorization: Bearer {api_key}"
+            # 모든 서버에 동시에 연결 (일부 실패는 제외 처리 후 나중에 재연결)
+            results = await asyncio.gather(
+                *(connection.connect() for connection in self.connections),
+                return_exceptions=True
+            )
+            errors = []
+            for connection, result in zip(self.connections, results):
+                if isinstance(result, Exception):
+                    connection.record_failure()
+                    connection.eject()
+                    errors.append(f"{connection.url}: {result}")
             
-            # 클라이언트 생성
-            self.client = MultiServerMCPClient(connections=config)
+            if len(errors) == len(self.connections):
+                print(f"MCP 클라이언트 초기화 실패: {errors}")
+                raise ConnectionError(f"MCP 서버에 연결할 수 없습니다: {errors}")
             
-            # 도구 로드
-            self.tools = await self.client.get_tools()
             self._initialized = True
             
-            print(f"MCP 클라이언트 초기화 완료: {self.mcp_server_url}")
+            for connection in self.connections:
+                if connection.connected:
+                    print(f"MCP 클라이언트 초기화 완료: {connection.url} ({connection.server_version})")
+            for error in errors:
+                print(f"MCP 서버 연결 실패, 일시 제외: {error}")
             print(f"사용 가능한 도구: {list(self.tools.keys())}")
-            
-        except Exception as e:
-            print(f"MCP 클라이언트 초기화 실패: {e}")
+    
+    def _pick_connection(self, exclude: Sequence[MCPConnection] = ()) -> Optional[MCPConnection]:
+        """
+        진행 중인 요청이 가장 적은 서버 선택
+        
+        제외되지 않은 서버가 없으면 제외 기간이 가장 먼저 끝나는 서버를 시험 삼아 고릅니다.
+        """
+        candidates = [connection for connection in self.connections if connection not in exclude]
+        if not candidates:
+            return None
+        
+        healthy = [connection for connection in candidates if not connection.ejected]
+        if not healthy:
+            return min(candidates, key=lambda connection: connection.ejected_until)
+        
+        least = min(connection.outstanding for connection in healthy)
+        return random.choice([connection for connection in healthy if connection.outstanding == least])
+    
+    def stats(self) -> Dict[str, Any]:
+        """서버별 연결 상태와 헤지 통계"""
+        return {
+            "servers": [connection.stats() for connection in self.connections],
+            "hedging": self.hedge.stats(),
+        }
+    
+    @property
+    def tools(self) -> Dict[str, BaseTool]:
+        """연결된 서버의 세션에 바인딩된 도구 (재연결되면 새 세션의 도구로 바뀜)"""
+        for connection in self.connections:
+            if connection.tools:
+                return connection.tools
+        return {}
+    
+    async def _call_tool(self, name: str, arguments: Dict[str, Any], missing_message: str) -> Any:
+        """초기화 확인 후 부하 분산된 서버로 도구 호출 (세션 오류 시 다른 서버로 한 번 넘김)"""
+        if not self._initialized:
+            await self.initialize()
+        
+        if name not in self.tools:
+            raise ValueError(missing_message)
+        
+        start = time.monotonic()
+        delay = self.hedge.delay(name) if len(self.connections) > 1 else None
+        if delay is None:
+            result = await self._call_balanced(name, arguments)
+        else:
+            result = await self._call_hedged(name, arguments, delay)
+        self.hedge.record(name, time.monotonic() - start)
+        return result
+    
+    async def _call_on(self, connection: MCPConnection, name: str, arguments: Dict[str, Any]) -> Any:
+        """지정한 서버로 도구 호출 (진행 중인 요청 수와 헬스 기록)"""
+        connection.outstanding += 1
+        connection.total_calls += 1
+        try:
+            result = await connection.call_tool(name, arguments)
+        except _CALL_ERRORS + (KeyError,):
+            connection.record_failure()
             raise
+        finally:
+            connection.outstanding -= 1
+        
+        connection.record_success()
+        return result
+    
+    async def _call_balanced(
+        self,
+        name: str,
+        arguments: Dict[str, Any],
+        connection: Optional[MCPConnection] = None
+    ) -> Any:
+        """부하 분산된 서버로 도구 호출 (세션 오류 시 다른 서버로 한 번 넘김)"""
+        tried: List[MCPConnection] = []
+        while True:
+            connection = connection or self._pick_connection(exclude=tried)
+            tried.append(connection)
+            try:
+                return await self._call_on(connection, name, arguments)
+            except _CALL_ERRORS + (KeyError,) as e:
+                if len(tried) >= min(2, len(self.connections)):
+                    raise
+                print(f"MCP 서버 호출 실패, 다른 서버로 재시도 ({connection.url}): {e!r}")
+                connection = None
+    
+    async def _call_hedged(self, name: str, arguments: Dict[str, Any], delay: float) -> Any:
+        """
+        헤지 요청으로 도구 호출
+        
+        delay초 안에 응답이 없고 헤지 예산이 남아 있으면 다른 서버로 같은 요청을 보내
+        먼저 성공한 응답을 사용하고, 나머지 요청은 취소합니다.
+        """
+        primary_connection = self._pick_connection()
+        primary = asyncio.ensure_future(self._call_balanced(name, arguments, primary_connection))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self.hedge.try_hedge():
+                return await primary
+            
+            backup = asyncio.ensure_future(self._call_balanced(
+                name, arguments, self._pick_connection(exclude=[primary_connection])
+            ))
+            tasks.append(backup)
+            
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    if backup in succeeded and primary not in succeeded:
+                        self.hedge.hedge_wins += 1
+                    return succeeded[0].result()
+                # 먼저 끝난 요청이 실패했으면 남은 요청을 기다리고, 모두 실패하면 예외 전달
+                if not pending:
+                    return done.pop().result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
     
     async def get_search_tools(self) -> Dict[str, BaseTool]:
         """검색 도구 반환"""
@@ -80,20 +577,11 @@ class MCPSearchClient:
         top_k: int = 5
     ) -> List[Dict[str, Any]]:
         """벡터 검색 수행"""
-        if not self._initialized:
-            await self.initialize()
-        
-        tool = self.tools.get("search_vector")
-        if not tool:
-            raise ValueError("벡터 검색 도구를 찾을 수 없습니다")
-        
-        result = await tool.ainvoke({
+        return await self._call_tool("search_vector", {
             "query": query,
             "collection": collection,
             "top_k": top_k
-        })
-        
-        return result
+        }, "벡터 검색 도구를 찾을 수 없습니다")
     
     async def search_web(
         self,
@@ -102,63 +590,98 @@ class MCPSearchClient:
         search_depth: str = "basic"
     ) -> List[Dict[str, Any]]:
         """웹 검색 수행"""
-        if not self._initialized:
-            await self.initialize()
-        
-        tool = self.tools.get("search_web")
-        if not tool:
-            raise ValueError("웹 검색 도구를 찾을 수 없습니다")
-        
-        result = await tool.ainvoke({
+        return await self._call_tool("search_web", {
             "query": query,
             "max_results": max_results,
             "search_depth": search_depth
-        })
-        
-        return result
+        }, "웹 검색 도구를 찾을 수 없습니다")
     
     async def search_all(
         self,
         query: str,
         collection: str = "default",
-        max_results: int = 10
+        max_results: int = 10,
+        deadline_ms: int | None = None,
+        fusion: str | None = None,
+        top_n: int = 10
     ) -> Dict[str, List[Dict[str, Any]]]:
-        """통합 검색 수행"""
-        if not self._initialized:
-            await self.initialize()
-        
-        tool = self.tools.get("search_all")
-        if not tool:
-            raise ValueError("통합 검색 도구를 찾을 수 없습니다")
+        """
+        통합 검색 수행
         
-        result = await tool.ainvoke({
+        Args:
+            query: 검색 쿼리
+            collection: 벡터 검색 컬렉션
+            max_results: 각 검색 유형별 최대 결과 수
+            deadline_ms: 지정 시 마감 시간 내 도착한 결과만 반환
+            fusion: 지정 시("rrf"/"minmax") 서버에서 융합·중복 제거된 "results" 목록 반환
+            top_n: 융합 시 반환할 최대 결과 수
+        """
+        params = {
             "query": query,
             "collection": collection,
             "max_results": max_results
-        })
+        }
+        if deadline_ms is not None:
+            params["deadline_ms"] = deadline_ms
+        if fusion is not None:
+            params["fusion"] = fusion
+            params["top_n"] = top_n
         
-        return result
+        return await self._call_tool("search_all", params, "통합 검색 도구를 찾을 수 없습니다")
+    
+    async def search_batch(
+        self,
+        queries: List[Dict[str, Any]],
+        max_concurrency: int = 10
+    ) -> Dict[str, Any]:
+        """
+        배치 검색 수행
+        
+        Args:
+            queries: {"query", "backend", "collection", "top_k", "max_results", "search_depth"} 형태의 쿼리 목록
+            max_concurrency: 서버에서 동시에 실행할 최대 쿼리 수
+        
+        Returns:
+            {"results": [{"query": ..., "backend": ..., "vector": [...], "web": [...]}, ...], ...} 형태의
+            배치 검색 결과 (queries와 같은 순서)
+        """
+        return await self._call_tool("search_batch", {
+            "queries": queries,
+            "max_concurrency": max_concurrency
+        }, "배치 검색 도구를 찾을 수 없습니다")
     
     async def close(self) -> None:
         """클라이언트 종료"""
-        if self.client:
-            await self.client.close()
-            self._initialized = False
+        await asyncio.gather(
+            *(connection.close() for connection in self.connections),
+            return_exceptions=True
+        )
+        self._initialized = False
 
 
-# 싱글톤 인스턴스
-_mcp_client_instance = None
+# 서버 목록별 클라이언트 레지스트리
+_mcp_clients: Dict[Tuple[str, ...], MCPSearchClient] = {}
+_mcp_clients_lock = asyncio.Lock()
 
 
-async def get_mcp_client() -> MCPSearchClient:
-    """MCP 클라이언트 싱글톤 인스턴스 반환"""
-    global _mcp_client_instance
+async def get_mcp_client(mcp_server_urls: Sequence[str] | None = None) -> MCPSearchClient:
+    """
+    MCP 클라이언트 인스턴스 반환 (같은 서버 목록이면 같은 인스턴스)
+    
+    시작 시 여러 코루틴이 동시에 호출해도 클라이언트는 한 번만 생성·초기화됩니다.
     
-    if _mcp_client_instance is None:
-        _mcp_client_instance = MCPSearchClient()
-        await _mcp_client_instance.initialize()
+    Args:
+        mcp_server_urls: MCP 서버 URL 목록 (기본값: 환경변수 MCP_SERVER_URLS 또는 MCP_SERVER_URL)
+    """
+    key = tuple(_resolve_server_urls(mcp_server_urls=mcp_server_urls))
     
-    return _mcp_client_instance
+    async with _mcp_clients_lock:
+        if key not in _mcp_clients:
+            _mcp_clients[key] = MCPSearchClient(mcp_server_urls=key)
+        client = _mcp_clients[key]
+    
+    await client.initialize()
+    return client
 
 
 # 편의 함수들
@@ -174,10 +697,23 @@ async def search_web(query: str, max_results: int = 5, search_depth: str = "basi
     return await client.search_web(query, max_results, search_depth)
 
 
-async def search_all(query: str, collection: str = "default", max_results: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+async def search_all(
+    query: str,
+    collection: str = "default",
+    max_results: int = 10,
+    deadline_ms: int | None = None,
+    fusion: str | None = None,
+    top_n: int = 10
+) -> Dict[str, List[Dict[str, Any]]]:
     """통합 검색 편의 함수"""
     client = await get_mcp_client()
-    return await client.search_all(query, collection, max_results)
+    return await client.search_all(query, collection, max_results, deadline_ms, fusion, top_n)
+
+
+async def search_batch(queries: List[Dict[str, Any]], max_concurrency: int = 10) -> Dict[str, Any]:
+    """배치 검색 편의 함수"""
+    client = await get_mcp_client()
+    return await client.search_batch(queries, max_concurrency)
 
 
 # 테스트 코드
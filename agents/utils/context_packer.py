@@ -0,0 +1,167 @@
+"""
+토큰 예산 기반 컨텍스트 패킹 유틸리티
+
+검색 결과를 LLM 프롬프트에 넣을 때 결과마다 고정 길이로 자르는 대신, 전체 토큰 예산을
+관련성 점수에 비례해 나누고 결과마다 쿼리와 가장 관련 있는 문장부터 채웁니다.
+프롬프트 크기가 일정하므로 LLM 지연 시간과 비용을 예측할 수 있습니다.
+"""
+import re
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # langchain-openai가 설치되지 않은 환경
+    tiktoken = None
+
+
+Tokenizer = Callable[[str], int]
+
+# 문장 경계 (마침표·물음표·느낌표 뒤 공백, 줄바꿈)
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。])\s+|\n+")
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _estimate_tokens(text: str) -> int:
+    """tiktoken이 없을 때의 토큰 수 추정 (영문 약 4자, 한글 약 1자당 1토큰)"""
+    ascii_chars = sum(1 for char in text if char.isascii())
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+@lru_cache(maxsize=8)
+def get_tokenizer(model_name: Optional[str] = None) -> Tokenizer:
+    """
+    모델에 맞는 토큰 수 계산 함수 (모델별로 한 번만 로드)
+
+    tiktoken이 모르는 모델(Gemini 등)은 cl100k_base로 근사하고,
+    tiktoken이 없으면 문자 수 기반 추정을 사용합니다.
+    """
+    if tiktoken is None:
+        return _estimate_tokens
+
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model_name or "")
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # 인코딩 파일을 내려받지 못하는 오프라인 환경
+        return _estimate_tokens
+
+    def count(text: str) -> int:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return count
+
+
+def split_sentences(text: str) -> List[str]:
+    """문장 단위로 분리 (빈 문장 제외)"""
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+
+def _terms(text: str) -> Set[str]:
+    return {term for term in _WORD_PATTERN.findall(text.lower()) if len(term) > 1}
+
+
+def _sentence_score(sentence: str, query_terms: Set[str]) -> float:
+    """쿼리 단어와 겹치는 비율 (한국어 조사를 고려해 쿼리 단어가 접두어인 경우도 포함)"""
+    if not query_terms:
+        return 0.0
+    terms = _terms(sentence)
+    hits = sum(
+        1 for query_term in query_terms
+        if query_term in terms or any(term.startswith(query_term) for term in terms)
+    )
+    return hits / len(query_terms)
+
+
+def _select_sentences(
+    content: str,
+    query_terms: Set[str],
+    budget: int,
+    count_tokens: Tokenizer,
+) -> Tuple[str, int]:
+    """관련성 높은 문장부터 budget 안에서 고른 뒤 원래 순서로 이어 붙임"""
+    sentences = split_sentences(content)
+    ranked = sorted(
+        range(len(sentences)),
+        key=lambda index: (-_sentence_score(sentences[index], query_terms), index),
+    )
+
+    chosen: List[int] = []
+    used = 0
+    for index in ranked:
+        tokens = count_tokens(sentences[index]) + 1
+        if used + tokens > budget:
+            continue
+        chosen.append(index)
+        used += tokens
+
+    if not chosen and ranked:
+        # 문장 하나가 예산보다 길면 가장 관련 있는 문장을 토큰 비율만큼 잘라 사용
+        sentence = sentences[ranked[0]]
+        cut = sentence[:max(1, len(sentence) * budget // (count_tokens(sentence) + 1) - 1)]
+        while len(cut) > 1 and count_tokens(cut) + 1 > budget:
+            cut = cut[:len(cut) * 9 // 10]
+        return cut + "…", count_tokens(cut) + 1
+
+    return " ".join(sentences[index] for index in sorted(chosen)), used
+
+
+def pack_context(
+    query: str,
+    items: Sequence[Tuple[str, str, float]],
+    token_budget: int,
+    count_tokens: Optional[Tokenizer] = None,
+    min_item_tokens: int = 40,
+) -> Tuple[List[Tuple[int, str]], int]:
+    """
+    토큰 예산 안에서 항목별 본문 발췌
+
+    항목은 점수 순으로 처리하며, 각 항목은 남은 예산을 남은 항목들의 점수 비율로
+    나눈 만큼(최소 min_item_tokens) 문장을 고릅니다. 앞 항목이 쓰지 않은 예산은
+    뒤 항목으로 넘어가고, 남은 예산이 min_item_tokens보다 작아지면 멈춥니다.
+
+    Args:
+        query: 문장 관련성을 판단할 쿼리 (조사 주제와 검색 키워드)
+        items: (머리글, 본문, 점수) 목록, 머리글 토큰도 예산에 포함
+        token_budget: 전체 토큰 예산
+        count_tokens: 토큰 수 계산 함수 (기본값: get_tokenizer())
+        min_item_tokens: 항목 하나에 배정할 최소 토큰 수
+
+    Returns:
+        (원래 인덱스, 머리글과 발췌 본문) 목록과 사용한 토큰 수
+    """
+    count_tokens = count_tokens or get_tokenizer()
+    query_terms = _terms(query)
+    order = sorted(range(len(items)), key=lambda index: -max(items[index][2], 0.0))
+
+    packed: List[Tuple[int, str]] = []
+    remaining = token_budget
+    remaining_score = sum(max(items[index][2], 0.0) for index in order)
+
+    for position, index in enumerate(order):
+        header, content, score = items[index]
+        if remaining < min_item_tokens:
+            break
+
+        score = max(score, 0.0)
+        if remaining_score > 0:
+            share = int(remaining * score / remaining_score)
+        else:
+            share = remaining // (len(order) - position)
+        remaining_score -= score
+
+        header_tokens = count_tokens(header) + 1
+        allocation = min(remaining, max(share, min_item_tokens))
+        if allocation <= header_tokens:
+            continue
+
+        excerpt, used = _select_sentences(content, query_terms, allocation - header_tokens, count_tokens)
+        if not excerpt:
+            continue
+
+        packed.append((index, f"{header}\n{excerpt}"))
+        remaining -= header_tokens + used
+
+    return packed, token_budget - remaining
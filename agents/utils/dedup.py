@@ -0,0 +1,100 @@
+"""
+검색 결과 근사 중복 제거 유틸리티
+
+문자 n-gram 집합의 MinHash 서명으로 Jaccard 유사도를 추정해 표현만 조금 다른 결과를 묶습니다.
+셔플 해시는 crc32와 고정 시드를 사용하므로 프로세스·실행마다 결과가 같습니다.
+"""
+import re
+import zlib
+from typing import List, Sequence
+
+import numpy as np
+
+
+# 해시 함수 (a * x + b) mod p 의 소수 (a, b, x < 2^32 이므로 uint64에서 넘치지 않음)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _shingle_hashes(text: str, ngram: int) -> List[int]:
+    """정규화한 텍스트의 문자 n-gram 해시 목록 (한국어처럼 띄어쓰기가 불규칙해도 동작)"""
+    normalized = _WHITESPACE.sub(" ", text.lower()).strip()
+    if len(normalized) <= ngram:
+        return [zlib.crc32(normalized.encode("utf-8"))]
+    return list({
+        zlib.crc32(normalized[i:i + ngram].encode("utf-8"))
+        for i in range(len(normalized) - ngram + 1)
+    })
+
+
+def minhash_signatures(
+    texts: Sequence[str],
+    num_perm: int = 64,
+    ngram: int = 5,
+    seed: int = 42,
+) -> np.ndarray:
+    """
+    텍스트 목록의 MinHash 서명 계산
+
+    Args:
+        texts: 텍스트 목록
+        num_perm: 서명 길이 (클수록 유사도 추정이 정확해짐)
+        ngram: 문자 n-gram 길이
+        seed: 해시 함수 시드
+
+    Returns:
+        (len(texts), num_perm) 크기의 uint64 배열
+    """
+    if not texts:
+        return np.empty((0, num_perm), dtype=np.uint64)
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+    # 모든 텍스트의 shingle 해시를 한 배열로 이어 붙여 한 번에 계산
+    hashes = [_shingle_hashes(text, ngram) for text in texts]
+    offsets = np.cumsum([0] + [len(items) for items in hashes[:-1]])
+    values = np.fromiter(
+        (value for items in hashes for value in items),
+        dtype=np.uint64,
+        count=sum(len(items) for items in hashes),
+    )
+
+    permuted = ((values[:, None] * a[None, :] + b[None, :]) % _MERSENNE_PRIME) & _MAX_HASH
+    return np.minimum.reduceat(permuted, offsets, axis=0)
+
+
+def cluster_near_duplicates(
+    texts: Sequence[str],
+    threshold: float = 0.7,
+    num_perm: int = 64,
+    ngram: int = 5,
+    seed: int = 42,
+) -> List[int]:
+    """
+    근사 중복 텍스트 묶기
+
+    앞에서부터 차례로 이미 대표로 뽑힌 텍스트와의 추정 Jaccard 유사도를 계산해,
+    threshold 이상이면 그 대표의 묶음에 넣고 아니면 새 대표로 삼습니다.
+    점수 순으로 정렬한 목록을 넘기면 묶음마다 점수가 가장 높은 항목이 대표가 됩니다.
+
+    Returns:
+        각 텍스트가 속한 묶음의 대표 인덱스 목록 (대표 자신은 자기 인덱스)
+    """
+    signatures = minhash_signatures(texts, num_perm=num_perm, ngram=ngram, seed=seed)
+    leaders: List[int] = []
+    representatives: List[int] = []
+
+    for index in range(len(texts)):
+        if representatives:
+            similarity = (signatures[representatives] == signatures[index]).mean(axis=1)
+            best = int(similarity.argmax())
+            if similarity[best] >= threshold:
+                leaders.append(representatives[best])
+                continue
+        representatives.append(index)
+        leaders.append(index)
+
+    return leaders
@@ -0,0 +1,172 @@
+"""
+LLM 없이 검색 키워드를 추출하는 로컬 추출기
+
+RAKE(Rapid Automatic Keyword Extraction) 방식으로 불용어와 문장 부호를 경계로 후보 구를 나누고,
+단어의 차수(degree)/빈도 비율로 구 점수를 매깁니다. 한국어는 조사와 요청 어미("~해주세요")를
+떼어낸 뒤 같은 방식으로 처리합니다. 결과에는 신뢰도가 함께 반환되어, 신뢰도가 낮은
+모호한 쿼리만 LLM으로 넘길 수 있습니다.
+"""
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+
+
+ENGLISH_STOPWORDS = frozenset("""
+a about above after all also an and any are as at be because been before being between both but by
+can could did do does doing for from further had has have having here how i if in into is it its
+itself just me more most my no nor not of on or other our out over own please same should so some
+such than that the their them then there these they this those through to too under until up very
+was we were what when where which while who whom why will with would you your
+research find search tell explain describe show give summarize summary information info latest
+""".split())
+
+KOREAN_STOPWORDS = frozenset("""
+그리고 그러나 하지만 또는 및 등 등등 이 그 저 것 수 때 중 더 좀 잘 왜 어떻게 무엇 무엇인가 어떤 어느
+대해 대해서 대한 관해 관해서 관한 관련 관련된 위한 위해 통해 통한 따른 따라 있는 있다 없는 없다 하는 하다
+조사 설명 알려 정리 요약 검색 찾아 알아 소개 말해 부탁 주세요 자료 정보 내용 무엇인지 방법 알고 싶어 싶습니다
+이거 이것 그것 저것 뭐 뭐야 뭔가 뭔지 해 하 해주세요 해줘
+""".split())
+
+# 뒤에 붙은 조사 (긴 것부터 검사), 조사·어미 모두 떼어낸 뒤 어간이 2글자 이상일 때만 적용
+_KOREAN_PARTICLES = (
+    "에서는", "으로는", "에게서", "이라는", "이란", "에서", "으로", "에게", "까지", "부터", "보다", "처럼", "이나",
+    "이랑", "하고", "에는", "과의", "와의", "라는", "란", "에", "의", "을", "를", "은", "는", "이", "가",
+    "와", "과", "도", "만", "로",
+)
+# 요청·서술 어미 (떼어낸 어간이 불용어인지 다시 확인)
+_KOREAN_ENDINGS = (
+    "해주시겠어요", "해주십시오", "해주세요", "해주실래요", "하십시오", "해줄래", "주세요", "해줘", "하세요",
+    "합니다", "입니다", "했다", "한다", "하는", "해봐", "해", "한",
+)
+# 조사가 붙어 있으면 구가 끝난 것으로 보는 조사 ("의"는 앞뒤를 이어 줌)
+_PHRASE_JOINING_PARTICLES = frozenset({"의"})
+
+_TOKEN_PATTERN = re.compile(r"[\w][\w+#.\-]*[\w+#]|\w", re.UNICODE)
+_PHRASE_BOUNDARY = re.compile(r"[,;:!?()\[\]{}\"'“”‘’/|\n]|\.(?:\s|$)")
+_HANGUL = re.compile(r"[가-힣]")
+_WHITESPACE = re.compile(r"\s+")
+
+MAX_PHRASE_WORDS = 3
+
+
+class KeywordExtraction(NamedTuple):
+    """로컬 키워드 추출 결과"""
+    keywords: Tuple[str, ...]
+    confidence: float
+
+
+def normalize_query(query: str) -> str:
+    """메모이제이션 키이자 추출 대상인 정규화 쿼리 (소문자, 공백 정리)"""
+    return _WHITESPACE.sub(" ", query).strip().lower()
+
+
+def _strip_korean(token: str) -> Tuple[str, str]:
+    """한글로 끝나는 토큰에서 조사·요청 어미를 떼어 (어간, 떼어낸 조사) 반환"""
+    if not _HANGUL.match(token[-1]) or token in KOREAN_STOPWORDS:
+        return token, ""
+    for ending in _KOREAN_ENDINGS:
+        if token.endswith(ending) and len(token) - len(ending) >= 2:
+            return token[:-len(ending)], ""
+    for particle in _KOREAN_PARTICLES:
+        if token.endswith(particle) and len(token) - len(particle) >= 2:
+            return token[:-len(particle)], particle
+    return token, ""
+
+
+def _is_stopword(word: str) -> bool:
+    return (
+        word in ENGLISH_STOPWORDS
+        or word in KOREAN_STOPWORDS
+        or (len(word) == 1 and not _HANGUL.match(word))
+        or word.isdigit()
+    )
+
+
+def _candidate_phrases(query: str) -> Tuple[List[Tuple[str, ...]], int]:
+    """불용어·문장 부호·조사를 경계로 나눈 후보 구 목록과 전체 토큰 수"""
+    phrases: List[Tuple[str, ...]] = []
+    total_tokens = 0
+
+    for segment in _PHRASE_BOUNDARY.split(query):
+        current: List[str] = []
+        for token in _TOKEN_PATTERN.findall(segment):
+            total_tokens += 1
+            word, particle = _strip_korean(token)
+            if _is_stopword(word):
+                if current:
+                    phrases.append(tuple(current))
+                current = []
+                continue
+
+            current.append(word)
+            if len(current) == MAX_PHRASE_WORDS or (particle and particle not in _PHRASE_JOINING_PARTICLES):
+                phrases.append(tuple(current))
+                current = []
+        if current:
+            phrases.append(tuple(current))
+
+    return phrases, total_tokens
+
+
+@lru_cache(maxsize=1024)
+def _extract(normalized_query: str, max_keywords: int) -> KeywordExtraction:
+    phrases, total_tokens = _candidate_phrases(normalized_query)
+    if not phrases:
+        return KeywordExtraction((), 0.0)
+
+    # RAKE 단어 점수: 긴 구에 함께 등장하는 단어일수록 높음 (degree / frequency)
+    frequency: Dict[str, int] = defaultdict(int)
+    degree: Dict[str, int] = defaultdict(int)
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word] += 1
+            degree[word] += len(phrase)
+    word_score = {word: degree[word] / frequency[word] for word in frequency}
+
+    phrase_scores: Dict[str, float] = {}
+    for phrase in phrases:
+        text = " ".join(phrase)
+        phrase_scores[text] = max(
+            phrase_scores.get(text, 0.0), sum(word_score[word] for word in phrase)
+        )
+
+    # 점수 순으로 구를 넣고, 여러 단어로 된 구의 개별 단어도 뒤에 보충 (검색 fan-out용)
+    keywords: List[str] = []
+    seen = set()
+    ranked = sorted(phrase_scores.items(), key=lambda item: -item[1])
+    for text, _ in ranked:
+        if text not in seen:
+            keywords.append(text)
+            seen.add(text)
+    for text, _ in ranked:
+        words = text.split(" ")
+        for word in words:
+            if len(words) > 1 and word not in seen:
+                keywords.append(word)
+                seen.add(word)
+    keywords = keywords[:max_keywords]
+
+    # 신뢰도: 내용어 비율이 높고, 키워드가 충분하며, 쿼리가 짧을수록 높음
+    content_words = sum(len(phrase) for phrase in phrases)
+    content_ratio = content_words / max(total_tokens, 1)
+    coverage = min(1.0, len(keywords) / 3)
+    length_factor = 1.0 if total_tokens <= 20 else 20 / total_tokens
+    confidence = round(coverage * length_factor * min(1.0, content_ratio * 2), 3)
+
+    return KeywordExtraction(tuple(keywords), confidence)
+
+
+def extract_keywords(query: str, max_keywords: int = 8) -> KeywordExtraction:
+    """
+    조사 주제에서 검색 키워드 추출 (소문자로 정규화한 쿼리별로 메모이제이션)
+
+    Args:
+        query: 조사 주제
+        max_keywords: 최대 키워드 수
+
+    Returns:
+        점수 순 키워드와 0.0 ~ 1.0 신뢰도
+        (내용어가 적거나 문장이 길어 구를 제대로 나누기 어려운 쿼리일수록 낮음)
+    """
+    return _extract(normalize_query(query), max_keywords)
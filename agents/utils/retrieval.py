@@ -0,0 +1,136 @@
+"""
+조사 데이터 청크 분할과 BM25 검색 유틸리티
+
+보고서 작성 시 조사 데이터 전체를 한 번만 청크로 나누고 메모리 BM25 인덱스를 만들어,
+섹션마다 개요 항목과 관련된 청크만 프롬프트에 넣을 수 있게 합니다.
+한국어는 조사가 붙어도 일치하도록 단어 대신 글자 bigram으로 색인합니다.
+"""
+import json
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
+
+from agents.utils.context_packer import split_sentences
+from agents.utils.keywords import ENGLISH_STOPWORDS
+
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+_HANGUL = re.compile(r"[가-힣]")
+
+
+def flatten_research_data(research_data: Any) -> str:
+    """
+    조사 데이터를 검색용 텍스트로 변환
+
+    JSON 문자열이나 딕셔너리로 전달된 경우("research_summary" 등) 키와 값을 풀어
+    유니코드 이스케이프 없이 이어 붙입니다.
+    """
+    if isinstance(research_data, str):
+        try:
+            research_data = json.loads(research_data)
+        except (json.JSONDecodeError, ValueError):
+            return research_data
+
+    if isinstance(research_data, dict):
+        return "\n\n".join(
+            f"{key}:\n{flatten_research_data(value)}"
+            for key, value in research_data.items() if value
+        )
+    if isinstance(research_data, list):
+        return "\n\n".join(flatten_research_data(item) for item in research_data)
+    return str(research_data)
+
+
+def chunk_text(text: str, chunk_chars: int = 600, overlap_sentences: int = 1) -> List[str]:
+    """
+    문장 경계를 지키며 chunk_chars 안팎의 청크로 분할
+
+    청크 사이에 overlap_sentences개의 문장을 겹쳐 문맥이 끊기지 않게 합니다.
+    chunk_chars보다 긴 문장은 그대로 하나의 청크가 됩니다.
+    """
+    sentences = split_sentences(text)
+    chunks: List[str] = []
+    current: List[str] = []
+    length = 0
+
+    for sentence in sentences:
+        if current and length + len(sentence) > chunk_chars:
+            chunks.append(" ".join(current))
+            current = current[-overlap_sentences:] if overlap_sentences else []
+            length = sum(len(item) + 1 for item in current)
+        current.append(sentence)
+        length += len(sentence) + 1
+
+    if current and (not chunks or len(current) > overlap_sentences):
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def tokenize(text: str) -> List[str]:
+    """BM25 색인 토큰 (영문은 단어, 한글이 포함된 단어는 글자 bigram)"""
+    tokens: List[str] = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        if _HANGUL.search(word):
+            if len(word) <= 2:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif word not in ENGLISH_STOPWORDS and len(word) > 1:
+            tokens.append(word)
+    return tokens
+
+
+class BM25Index:
+    """메모리 BM25(Okapi) 인덱스"""
+
+    def __init__(self, documents: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        """
+        BM25 인덱스 생성
+
+        Args:
+            documents: 색인할 문서(청크) 목록
+            k1: 단어 빈도 포화 계수
+            b: 문서 길이 정규화 계수
+        """
+        self.documents = list(documents)
+        self.k1 = k1
+        self.b = b
+        self._term_freqs: List[Counter] = [Counter(tokenize(document)) for document in self.documents]
+        self._lengths = [sum(freqs.values()) for freqs in self._term_freqs]
+        self._avg_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+
+        doc_freqs: Dict[str, int] = Counter()
+        for freqs in self._term_freqs:
+            doc_freqs.update(freqs.keys())
+        count = len(self.documents)
+        self._idf = {
+            term: math.log(1 + (count - freq + 0.5) / (freq + 0.5))
+            for term, freq in doc_freqs.items()
+        }
+
+    def search(self, query: str, top_k: int = 4) -> List[Tuple[int, float]]:
+        """쿼리와 관련성이 높은 순서로 (문서 인덱스, 점수) 반환 (점수 0인 문서 제외)"""
+        terms = [term for term in set(tokenize(query)) if term in self._idf]
+        if not terms:
+            return []
+
+        scores = []
+        for index, freqs in enumerate(self._term_freqs):
+            norm = self.k1 * (1 - self.b + self.b * self._lengths[index] / (self._avg_length or 1.0))
+            score = sum(
+                self._idf[term] * freqs[term] * (self.k1 + 1) / (freqs[term] + norm)
+                for term in terms if term in freqs
+            )
+            if score > 0:
+                scores.append((index, score))
+
+        scores.sort(key=lambda item: -item[1])
+        return scores[:top_k]
+
+
+@lru_cache(maxsize=8)
+def build_index(chunks: Tuple[str, ...]) -> BM25Index:
+    """청크 목록의 BM25 인덱스 (같은 청크 목록이면 수정 단계에서도 재사용)"""
+    return BM25Index(chunks)
@@ -1,5 +1,5 @@
 """All-Search MCP Server Package"""
-from .server import mcp, search_vector, search_web, search_all
+from .server import mcp, search_vector, search_web, search_all, search_batch
 
 __version__ = "1.0.0"
-__all__ = ["mcp", "search_vector", "search_web", "search_all"]
\ No newline at end of file
+__all__ = ["mcp", "search_vector", "search_web", "search_all", "search_batch"]
\ No newline at end of file
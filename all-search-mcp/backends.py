@@ -0,0 +1,278 @@
+"""All-Search MCP 서버의 검색 백엔드 어댑터
+
+벡터 검색(LangConnect)과 웹 검색(Tavily) 호출을 어댑터로 분리해 교체할 수 있게 합니다.
+FakeVectorBackend/FakeWebBackend는 실제 Tavily·Postgres 없이 벤치마크할 수 있도록
+설정한 지연 시간·오류 분포를 따르는 결정적(deterministic) 결과를 돌려줍니다.
+
+어댑터는 장애를 httpx 예외(ConnectError, TimeoutException, HTTPStatusError)로 알리고,
+서버는 이를 회로 차단기에 기록한 뒤 오류 결과로 변환합니다.
+"""
+import asyncio
+import hashlib
+import random
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Protocol
+
+import httpx
+from pydantic import BaseModel, Field
+
+from http_pool import BackendPool
+
+
+class SearchResult(BaseModel):
+    """검색 결과 모델"""
+    title: str = Field(description="제목")
+    content: str = Field(description="내용")
+    url: Optional[str] = Field(default=None, description="URL")
+    source: str = Field(description="출처 (web/vector)")
+    score: float = Field(description="관련성 점수")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="추가 메타데이터")
+
+
+class VectorSearchBackend(Protocol):
+    """벡터 검색 백엔드 인터페이스"""
+    name: str
+
+    async def search(
+        self, query: str, collection: str, top_k: int, timeout: float
+    ) -> List[Dict[str, Any]]: ...
+
+    async def health(self, timeout: float) -> str: ...
+
+
+class WebSearchBackend(Protocol):
+    """웹 검색 백엔드 인터페이스"""
+    name: str
+    configured: bool
+
+    async def search(
+        self, query: str, max_results: int, search_depth: str, timeout: float
+    ) -> List[Dict[str, Any]]: ...
+
+
+def _raise_for_server_error(response: httpx.Response) -> None:
+    """5xx 응답은 백엔드 장애로 보고 예외 발생 (4xx는 호출자 오류로 결과에 포함)"""
+    if response.status_code >= 500:
+        response.raise_for_status()
+
+
+class LangConnectBackend:
+    """LangConnect REST API 벡터 검색 어댑터"""
+    name = "langconnect"
+
+    def __init__(self, api_url: str, pool: BackendPool):
+        self.api_url = api_url
+        self.pool = pool
+
+    async def search(
+        self, query: str, collection: str, top_k: int, timeout: float
+    ) -> List[Dict[str, Any]]:
+        response = await self.pool.post(
+            f"{self.api_url}/collections/{collection}/search",
+            json={
+                "query": query,
+                "top_k": top_k,
+                "metadata_filter": {}
+            },
+            timeout=timeout
+        )
+        _raise_for_server_error(response)
+
+        if response.status_code != 200:
+            return [{
+                "error": f"LangConnect API error: {response.status_code}",
+                "message": response.text
+            }]
+
+        data = response.json()
+        results = []
+
+        # 결과 포맷팅
+        for item in data.get("results", []):
+            result = SearchResult(
+                title=item.get("metadata", {}).get("title", "제목 없음"),
+                content=item.get("content", ""),
+                source="vector",
+                score=item.get("score", 0.0),
+                metadata={
+                    "collection": collection,
+                    "document_id": item.get("id", ""),
+                    "created_at": item.get("metadata", {}).get("created_at", "")
+                }
+            )
+            results.append(result.dict())
+
+        return results
+
+    async def health(self, timeout: float) -> str:
+        response = await self.pool.get(f"{self.api_url}/health", timeout=timeout)
+        return "healthy" if response.status_code == 200 else "unhealthy"
+
+
+class TavilyBackend:
+    """Tavily Search API 웹 검색 어댑터"""
+    name = "tavily"
+
+    def __init__(self, api_url: str, api_key: str, pool: BackendPool):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.pool = pool
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    async def search(
+        self, query: str, max_results: int, search_depth: str, timeout: float
+    ) -> List[Dict[str, Any]]:
+        response = await self.pool.post(
+            self.api_url,
+            json={
+                "api_key": self.api_key,
+                "query": query,
+                "max_results": max_results,
+                "search_depth": search_depth,
+                "include_answer": True,
+                "include_raw_content": False
+            },
+            timeout=timeout
+        )
+        _raise_for_server_error(response)
+
+        if response.status_code != 200:
+            return [{
+                "error": f"Tavily API error: {response.status_code}",
+                "message": response.text
+            }]
+
+        data = response.json()
+        results = []
+
+        # 결과 포맷팅
+        for item in data.get("results", []):
+            result = SearchResult(
+                title=item.get("title", ""),
+                content=item.get("content", ""),
+                url=item.get("url", ""),
+                source="web",
+                score=item.get("score", 0.0),
+                metadata={
+                    "published_date": item.get("published_date", ""),
+                    "search_date": datetime.now().isoformat()
+                }
+            )
+            results.append(result.dict())
+
+        # Tavily의 AI 생성 답변도 포함
+        if data.get("answer"):
+            results.insert(0, {
+                "title": "AI 생성 답변",
+                "content": data["answer"],
+                "source": "web",
+                "score": 1.0,
+                "metadata": {"type": "ai_answer"}
+            })
+
+        return results
+
+
+class FakeBackend:
+    """
+    설정한 지연 시간·오류 분포를 따르는 프로세스 내 가짜 백엔드
+
+    지연 시간은 중앙값 latency_ms, 분산 latency_sigma의 로그정규분포를 따르며,
+    같은 seed와 같은 호출 순서에 대해 항상 같은 지연 시간·오류 순서를 만듭니다.
+    결과 내용은 쿼리에서 결정적으로 생성됩니다.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        latency_ms: float = 50.0,
+        latency_sigma: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 42,
+    ):
+        """
+        가짜 백엔드 초기화
+
+        Args:
+            source: 결과의 source 필드 값 (vector/web)
+            latency_ms: 지연 시간 중앙값(밀리초)
+            latency_sigma: 로그정규분포 sigma (0이면 고정 지연)
+            error_rate: 연결 오류를 낼 확률 (0.0 ~ 1.0)
+            seed: 난수 시드
+        """
+        self.source = source
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self.calls = 0
+
+    def _sample_latency(self) -> float:
+        """지연 시간 표본(초)"""
+        if self.latency_sigma <= 0:
+            return self.latency_ms / 1000
+        return self._rng.lognormvariate(0.0, self.latency_sigma) * self.latency_ms / 1000
+
+    async def _simulate(self, timeout: float) -> None:
+        """지연 시간과 오류를 흉내냄 (타임아웃을 넘기면 httpx 타임아웃 예외)"""
+        self.calls += 1
+        latency = self._sample_latency()
+        fail = self._rng.random() < self.error_rate
+
+        if latency > timeout:
+            await asyncio.sleep(timeout)
+            raise httpx.ReadTimeout(f"fake {self.source} backend timed out after {timeout:.2f}s")
+        await asyncio.sleep(latency)
+        if fail:
+            raise httpx.ConnectError(f"fake {self.source} backend error")
+
+    def _results(self, query: str, limit: int, **metadata: Any) -> List[Dict[str, Any]]:
+        """쿼리에서 결정적으로 생성한 결과 목록"""
+        results = []
+        for rank in range(limit):
+            digest = hashlib.sha256(f"{self.seed}:{self.source}:{query}:{rank}".encode()).hexdigest()
+            results.append(SearchResult(
+                title=f"[fake {self.source}] {query} #{rank + 1}",
+                content=f"{query}에 대한 가짜 {self.source} 검색 결과입니다. ({digest[:32]})",
+                url=f"https://fake.example.com/{digest[:16]}" if self.source == "web" else None,
+                source=self.source,
+                score=round(1.0 - rank / (limit + 1), 4),
+                metadata={"fake": True, **metadata}
+            ).dict())
+        return results
+
+    async def health(self, timeout: float) -> str:
+        return "healthy"
+
+
+class FakeVectorBackend(FakeBackend):
+    """가짜 벡터 검색 백엔드"""
+    name = "langconnect"
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(source="vector", **kwargs)
+
+    async def search(
+        self, query: str, collection: str, top_k: int, timeout: float
+    ) -> List[Dict[str, Any]]:
+        await self._simulate(timeout)
+        return self._results(query, top_k, collection=collection)
+
+
+class FakeWebBackend(FakeBackend):
+    """가짜 웹 검색 백엔드"""
+    name = "tavily"
+    configured = True
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(source="web", **kwargs)
+
+    async def search(
+        self, query: str, max_results: int, search_depth: str, timeout: float
+    ) -> List[Dict[str, Any]]:
+        await self._simulate(timeout)
+        return self._results(query, max_results, search_depth=search_depth)
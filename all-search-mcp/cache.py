@@ -0,0 +1,209 @@
+"""All-Search MCP 서버의 검색 결과 캐시
+
+정규화된 (도구, 쿼리, 컬렉션, 결과 수, 검색 깊이) 키로 결과를 보관하는 프로세스 내 캐시입니다.
+백엔드별 TTL, 항목 수/메모리 기준 LRU 축출, 동일 요청의 single-flight 병합을 지원합니다.
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+CacheKey = Tuple[Hashable, ...]
+
+
+def normalize_query(query: str) -> str:
+    """대소문자와 공백 차이를 무시하도록 쿼리 정규화"""
+    return " ".join(query.split()).lower()
+
+
+def make_cache_key(
+    tool: str,
+    query: str,
+    collection: Optional[str] = None,
+    limit: Optional[int] = None,
+    search_depth: Optional[str] = None,
+) -> CacheKey:
+    """캐시 키 생성"""
+    return (tool, normalize_query(query), collection, limit, search_depth)
+
+
+def _estimate_size(value: Any) -> int:
+    """캐시 값의 대략적인 메모리 크기(바이트)"""
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+class _BackendCounters:
+    """백엔드별 히트/미스 카운터"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+class SearchCache:
+    """TTL + LRU 비동기 검색 캐시"""
+
+    def __init__(
+        self,
+        ttls: Dict[str, float],
+        max_size: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: float = 300.0,
+        enabled: bool = True,
+    ):
+        """
+        검색 캐시 초기화
+
+        Args:
+            ttls: 백엔드 이름별 TTL(초)
+            max_size: 최대 항목 수
+            max_bytes: 최대 메모리 사용량(바이트, 추정치)
+            default_ttl: ttls에 없는 백엔드의 TTL(초)
+            enabled: 캐시 사용 여부
+        """
+        self.ttls = ttls
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.enabled = enabled
+
+        # key -> (만료 시각, 값, 크기)
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any, int]]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._bytes = 0
+        self._counters: Dict[str, _BackendCounters] = {}
+        self.evictions = 0
+        self.expirations = 0
+
+    def _counter(self, backend: str) -> _BackendCounters:
+        if backend not in self._counters:
+            self._counters[backend] = _BackendCounters()
+        return self._counters[backend]
+
+    def _ttl(self, backend: str) -> float:
+        return self.ttls.get(backend, self.default_ttl)
+
+    def _remove(self, key: CacheKey) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _lookup(self, key: CacheKey) -> Tuple[bool, Any]:
+        """만료되지 않은 항목 조회 (찾으면 LRU 순서 갱신)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, backend: str, key: CacheKey, value: Any) -> None:
+        """항목 저장 후 한도를 넘으면 가장 오래된 항목부터 축출"""
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self._ttl(backend), value, size)
+        self._bytes += size
+
+        while self._entries and (
+            len(self._entries) > self.max_size or self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    async def get_or_load(
+        self,
+        backend: str,
+        key: CacheKey,
+        loader: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """
+        캐시된 값을 반환하거나 loader로 가져와 저장
+
+        동일 키에 대해 진행 중인 요청이 있으면 새로 호출하지 않고 그 결과를 함께 기다립니다.
+
+        Args:
+            backend: TTL과 카운터를 구분할 백엔드 이름
+            key: make_cache_key로 만든 캐시 키
+            loader: 캐시 미스 시 호출할 코루틴 함수
+            should_cache: 결과를 캐시에 저장할지 판단하는 함수 (오류 결과 제외 등)
+
+        Returns:
+            검색 결과
+        """
+        if not self.enabled:
+            return await loader()
+
+        counter = self._counter(backend)
+        found, value = self._lookup(key)
+        if found:
+            counter.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            counter.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        counter.misses += 1
+        task = asyncio.ensure_future(loader())
+        self._inflight[key] = task
+
+        def _on_done(done: asyncio.Future) -> None:
+            self._inflight.pop(key, None)
+            if done.cancelled() or done.exception() is not None:
+                return
+            result = done.result()
+            if should_cache(result):
+                self._store(backend, key, result)
+
+        task.add_done_callback(_on_done)
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        """모든 항목 삭제"""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 메트릭"""
+        hits = sum(c.hits for c in self._counters.values())
+        misses = sum(c.misses for c in self._counters.values())
+        total = hits + misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttls": {**self.ttls, "default": self.default_ttl},
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "inflight": len(self._inflight),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "backends": {name: c.to_dict() for name, c in self._counters.items()},
+        }
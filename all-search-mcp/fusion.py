@@ -0,0 +1,146 @@
+"""All-Search MCP 서버의 검색 결과 융합(fusion) 및 중복 제거
+
+백엔드마다 점수 척도가 다른 결과 목록을 Reciprocal Rank Fusion(RRF) 또는
+min-max 정규화 점수로 하나의 순위 목록으로 합칩니다. 정규화된 URL과
+단어 shingle Jaccard 유사도로 거의 같은 문서를 하나로 묶습니다.
+"""
+import re
+from typing import Any, Dict, FrozenSet, List, Literal, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+FusionMethod = Literal["rrf", "minmax"]
+
+RRF_K = 60
+SHINGLE_SIZE = 3
+NEAR_DUPLICATE_THRESHOLD = 0.7
+
+# URL 정규화 시 제거할 추적용 쿼리 파라미터
+_TRACKING_PARAMS = {"fbclid", "gclid", "msclkid", "ref", "ref_src"}
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """비교용 URL 정규화 (스킴/호스트 소문자, www·추적 파라미터·fragment·끝 슬래시 제거)"""
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/")
+    return urlunsplit(("", host, path, query, ""))
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> FrozenSet[str]:
+    """단어 단위 shingle 집합 (단어 수가 size보다 적으면 단어 집합)"""
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return frozenset(words)
+    return frozenset(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard 유사도"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _rank_scores(results: List[Dict[str, Any]], method: FusionMethod, rrf_k: int) -> List[float]:
+    """백엔드 내 결과 목록에 대한 융합용 점수"""
+    if method == "rrf":
+        return [1.0 / (rrf_k + rank) for rank in range(1, len(results) + 1)]
+
+    scores = [float(result.get("score") or 0.0) for result in results]
+    if not scores:
+        return []
+    low, high = min(scores), max(scores)
+    if high == low:
+        return [1.0] * len(scores)
+    return [(score - low) / (high - low) for score in scores]
+
+
+class _Cluster:
+    """중복으로 판단된 결과 묶음"""
+
+    def __init__(self, result: Dict[str, Any], backend: str, score: float):
+        self.representative = result
+        url = canonicalize_url(result.get("url"))
+        self.urls = {url} if url else set()
+        self.shingles = shingles(f"{result.get('title', '')} {result.get('content', '')}")
+        self.score = score
+        self.backends = {backend}
+        self.size = 1
+
+    def matches(self, url: Optional[str], signature: FrozenSet[str], threshold: float) -> bool:
+        if url and url in self.urls:
+            return True
+        return jaccard(signature, self.shingles) >= threshold
+
+
+def fuse_results(
+    results_by_backend: Dict[str, List[Dict[str, Any]]],
+    method: FusionMethod = "rrf",
+    top_n: int = 10,
+    dedup: bool = True,
+    rrf_k: int = RRF_K,
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    백엔드별 결과 목록을 하나의 순위 목록으로 융합
+
+    Args:
+        results_by_backend: {"vector": [...], "web": [...]} 형태의 결과 (각 목록은 백엔드 순위 순)
+        method: "rrf"(순위 기반) 또는 "minmax"(백엔드별 정규화 점수)
+        top_n: 반환할 최대 결과 수
+        dedup: URL 정규화와 shingle 유사도로 중복 제거 여부
+        rrf_k: RRF 상수 k
+        threshold: 중복으로 판단할 Jaccard 유사도 임계값
+
+    Returns:
+        fused_score 내림차순으로 정렬된 결과 목록
+    """
+    candidates = []
+    for backend, results in results_by_backend.items():
+        valid = [result for result in results if "error" not in result]
+        for result, score in zip(valid, _rank_scores(valid, method, rrf_k)):
+            candidates.append((score, backend, result))
+
+    # 점수가 높은 결과가 묶음의 대표가 되도록 정렬 후 순회
+    candidates.sort(key=lambda item: item[0], reverse=True)
+
+    clusters: List[_Cluster] = []
+    for score, backend, result in candidates:
+        cluster = None
+        url = canonicalize_url(result.get("url"))
+        if dedup:
+            signature = shingles(f"{result.get('title', '')} {result.get('content', '')}")
+            cluster = next(
+                (c for c in clusters if c.matches(url, signature, threshold)), None
+            )
+        if cluster is None:
+            clusters.append(_Cluster(result, backend, score))
+            continue
+
+        # RRF는 여러 백엔드에서 함께 나온 문서에 가산점, min-max는 최고 점수 유지
+        cluster.score = cluster.score + score if method == "rrf" else max(cluster.score, score)
+        cluster.backends.add(backend)
+        cluster.size += 1
+        if url:
+            cluster.urls.add(url)
+
+    clusters.sort(key=lambda c: c.score, reverse=True)
+    return [
+        {
+            **cluster.representative,
+            "fused_score": round(cluster.score, 6),
+            "sources": sorted(cluster.backends),
+            "duplicates": cluster.size - 1,
+        }
+        for cluster in clusters[:top_n]
+    ]
@@ -0,0 +1,120 @@
+"""All-Search MCP 서버의 백그라운드 헬스 체크
+
+일정 주기로 백엔드를 점검해 최근 지연 시간과 오류율 윈도우를 기록해 둡니다.
+상태 리소스는 요청마다 백엔드를 호출하지 않고 이 스냅샷을 바로 반환합니다.
+"""
+import asyncio
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+# 점검 함수는 "healthy"/"unhealthy" 등의 상태 문자열을 반환하고, 연결 실패 시 예외를 발생시킴
+HealthProbe = Callable[[], Awaitable[str]]
+
+
+class BackendHealth:
+    """백엔드별 헬스 기록"""
+
+    def __init__(self, window: int = 20):
+        self.status = "unknown"
+        self.last_checked: Optional[str] = None
+        self.last_latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._outcomes: deque = deque(maxlen=window)
+
+    def record(self, status: str, latency: float, error: Optional[str] = None) -> None:
+        self.status = status
+        self.last_checked = datetime.now().isoformat()
+        self.last_latency_ms = round(latency * 1000, 1)
+        self.last_error = error
+        self._outcomes.append(status == "healthy")
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return round(1 - sum(self._outcomes) / len(self._outcomes), 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "last_checked": self.last_checked,
+            "last_latency_ms": self.last_latency_ms,
+            "error_rate": self.error_rate,
+            "window": len(self._outcomes),
+            "last_error": self.last_error,
+        }
+
+
+class HealthProber:
+    """백엔드 헬스를 주기적으로 점검하는 백그라운드 작업"""
+
+    def __init__(
+        self,
+        probes: Dict[str, HealthProbe],
+        interval: float = 30.0,
+        timeout: float = 5.0,
+        window: int = 20,
+    ):
+        """
+        헬스 프로버 초기화
+
+        Args:
+            probes: 백엔드 이름별 점검 함수
+            interval: 점검 주기(초)
+            timeout: 점검 1회당 타임아웃(초)
+            window: 오류율 계산에 사용할 최근 점검 수
+        """
+        self.probes = probes
+        self.interval = interval
+        self.timeout = timeout
+        self.records: Dict[str, BackendHealth] = {
+            name: BackendHealth(window) for name in probes
+        }
+        self._task: Optional[asyncio.Task] = None
+
+    async def _probe(self, name: str, probe: HealthProbe) -> None:
+        start = time.monotonic()
+        try:
+            status = await asyncio.wait_for(probe(), timeout=self.timeout)
+            self.records[name].record(status, time.monotonic() - start)
+        except Exception as e:
+            self.records[name].record(
+                "unreachable", time.monotonic() - start, error=str(e) or type(e).__name__
+            )
+
+    async def check_all(self) -> None:
+        """모든 백엔드를 한 번 점검"""
+        await asyncio.gather(
+            *(self._probe(name, probe) for name, probe in self.probes.items())
+        )
+
+    async def _run(self) -> None:
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """백그라운드 점검 시작 (이미 실행 중이면 무시)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """백그라운드 점검 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """백엔드별 최근 헬스 기록"""
+        return {name: record.to_dict() for name, record in self.records.items()}
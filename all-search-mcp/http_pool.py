@@ -0,0 +1,151 @@
+"""All-Search MCP 서버의 백엔드별 HTTP 커넥션 풀
+
+LangConnect, Tavily 등 각 백엔드마다 서버 수명 동안 유지되는 httpx.AsyncClient를
+하나씩 두어 keep-alive 연결을 재사용합니다. 매 검색마다 TCP/TLS 핸드셰이크를
+새로 하지 않도록 하는 것이 목적입니다.
+"""
+import asyncio
+from typing import Any, Dict, Optional
+
+import httpx
+from pydantic import BaseModel, Field
+
+
+class PoolSettings(BaseModel):
+    """백엔드별 커넥션 풀 설정"""
+    max_connections: int = Field(default=20, description="호스트당 최대 동시 연결 수")
+    max_keepalive_connections: int = Field(default=10, description="유지할 최대 keep-alive 연결 수")
+    keepalive_expiry: float = Field(default=30.0, description="유휴 keep-alive 연결 만료 시간(초)")
+    connect_timeout: float = Field(default=5.0, description="연결 타임아웃(초)")
+    read_timeout: float = Field(default=30.0, description="응답 읽기 타임아웃(초)")
+    write_timeout: float = Field(default=10.0, description="요청 쓰기 타임아웃(초)")
+    pool_timeout: float = Field(default=5.0, description="풀에서 연결을 얻기까지 대기 시간(초)")
+
+    def to_limits(self) -> httpx.Limits:
+        """httpx.Limits 변환"""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def to_timeout(self) -> httpx.Timeout:
+        """httpx.Timeout 변환"""
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+
+class BackendPool:
+    """단일 백엔드용 커넥션 풀"""
+
+    def __init__(self, name: str, settings: PoolSettings):
+        self.name = name
+        self.settings = settings
+        self.client: Optional[httpx.AsyncClient] = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+        self.total_errors = 0
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        """클라이언트가 없거나 닫혔으면 새로 생성"""
+        if self.client is None or self.client.is_closed:
+            self.client = httpx.AsyncClient(
+                limits=self.settings.to_limits(),
+                timeout=self.settings.to_timeout(),
+            )
+        return self.client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """풀의 연결을 사용해 HTTP 요청 수행"""
+        client = self._ensure_client()
+        self.in_flight += 1
+        self.total_requests += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return await client.request(method, url, **kwargs)
+        except Exception:
+            self.total_errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """GET 요청"""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """POST 요청"""
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self) -> None:
+        """클라이언트 종료"""
+        if self.client is not None and not self.client.is_closed:
+            await self.client.aclose()
+        self.client = None
+
+    def _connection_counts(self) -> Dict[str, int]:
+        """httpcore 풀의 활성/유휴 연결 수 (조회할 수 없으면 0)"""
+        counts = {"open": 0, "idle": 0}
+        transport = getattr(self.client, "_transport", None)
+        pool = getattr(transport, "_pool", None)
+        for connection in getattr(pool, "connections", []) or []:
+            counts["open"] += 1
+            try:
+                if connection.is_idle():
+                    counts["idle"] += 1
+            except Exception:
+                pass
+        return counts
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 점유 현황 메트릭"""
+        connections = self._connection_counts()
+        return {
+            "open": self.client is not None and not self.client.is_closed,
+            "max_connections": self.settings.max_connections,
+            "max_keepalive_connections": self.settings.max_keepalive_connections,
+            "open_connections": connections["open"],
+            "idle_connections": connections["idle"],
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "utilization": round(self.in_flight / self.settings.max_connections, 3)
+            if self.settings.max_connections else 0.0,
+            "total_requests": self.total_requests,
+            "total_errors": self.total_errors,
+        }
+
+
+class HTTPClientPool:
+    """백엔드 이름별 커넥션 풀 레지스트리"""
+
+    def __init__(self, backends: Dict[str, PoolSettings]):
+        self._pools: Dict[str, BackendPool] = {
+            name: BackendPool(name, settings) for name, settings in backends.items()
+        }
+
+    def get(self, name: str) -> BackendPool:
+        """백엔드 이름으로 풀 조회"""
+        if name not in self._pools:
+            raise KeyError(f"등록되지 않은 백엔드입니다: {name}")
+        return self._pools[name]
+
+    async def start(self) -> None:
+        """모든 백엔드 클라이언트 생성 (이미 열려 있으면 유지)"""
+        for pool in self._pools.values():
+            pool._ensure_client()
+
+    async def close(self) -> None:
+        """모든 백엔드 클라이언트 종료"""
+        await asyncio.gather(
+            *(pool.close() for pool in self._pools.values()),
+            return_exceptions=True
+        )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """백엔드별 풀 메트릭"""
+        return {name: pool.stats() for name, pool in self._pools.items()}
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+"""All-Search MCP Server 부하 테스트 스크립트
+
+run_server.py로 띄운 MCP HTTP 엔드포인트에 목표 RPS로 도구 호출을 보내고
+도구별 p50/p95/p99 지연 시간과 처리량을 출력합니다.
+
+예시:
+    # 가짜 백엔드로 서버 실행
+    SEARCH_BACKEND=fake python all-search-mcp/run_server.py
+    # 30초 동안 초당 50회 호출
+    python all-search-mcp/load_test.py --rps 50 --duration 30 --tool search_vector --tool search_all
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from fastmcp import Client
+
+
+# 쿼리 생성을 위한 단어 목록
+_VOCABULARY = [
+    "LangGraph", "multi-agent", "MCP", "A2A", "벡터 검색", "RAG", "임베딩",
+    "에이전트", "orchestration", "prompt caching", "LLM", "보고서", "워크플로우",
+    "Tavily", "PostgreSQL", "pgvector", "streaming", "latency", "캐시", "검색",
+]
+
+
+def build_queries(count: int, seed: int) -> List[str]:
+    """결정적인 쿼리 목록 생성 (count가 작을수록 같은 쿼리가 자주 반복됨)"""
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(_VOCABULARY, 3)) for _ in range(count)]
+
+
+def build_arguments(tool: str, query: str) -> Dict[str, Any]:
+    """도구별 호출 인자"""
+    if tool == "search_vector":
+        return {"query": query, "top_k": 5}
+    if tool == "search_web":
+        return {"query": query, "max_results": 5}
+    if tool == "search_all":
+        return {"query": query, "max_results": 5}
+    if tool == "search_batch":
+        return {"queries": [{"query": word} for word in query.split()[:3]]}
+    raise ValueError(f"지원하지 않는 도구입니다: {tool}")
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """p 백분위 값"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class ToolStats:
+    """도구별 호출 통계"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.dropped = 0
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        completed = len(self.latencies)
+        return {
+            "completed": completed,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "throughput_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 1),
+            "max_ms": round(max(self.latencies, default=0.0) * 1000, 1),
+        }
+
+
+async def run_load(
+    url: str,
+    tools: List[str],
+    rps: float,
+    duration: float,
+    unique_queries: int,
+    clients: int,
+    max_in_flight: int,
+    seed: int,
+) -> Dict[str, Any]:
+    """
+    목표 RPS로 도구 호출을 보내는 open-loop 부하 생성
+
+    응답을 기다리지 않고 일정 간격으로 요청을 시작하며,
+    동시 요청이 max_in_flight를 넘으면 해당 요청은 dropped로 집계합니다.
+    """
+    queries = build_queries(unique_queries, seed)
+    rng = random.Random(seed)
+    stats = {tool: ToolStats() for tool in tools}
+    sessions = [Client(url) for _ in range(clients)]
+    in_flight: set = set()
+
+    async def call(session: Client, tool: str, arguments: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        try:
+            result = await session.call_tool(tool, arguments)
+            if getattr(result, "is_error", False):
+                stats[tool].errors += 1
+        except Exception:
+            stats[tool].errors += 1
+        finally:
+            stats[tool].latencies.append(time.perf_counter() - start)
+
+    for session in sessions:
+        await session.__aenter__()
+    try:
+        interval = 1.0 / rps
+        started = time.perf_counter()
+        sent = 0
+        while time.perf_counter() - started < duration:
+            tool = tools[sent % len(tools)]
+            if len(in_flight) >= max_in_flight:
+                stats[tool].dropped += 1
+            else:
+                task = asyncio.create_task(call(
+                    sessions[sent % len(sessions)],
+                    tool,
+                    build_arguments(tool, rng.choice(queries))
+                ))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            sent += 1
+            # 누적 오차 없이 다음 요청 시작 시각까지 대기
+            await asyncio.sleep(max(0.0, started + sent * interval - time.perf_counter()))
+
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        elapsed = time.perf_counter() - started
+    finally:
+        for session in sessions:
+            await session.__aexit__(None, None, None)
+
+    return {
+        "url": url,
+        "target_rps": rps,
+        "duration_s": round(elapsed, 2),
+        "unique_queries": unique_queries,
+        "tools": {tool: tool_stats.report(elapsed) for tool, tool_stats in stats.items()},
+    }
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="All-Search MCP Server 부하 테스트")
+    parser.add_argument(
+        "--url",
+        default="http://localhost:8090/mcp",
+        help="MCP 서버 URL (기본값: http://localhost:8090/mcp)"
+    )
+    parser.add_argument(
+        "--tool",
+        action="append",
+        choices=["search_vector", "search_web", "search_all", "search_batch"],
+        help="호출할 도구 (여러 번 지정 가능, 기본값: search_vector)"
+    )
+    parser.add_argument("--rps", type=float, default=20.0, help="목표 초당 요청 수 (기본값: 20)")
+    parser.add_argument("--duration", type=float, default=30.0, help="테스트 시간(초) (기본값: 30)")
+    parser.add_argument(
+        "--unique-queries",
+        type=int,
+        default=100,
+        help="서로 다른 쿼리 수, 작을수록 캐시 히트가 많아짐 (기본값: 100)"
+    )
+    parser.add_argument("--clients", type=int, default=4, help="동시에 유지할 MCP 세션 수 (기본값: 4)")
+    parser.add_argument("--max-in-flight", type=int, default=500, help="최대 동시 요청 수 (기본값: 500)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (기본값: 42)")
+
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(
+        url=args.url,
+        tools=args.tool or ["search_vector"],
+        rps=args.rps,
+        duration=args.duration,
+        unique_queries=args.unique_queries,
+        clients=args.clients,
+        max_in_flight=args.max_in_flight,
+        seed=args.seed,
+    ))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""All-Search MCP 서버의 호출자별·백엔드별 요청 한도
+
+호출자(에이전트)마다 토큰 버킷으로 요청 한도를 두고, 한도를 넘은 요청은
+retry_after와 함께 즉시 거절합니다. 백엔드(Tavily 등) 호출은 백엔드별 토큰 버킷을
+넘지 않도록 가중 공정 큐(weighted fair queuing)에 대기시켜, 한 호출자가 많은 요청을
+보내더라도 다른 호출자의 요청이 번갈아 처리되도록 합니다.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class RateLimitExceeded(Exception):
+    """요청 한도 초과 (retry_after초 후 재시도)"""
+
+    def __init__(self, scope: str, key: str, retry_after: float):
+        self.scope = scope
+        self.key = key
+        self.retry_after = retry_after
+        super().__init__(f"{scope} '{key}' 요청 한도를 초과했습니다 ({retry_after:.1f}초 후 재시도)")
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_consume(self, cost: float = 1.0) -> bool:
+        """토큰이 충분하면 소비하고 True 반환"""
+        self._refill()
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+    def wait_time(self, cost: float = 1.0) -> float:
+        """cost만큼 토큰이 쌓이기까지 남은 시간(초)"""
+        self._refill()
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class FairQueue:
+    """
+    백엔드 토큰 버킷 앞의 가중 공정 큐
+
+    요청마다 가상 완료 시각(virtual finish time)을 매겨 작은 순서로 내보냅니다.
+    같은 호출자의 연속 요청은 cost/weight만큼 뒤로 밀리므로, 요청이 몰린 호출자가
+    있어도 다른 호출자의 요청이 weight 비율에 따라 끼어들 수 있습니다.
+    """
+
+    def __init__(self, name: str, bucket: TokenBucket, max_queue: int = 100, max_wait: float = 5.0):
+        """
+        공정 큐 초기화
+
+        Args:
+            name: 백엔드 이름
+            bucket: 백엔드 토큰 버킷
+            max_queue: 최대 대기 요청 수
+            max_wait: 예상 대기 시간이 이보다 길면 대기하지 않고 거절(초)
+        """
+        self.name = name
+        self.bucket = bucket
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+        self._heap: List[Tuple[float, int, float, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._last_finish: Dict[str, float] = {}
+        self._dispatcher: Optional[asyncio.Task] = None
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+
+    def _finish_tag(self, caller: str, weight: float, cost: float) -> float:
+        start = max(self._virtual_time, self._last_finish.get(caller, 0.0))
+        finish = start + cost / max(weight, 1e-6)
+        self._last_finish[caller] = finish
+        return finish
+
+    def _queued_cost(self) -> float:
+        return sum(cost for _, _, cost, future in self._heap if not future.done())
+
+    async def acquire(self, caller: str, weight: float = 1.0, cost: float = 1.0) -> None:
+        """
+        백엔드 호출 허가를 받을 때까지 대기
+
+        Raises:
+            RateLimitExceeded: 큐가 가득 찼거나 예상 대기 시간이 max_wait를 넘는 경우
+        """
+        if not self._heap and self.bucket.try_consume(cost):
+            # 경합이 없으면 이전 완료 시각은 순서에 의미가 없으므로 정리
+            self._last_finish.clear()
+            self.admitted += 1
+            return
+
+        wait = self.bucket.wait_time(self._queued_cost() + cost)
+        if len(self._heap) >= self.max_queue or wait > self.max_wait:
+            self.rejected += 1
+            raise RateLimitExceeded("backend", self.name, wait)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._heap, (self._finish_tag(caller, weight, cost), next(self._sequence), cost, future)
+        )
+        self.queued += 1
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        # 대기 중 취소되면 future도 취소되어 디스패처가 건너뜀
+        await future
+        self.admitted += 1
+
+    async def _dispatch(self) -> None:
+        """토큰이 쌓이는 대로 가상 완료 시각 순서로 대기 요청을 깨움"""
+        while self._heap:
+            finish, _, cost, future = self._heap[0]
+            if future.done():
+                heapq.heappop(self._heap)
+                continue
+            wait = self.bucket.wait_time(cost)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            self.bucket.try_consume(cost)
+            heapq.heappop(self._heap)
+            self._virtual_time = max(self._virtual_time, finish)
+            future.set_result(None)
+
+        # 가상 시각보다 앞선 호출자 기록은 더 이상 순서에 영향이 없으므로 정리
+        self._last_finish = {
+            caller: finish for caller, finish in self._last_finish.items()
+            if finish > self._virtual_time
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 상태"""
+        return {
+            "rate_per_s": self.bucket.rate,
+            "burst": self.bucket.capacity,
+            "tokens": round(self.bucket.tokens, 2),
+            "waiting": sum(1 for *_, future in self._heap if not future.done()),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+        }
+
+
+class RateLimiter:
+    """호출자별 토큰 버킷과 백엔드별 공정 큐"""
+
+    def __init__(
+        self,
+        requests: int,
+        window: float,
+        backends: Dict[str, FairQueue],
+        weights: Optional[Dict[str, float]] = None,
+        max_callers: int = 10000,
+        enabled: bool = True,
+    ):
+        """
+        요청 한도 초기화
+
+        Args:
+            requests: 호출자별 window초당 허용 요청 수 (버스트 크기이기도 함)
+            window: 호출자 한도 기간(초)
+            backends: 백엔드 이름별 공정 큐
+            weights: 호출자별 가중치 (기본값 1.0, 클수록 백엔드 큐에서 더 많은 몫을 받음)
+            max_callers: 버킷을 유지할 최대 호출자 수 (초과 시 가장 오래 쓰지 않은 호출자부터 제거)
+            enabled: False면 모든 요청 허용
+        """
+        self.requests = requests
+        self.window = window
+        self.backends = backends
+        self.weights = weights or {}
+        self.max_callers = max_callers
+        self.enabled = enabled
+        self._callers: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.rejected: Dict[str, int] = {}
+
+    def _caller_bucket(self, caller: str) -> TokenBucket:
+        bucket = self._callers.get(caller)
+        if bucket is None:
+            bucket = TokenBucket(self.requests / self.window, self.requests)
+            self._callers[caller] = bucket
+            if len(self._callers) > self.max_callers:
+                self._callers.popitem(last=False)
+        else:
+            self._callers.move_to_end(caller)
+        return bucket
+
+    def check_caller(self, caller: str, cost: float = 1.0) -> None:
+        """
+        호출자 한도 확인 후 토큰 소비
+
+        Raises:
+            RateLimitExceeded: 호출자 한도를 초과한 경우
+        """
+        if not self.enabled:
+            return
+        bucket = self._caller_bucket(caller)
+        # 버스트보다 큰 요청(큰 배치)도 버킷이 가득 차면 통과할 수 있도록 제한
+        cost = min(cost, bucket.capacity)
+        if not bucket.try_consume(cost):
+            self.rejected[caller] = self.rejected.get(caller, 0) + 1
+            raise RateLimitExceeded("caller", caller, bucket.wait_time(cost))
+
+    async def acquire_backend(self, backend: str, caller: str, cost: float = 1.0) -> None:
+        """
+        백엔드 호출 허가 대기 (공정 큐가 없는 백엔드는 바로 통과)
+
+        Raises:
+            RateLimitExceeded: 백엔드 큐에서 거절된 경우
+        """
+        queue = self.backends.get(backend)
+        if not self.enabled or queue is None:
+            return
+        await queue.acquire(caller, self.weights.get(caller, 1.0), cost)
+
+    def stats(self) -> Dict[str, Any]:
+        """요청 한도 상태"""
+        return {
+            "enabled": self.enabled,
+            "caller_limit": {"requests": self.requests, "window_s": self.window},
+            "callers": len(self._callers),
+            "rejected_by_caller": dict(self.rejected),
+            "weights": dict(self.weights),
+            "backends": {name: queue.stats() for name, queue in self.backends.items()},
+        }
+
+
+def parse_weights(value: str) -> Dict[str, float]:
+    """"research-agent=2,report-agent=1" 형식의 호출자 가중치 파싱"""
+    weights = {}
+    for item in value.split(","):
+        name, sep, weight = item.partition("=")
+        if sep and name.strip():
+            weights[name.strip()] = float(weight)
+    return weights
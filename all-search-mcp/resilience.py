@@ -0,0 +1,234 @@
+"""All-Search MCP 서버의 백엔드 회로 차단기와 적응형 타임아웃
+
+백엔드가 연속으로 실패하면 회로를 열어(open) 일정 시간 동안 즉시 실패시키고,
+복구 대기 시간이 지나면 half-open 상태에서 시험 요청으로 회복 여부를 확인합니다.
+요청 타임아웃은 최근 관측한 p95 지연 시간을 기준으로 조정합니다.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """회로 차단기가 열려 있어 요청을 보내지 않음"""
+
+    def __init__(self, backend: str, retry_after: float):
+        self.backend = backend
+        self.retry_after = retry_after
+        super().__init__(f"{backend} 회로 차단기가 열려 있습니다 ({retry_after:.1f}초 후 재시도)")
+
+
+class CircuitBreaker:
+    """closed/open/half-open 상태를 가지는 회로 차단기"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        """
+        회로 차단기 초기화
+
+        Args:
+            failure_threshold: 회로를 열기까지의 연속 실패 횟수
+            recovery_timeout: 회로가 열린 뒤 half-open으로 전환하기까지 대기 시간(초)
+            half_open_max_calls: half-open 상태에서 허용할 동시 시험 요청 수
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._half_open_calls = 0
+        self.total_opens = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """현재 상태 (복구 대기 시간이 지났으면 half-open으로 전환)"""
+        if (
+            self._state == STATE_OPEN
+            and self.opened_at is not None
+            and time.monotonic() - self.opened_at >= self.recovery_timeout
+        ):
+            self._state = STATE_HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def retry_after(self) -> float:
+        """회로가 half-open으로 전환되기까지 남은 시간(초)"""
+        if self._state != STATE_OPEN or self.opened_at is None:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+
+    def allow_request(self) -> bool:
+        """요청을 보내도 되는지 확인"""
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def release_trial(self) -> None:
+        """결과 없이 끝난(취소된) half-open 시험 요청의 슬롯 반환"""
+        if self._state == STATE_HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_success(self) -> None:
+        """성공 기록 (half-open이면 회로를 닫음)"""
+        self.consecutive_failures = 0
+        self._state = STATE_CLOSED
+        self.opened_at = None
+        self._half_open_calls = 0
+
+    def record_failure(self) -> None:
+        """실패 기록 (임계값을 넘거나 half-open 시험이 실패하면 회로를 엶)"""
+        self.consecutive_failures += 1
+        if self._state == STATE_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        if self._state != STATE_OPEN:
+            self.total_opens += 1
+        self._state = STATE_OPEN
+        self.opened_at = time.monotonic()
+        self._half_open_calls = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """회로 차단기 상태"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "retry_after": round(self.retry_after(), 1),
+            "total_opens": self.total_opens,
+            "rejected": self.rejected,
+        }
+
+
+class LatencyTracker:
+    """최근 지연 시간 슬라이딩 윈도우"""
+
+    def __init__(self, window: int = 100):
+        self._samples: deque = deque(maxlen=window)
+
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """p 백분위 지연 시간(초), 표본이 없으면 None"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+        return ordered[index]
+
+
+class BackendGuard:
+    """회로 차단기와 적응형 타임아웃으로 백엔드 호출을 보호"""
+
+    def __init__(
+        self,
+        name: str,
+        breaker: CircuitBreaker,
+        min_timeout: float = 1.0,
+        max_timeout: float = 30.0,
+        timeout_multiplier: float = 2.0,
+        min_samples: int = 10,
+        window: int = 100,
+    ):
+        """
+        백엔드 가드 초기화
+
+        Args:
+            name: 백엔드 이름
+            breaker: 회로 차단기
+            min_timeout: 적응형 타임아웃 하한(초)
+            max_timeout: 적응형 타임아웃 상한이자 표본이 부족할 때의 타임아웃(초)
+            timeout_multiplier: p95 지연 시간에 곱할 배수
+            min_samples: 적응형 타임아웃을 적용하기 위한 최소 표본 수
+            window: 지연 시간 표본 윈도우 크기
+        """
+        self.name = name
+        self.breaker = breaker
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.min_samples = min_samples
+        self.latency = LatencyTracker(window)
+
+    def current_timeout(self) -> float:
+        """관측된 p95 지연 시간 기반 타임아웃(초)"""
+        p95 = self.latency.percentile(95)
+        if p95 is None or len(self.latency) < self.min_samples:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p95 * self.timeout_multiplier))
+
+    async def call(
+        self,
+        func: Callable[[float], Awaitable[T]],
+        is_failure: Callable[[T], bool] = lambda result: False,
+    ) -> T:
+        """
+        회로 차단기를 확인하고 적응형 타임아웃으로 백엔드 호출
+
+        Args:
+            func: 타임아웃(초)을 받아 백엔드를 호출하는 코루틴 함수
+            is_failure: 예외 없이 반환된 결과가 백엔드 장애인지 판단하는 함수 (5xx 응답 등)
+
+        Raises:
+            CircuitOpenError: 회로 차단기가 열려 있는 경우
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(self.name, self.breaker.retry_after())
+
+        timeout = self.current_timeout()
+        start = time.monotonic()
+        try:
+            result = await func(timeout)
+        except asyncio.CancelledError:
+            self.breaker.release_trial()
+            raise
+        except Exception:
+            # 빠르게 끝난 연결 오류는 p95를 낮추므로 타임아웃까지 간 경우만 표본에 포함
+            elapsed = time.monotonic() - start
+            if elapsed >= timeout:
+                self.latency.record(elapsed)
+            self.breaker.record_failure()
+            raise
+
+        self.latency.record(time.monotonic() - start)
+        if is_failure(result):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """가드 상태 (회로 차단기 + 지연 시간 + 현재 타임아웃)"""
+        p50 = self.latency.percentile(50)
+        p95 = self.latency.percentile(95)
+        return {
+            **self.breaker.stats(),
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "samples": len(self.latency),
+            "timeout_s": round(self.current_timeout(), 3),
+        }
@@ -3,12 +3,10 @@
 import os
 import sys
 import argparse
-import asyncio
-import signal
 from pathlib import Path
 
 import yaml
-import uvloop
+import uvicorn
 from fastmcp import FastMCP
 from dotenv import load_dotenv
 
@@ -18,7 +16,7 @@ sys.path.insert(0, str(project_root))
 
 # 현재 디렉토리에서 server.py의 mcp 인스턴스 import
 sys.path.insert(0, str(Path(__file__).parent))
-from server import mcp
+from server import mcp, configure_backends
 
 
 def load_config(config_path: str) -> dict:
@@ -48,26 +46,86 @@ def load_config(config_path: str) -> dict:
     return replace_env_vars(config)
 
 
-def run_mcp_server_http(mcp_server: FastMCP, port: int = 8090):
-    """FastMCP 2.x Streamable HTTP 서버 실행"""
-    print(f"FastMCP Streamable HTTP 서버를 포트 {port}에서 시작합니다...", file=sys.stderr)
-    # FastMCP 2.x의 권장 Streamable HTTP 방식 (port 파라미터 포함)
-    mcp_server.run(
-        transport="http",
-        host="0.0.0.0", 
-        port=port,
-        log_level="info"
+# HTTP 서버 기본 설정 (config.yaml의 transport.http 값으로 덮어씀)
+DEFAULT_HTTP_SETTINGS = {
+    "host": "0.0.0.0",
+    "port": 8090,
+    "base_path": "/mcp",
+    "workers": 1,
+    "limit_concurrency": None,
+    "backlog": 2048,
+    "timeout_keep_alive": 5,
+    "timeout_graceful_shutdown": 30,
+    "stateless_http": None,
+}
+
+
+def get_http_settings(config: dict) -> dict:
+    """config.yaml에서 HTTP 서버 설정 추출 (환경 변수 치환 후 문자열인 값은 형 변환)"""
+    http_config = (config.get("transport") or {}).get("http") or {}
+    settings = {**DEFAULT_HTTP_SETTINGS}
+    for key, default in DEFAULT_HTTP_SETTINGS.items():
+        value = http_config.get(key)
+        if value is None or value == "":
+            continue
+        if key in ("port", "workers", "limit_concurrency", "backlog",
+                   "timeout_keep_alive", "timeout_graceful_shutdown"):
+            value = int(value)
+        elif key == "stateless_http" and isinstance(value, str):
+            value = value.lower() == "true"
+        settings[key] = value
+    return settings
+
+
+def create_app():
+    """uvicorn 멀티 워커용 ASGI 앱 팩토리 (워커 프로세스마다 호출됨)"""
+    return mcp.http_app(
+        path=os.getenv("MCP_HTTP_PATH", DEFAULT_HTTP_SETTINGS["base_path"]),
+        stateless_http=os.getenv("MCP_STATELESS_HTTP", "false").lower() == "true",
     )
 
 
-def setup_signal_handlers():
-    """시그널 핸들러 설정"""
-    def signal_handler(sig, frame):
-        print("\n서버 종료 중...", file=sys.stderr)
-        sys.exit(0)
+def run_mcp_server_http(mcp_server: FastMCP, port: int = 8090, settings: dict | None = None):
+    """
+    FastMCP 2.x Streamable HTTP 서버 실행
+    
+    workers가 2 이상이면 같은 포트를 공유하는 워커 프로세스를 띄웁니다.
+    세션이 서로 다른 워커로 라우팅될 수 있으므로 이 경우 stateless HTTP 모드를 사용합니다.
+    SIGTERM/SIGINT를 받으면 uvicorn이 새 연결을 받지 않고 진행 중인 요청이 끝나기를
+    timeout_graceful_shutdown초까지 기다린 뒤 lifespan 종료(커넥션 풀 정리)를 수행합니다.
+    """
+    settings = {**DEFAULT_HTTP_SETTINGS, **(settings or {}), "port": port}
+    workers = max(1, settings["workers"])
+    stateless_http = settings["stateless_http"]
+    if stateless_http is None:
+        stateless_http = workers > 1
+    
+    print(
+        f"FastMCP Streamable HTTP 서버를 포트 {port}에서 시작합니다... "
+        f"(워커 {workers}개, stateless={stateless_http})",
+        file=sys.stderr
+    )
     
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    uvicorn_options = {
+        "host": settings["host"],
+        "port": port,
+        "workers": workers,
+        "loop": "uvloop",
+        "backlog": settings["backlog"],
+        "limit_concurrency": settings["limit_concurrency"],
+        "timeout_keep_alive": settings["timeout_keep_alive"],
+        "timeout_graceful_shutdown": settings["timeout_graceful_shutdown"],
+        "log_level": "info",
+    }
+    
+    if workers > 1:
+        # 워커 프로세스는 모듈을 새로 import하므로 설정을 환경 변수로 전달
+        os.environ["MCP_HTTP_PATH"] = settings["base_path"]
+        os.environ["MCP_STATELESS_HTTP"] = str(stateless_http).lower()
+        uvicorn.run("run_server:create_app", factory=True, **uvicorn_options)
+    else:
+        app = mcp_server.http_app(path=settings["base_path"], stateless_http=stateless_http)
+        uvicorn.run(app, **uvicorn_options)
 
 
 def main():
@@ -86,8 +144,20 @@ def main():
     parser.add_argument(
         "--port",
         type=int,
-        default=8090,
-        help="HTTP 서버 포트 (기본값: 8090)"
+        default=None,
+        help="HTTP 서버 포트 (기본값: config.yaml 또는 8090)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="워커 프로세스 수 (기본값: config.yaml 또는 1)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["live", "fake"],
+        default=None,
+        help="검색 백엔드 (live: LangConnect/Tavily, fake: 부하 테스트용 가짜 백엔드, 기본값: SEARCH_BACKEND 환경 변수)"
     )
     
     args = parser.parse_args()
@@ -106,15 +176,21 @@ def main():
         config = {}
         print("설정 파일 없음, 기본 설정 사용", file=sys.stderr)
     
-    # uvloop 설정
-    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    # 검색 백엔드 선택 (워커 프로세스에도 전달되도록 환경 변수로도 설정)
+    if args.backend:
+        os.environ["SEARCH_BACKEND"] = args.backend
+        configure_backends(args.backend)
+        print(f"검색 백엔드: {args.backend}", file=sys.stderr)
     
-    # 시그널 핸들러 설정
-    setup_signal_handlers()
+    # HTTP 서버 설정 (CLI 인자 > config.yaml > 기본값)
+    http_settings = get_http_settings(config)
+    if args.workers is not None:
+        http_settings["workers"] = args.workers
+    port = args.port or http_settings["port"]
     
     # FastMCP 2.x HTTP 서버 실행
     print("FastMCP HTTP 서버를 시작합니다...", file=sys.stderr)
-    run_mcp_server_http(mcp, args.port)
+    run_mcp_server_http(mcp, port, http_settings)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+"""All-Search MCP 서버의 검색 응답 직렬화 옵션
+
+필드 투영(fields), 쿼리 주변 스니펫으로 내용 줄이기(max_content_chars),
+열 단위(columnar) 배열 응답을 제공해 전송 크기와 하위 LLM 컨텍스트를 줄입니다.
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+
+# compact 모드에서 fields를 지정하지 않았을 때 포함할 필드
+DEFAULT_COMPACT_FIELDS = ["title", "url", "content", "score", "source"]
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+_ELLIPSIS = "…"
+
+
+def _get_field(result: Dict[str, Any], field: str) -> Any:
+    """필드 값 조회 ("metadata.published_date"처럼 점으로 하위 필드 지정 가능)"""
+    value: Any = result
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def snippet(content: str, query: str, max_chars: int) -> str:
+    """
+    쿼리 단어가 처음 등장하는 위치 주변으로 내용 자르기
+
+    쿼리 단어를 찾지 못하면 앞부분을 자릅니다.
+    """
+    if len(content) <= max_chars:
+        return content
+
+    lowered = content.lower()
+    positions = [
+        lowered.find(term)
+        for term in _WORD_PATTERN.findall(query.lower())
+        if len(term) > 1
+    ]
+    positions = [pos for pos in positions if pos >= 0]
+
+    start = 0
+    if positions:
+        # 매치 앞쪽 문맥을 1/3 정도 남김
+        start = max(0, min(min(positions) - max_chars // 3, len(content) - max_chars))
+    end = start + max_chars
+
+    text = content[start:end].strip()
+    if start > 0:
+        text = _ELLIPSIS + text
+    if end < len(content):
+        text = text + _ELLIPSIS
+    return text
+
+
+def _shrink(
+    result: Dict[str, Any],
+    query: str,
+    fields: Optional[List[str]],
+    max_content_chars: Optional[int],
+) -> Dict[str, Any]:
+    """단일 결과에 필드 투영과 내용 줄이기 적용"""
+    if fields:
+        item = {field: _get_field(result, field) for field in fields}
+    else:
+        item = dict(result)
+    if max_content_chars and isinstance(item.get("content"), str):
+        item["content"] = snippet(item["content"], query, max_content_chars)
+    if isinstance(item.get("score"), float):
+        item["score"] = round(item["score"], 4)
+    return item
+
+
+def format_results(
+    results: List[Dict[str, Any]],
+    query: str,
+    compact: bool = False,
+    fields: Optional[List[str]] = None,
+    max_content_chars: Optional[int] = None,
+) -> Any:
+    """
+    검색 결과 목록에 응답 형식 옵션 적용
+
+    Args:
+        results: 검색 결과 목록
+        query: 스니펫 위치를 정할 검색 쿼리
+        compact: True면 {"columns": {필드: [...]}} 형태의 열 단위 응답
+        fields: 포함할 필드 목록 (None이면 전체, compact 모드에서는 DEFAULT_COMPACT_FIELDS)
+        max_content_chars: 내용 최대 길이 (쿼리 단어 주변 스니펫으로 자름)
+
+    Returns:
+        옵션이 없으면 원본 목록, compact=False면 결과 목록, compact=True면 열 단위 딕셔너리
+    """
+    if not compact and not fields and not max_content_chars:
+        return results
+
+    errors = [result for result in results if "error" in result]
+    items = [result for result in results if "error" not in result]
+
+    if not compact:
+        return [_shrink(item, query, fields, max_content_chars) for item in items] + errors
+
+    columns_fields = fields or DEFAULT_COMPACT_FIELDS
+    rows = [_shrink(item, query, columns_fields, max_content_chars) for item in items]
+    response: Dict[str, Any] = {
+        "format": "columnar",
+        "count": len(rows),
+        "columns": {field: [row[field] for row in rows] for field in columns_fields},
+    }
+    if errors:
+        response["errors"] = errors
+    return response
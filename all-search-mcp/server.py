@@ -1,35 +1,262 @@
 """All-Search MCP Server: LangConnect(벡터 검색)와 Tavily(웹 검색)를 통합하는 MCP 서버"""
 import os
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Literal
 from datetime import datetime
 import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 import httpx
 
-from fastmcp import FastMCP
+from fastmcp import FastMCP, Context
+from fastmcp.server.dependencies import get_http_headers, get_http_request
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
+from http_pool import HTTPClientPool, PoolSettings
+from cache import SearchCache, make_cache_key
+from fusion import FusionMethod, fuse_results
+from resilience import BackendGuard, CircuitBreaker, CircuitOpenError, STATE_CLOSED, STATE_HALF_OPEN
+from health import HealthProber
+from serialization import format_results
+from rate_limit import FairQueue, RateLimiter, RateLimitExceeded, TokenBucket, parse_weights
+from backends import (
+    LangConnectBackend,
+    TavilyBackend,
+    FakeVectorBackend,
+    FakeWebBackend,
+    VectorSearchBackend,
+    WebSearchBackend,
+)
+
+try:
+    from agents.core.constants import (
+        CACHE_TTL,
+        CACHE_MAX_SIZE,
+        RATE_LIMIT_REQUESTS,
+        RATE_LIMIT_WINDOW,
+        ERROR_RATE_LIMIT,
+    )
+except ImportError:
+    # MCP 서버만 단독 배포하는 경우 agents 패키지가 없을 수 있음
+    CACHE_TTL, CACHE_MAX_SIZE = 3600, 1000
+    RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW = 100, 60
+    ERROR_RATE_LIMIT = "요청 한도를 초과했습니다."
+
 # 환경 변수 로드
 load_dotenv()
 
-# MCP 서버 인스턴스 생성
-mcp = FastMCP(name="All-Search MCP Server")
-
 # 설정
 LANGCONNECT_API_URL = os.getenv("LANGCONNECT_API_URL", "http://localhost:8080")
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY", "")
 TAVILY_API_URL = "https://api.tavily.com/search"
 
+# 백엔드별 커넥션 풀 (서버 수명 동안 keep-alive 연결 재사용)
+http_pool = HTTPClientPool({
+    "langconnect": PoolSettings(
+        max_connections=int(os.getenv("LANGCONNECT_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("LANGCONNECT_MAX_KEEPALIVE", "10")),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+        connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+        read_timeout=float(os.getenv("LANGCONNECT_TIMEOUT", "30")),
+    ),
+    "tavily": PoolSettings(
+        max_connections=int(os.getenv("TAVILY_MAX_CONNECTIONS", "10")),
+        max_keepalive_connections=int(os.getenv("TAVILY_MAX_KEEPALIVE", "5")),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+        connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+        read_timeout=float(os.getenv("TAVILY_TIMEOUT", "30")),
+    ),
+})
+
+
+# 백엔드별 회로 차단기 + 적응형 타임아웃 (p95 지연 시간 기반)
+backend_guards = {
+    "langconnect": BackendGuard(
+        "langconnect",
+        CircuitBreaker(
+            failure_threshold=int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")),
+            recovery_timeout=float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "30")),
+        ),
+        min_timeout=float(os.getenv("LANGCONNECT_MIN_TIMEOUT", "1")),
+        max_timeout=float(os.getenv("LANGCONNECT_TIMEOUT", "30")),
+    ),
+    "tavily": BackendGuard(
+        "tavily",
+        CircuitBreaker(
+            failure_threshold=int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")),
+            recovery_timeout=float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "30")),
+        ),
+        min_timeout=float(os.getenv("TAVILY_MIN_TIMEOUT", "3")),
+        max_timeout=float(os.getenv("TAVILY_TIMEOUT", "30")),
+    ),
+}
+
+# 배치 검색 설정
+BATCH_MAX_CONCURRENCY = int(os.getenv("SEARCH_BATCH_CONCURRENCY", "10"))
+BATCH_MAX_QUERIES = int(os.getenv("SEARCH_BATCH_MAX_QUERIES", "50"))
+
+# 검색 결과 캐시 (웹 결과는 빨리 바뀌므로 TTL을 짧게 유지)
+search_cache = SearchCache(
+    ttls={
+        "vector": float(os.getenv("SEARCH_CACHE_VECTOR_TTL", str(CACHE_TTL))),
+        "web": float(os.getenv("SEARCH_CACHE_WEB_TTL", "300")),
+    },
+    max_size=int(os.getenv("SEARCH_CACHE_MAX_SIZE", str(CACHE_MAX_SIZE))),
+    max_bytes=int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    enabled=os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true",
+)
+
+# 요청 한도 (호출자별 토큰 버킷 + 백엔드별 가중 공정 큐)
+# 호출자는 X-Client-Id 헤더로 구분하며, 캐시 미스로 실제 백엔드를 호출할 때만 백엔드 토큰을 소비
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "5"))
+RATE_LIMIT_MAX_QUEUE = int(os.getenv("RATE_LIMIT_MAX_QUEUE", "100"))
+rate_limiter = RateLimiter(
+    requests=int(os.getenv("RATE_LIMIT_REQUESTS", str(RATE_LIMIT_REQUESTS))),
+    window=float(os.getenv("RATE_LIMIT_WINDOW", str(RATE_LIMIT_WINDOW))),
+    backends={
+        "langconnect": FairQueue(
+            "langconnect",
+            TokenBucket(
+                rate=float(os.getenv("LANGCONNECT_RATE_LIMIT", "50")),
+                capacity=float(os.getenv("LANGCONNECT_RATE_BURST", "100")),
+            ),
+            max_queue=RATE_LIMIT_MAX_QUEUE,
+            max_wait=RATE_LIMIT_MAX_WAIT,
+        ),
+        "tavily": FairQueue(
+            "tavily",
+            TokenBucket(
+                rate=float(os.getenv("TAVILY_RATE_LIMIT", "5")),
+                capacity=float(os.getenv("TAVILY_RATE_BURST", "10")),
+            ),
+            max_queue=RATE_LIMIT_MAX_QUEUE,
+            max_wait=RATE_LIMIT_MAX_WAIT,
+        ),
+    },
+    weights=parse_weights(os.getenv("RATE_LIMIT_WEIGHTS", "")),
+    enabled=os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true",
+)
+
+# 현재 요청의 호출자 (single-flight 로더 태스크에도 컨텍스트가 복사되어 전달됨)
+current_caller: ContextVar[str] = ContextVar("current_caller", default="anonymous")
+
+
+def _resolve_caller() -> str:
+    """요청 호출자 식별 (X-Client-Id 헤더 > 클라이언트 주소 > anonymous)"""
+    caller = get_http_headers().get("x-client-id")
+    if caller:
+        return caller
+    try:
+        client = get_http_request().client
+    except RuntimeError:
+        # stdio 등 HTTP 요청이 없는 transport
+        client = None
+    return client.host if client else "anonymous"
+
+
+def _enter_request(cost: float = 1.0) -> str:
+    """
+    호출자를 식별해 컨텍스트에 기록하고 호출자 한도 확인
+    
+    Raises:
+        RateLimitExceeded: 호출자 한도를 초과한 경우
+    """
+    caller = _resolve_caller()
+    current_caller.set(caller)
+    rate_limiter.check_caller(caller, cost)
+    return caller
+
+
+def _rate_limit_error(e: RateLimitExceeded) -> Dict[str, Any]:
+    """요청 한도 초과 응답 (클라이언트는 retry_after초 뒤 재시도)"""
+    return {
+        "error": ERROR_RATE_LIMIT,
+        "message": str(e),
+        "rate_limited": True,
+        "scope": e.scope,
+        "retry_after": round(e.retry_after, 2)
+    }
+
+
+# 검색 백엔드 어댑터 (SEARCH_BACKEND=fake면 지연 시간·오류율을 설정할 수 있는 가짜 백엔드 사용)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "live")
+vector_backend: VectorSearchBackend
+web_backend: WebSearchBackend
+
+
+def configure_backends(mode: str = "live") -> None:
+    """검색 백엔드 어댑터 선택 (live/fake)"""
+    global SEARCH_BACKEND, vector_backend, web_backend
+    if mode == "live":
+        vector_backend = LangConnectBackend(LANGCONNECT_API_URL, http_pool.get("langconnect"))
+        web_backend = TavilyBackend(TAVILY_API_URL, TAVILY_API_KEY, http_pool.get("tavily"))
+    elif mode == "fake":
+        seed = int(os.getenv("FAKE_SEED", "42"))
+        sigma = float(os.getenv("FAKE_LATENCY_SIGMA", "0.5"))
+        vector_backend = FakeVectorBackend(
+            latency_ms=float(os.getenv("FAKE_VECTOR_LATENCY_MS", "50")),
+            latency_sigma=sigma,
+            error_rate=float(os.getenv("FAKE_VECTOR_ERROR_RATE", "0")),
+            seed=seed,
+        )
+        web_backend = FakeWebBackend(
+            latency_ms=float(os.getenv("FAKE_WEB_LATENCY_MS", "1500")),
+            latency_sigma=sigma,
+            error_rate=float(os.getenv("FAKE_WEB_ERROR_RATE", "0")),
+            seed=seed + 1,
+        )
+    else:
+        raise ValueError(f"지원하지 않는 검색 백엔드입니다: {mode} (live/fake)")
+    SEARCH_BACKEND = mode
+    search_cache.clear()
+
+
+configure_backends(SEARCH_BACKEND)
+
+
+async def _probe_langconnect() -> str:
+    """벡터 검색 백엔드 점검 (LangConnect /health)"""
+    return await vector_backend.health(HEALTH_CHECK_TIMEOUT)
+
+
+async def _probe_tavily() -> str:
+    """Tavily 상태 점검 (API 할당량을 쓰지 않도록 실제 트래픽의 회로 차단기 상태로 판단)"""
+    if not web_backend.configured:
+        return "not configured"
+    state = backend_guards["tavily"].breaker.state
+    if state == STATE_CLOSED:
+        return "healthy"
+    return "degraded" if state == STATE_HALF_OPEN else "unhealthy"
 
-class SearchResult(BaseModel):
-    """검색 결과 모델"""
-    title: str = Field(description="제목")
-    content: str = Field(description="내용")
-    url: Optional[str] = Field(default=None, description="URL")
-    source: str = Field(description="출처 (web/vector)")
-    score: float = Field(description="관련성 점수")
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="추가 메타데이터")
+
+# 백그라운드 헬스 체크 (상태 리소스는 이 스냅샷을 즉시 반환)
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "30"))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))
+health_prober = HealthProber(
+    {"langconnect": _probe_langconnect, "tavily": _probe_tavily},
+    interval=HEALTH_CHECK_INTERVAL,
+    timeout=HEALTH_CHECK_TIMEOUT,
+)
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """서버 시작 시 커넥션 풀과 헬스 체크를 시작하고 종료 시 정리"""
+    await http_pool.start()
+    health_prober.start()
+    try:
+        yield
+    finally:
+        await health_prober.stop()
+        await http_pool.close()
+
+
+# MCP 서버 인스턴스 생성
+# 서버 버전 (클라이언트는 이 버전이 바뀔 때만 도구 스키마를 다시 받으므로 도구가 바뀌면 올려야 함)
+MCP_SERVER_VERSION = "1.1.0"
+
+mcp = FastMCP(name="All-Search MCP Server", version=MCP_SERVER_VERSION, lifespan=lifespan)
 
 
 class VectorSearchParams(BaseModel):
@@ -46,50 +273,66 @@ class WebSearchParams(BaseModel):
     search_depth: str = Field(default="basic", description="검색 깊이 (basic/advanced)")
 
 
+class BatchSearchQuery(BaseModel):
+    """배치 검색의 개별 쿼리"""
+    query: str = Field(description="검색 쿼리")
+    backend: Literal["vector", "web", "all"] = Field(default="all", description="검색 백엔드 (vector/web/all)")
+    collection: str = Field(default="default", description="벡터 검색 컬렉션 이름")
+    top_k: int = Field(default=5, description="벡터 검색 결과 수")
+    max_results: int = Field(default=5, description="웹 검색 최대 결과 수")
+    search_depth: str = Field(default="basic", description="웹 검색 깊이 (basic/advanced)")
+
+
+def _is_cacheable(results: List[Dict[str, Any]]) -> bool:
+    """오류 결과는 캐시하지 않음"""
+    return not any("error" in result for result in results)
+
+
 async def _search_vector_impl(
     query: str,
     collection: str = "default",
     top_k: int = 5
 ) -> List[Dict[str, Any]]:
-    """벡터 검색 내부 구현"""
+    """벡터 검색 내부 구현 (캐시 적용)"""
+    key = make_cache_key("search_vector", query, collection=collection, limit=top_k)
+    return await search_cache.get_or_load(
+        "vector",
+        key,
+        lambda: _fetch_vector_results(query, collection, top_k),
+        should_cache=_is_cacheable,
+    )
+
+
+async def _fetch_vector_results(
+    query: str,
+    collection: str = "default",
+    top_k: int = 5
+) -> List[Dict[str, Any]]:
+    """벡터 검색 백엔드 호출"""
     try:
-        async with httpx.AsyncClient() as client:
-            # LangConnect API 호출
-            response = await client.post(
-                f"{LANGCONNECT_API_URL}/collections/{collection}/search",
-                json={
-                    "query": query,
-                    "top_k": top_k,
-                    "metadata_filter": {}
-                }
-            )
-            
-            if response.status_code != 200:
-                return [{
-                    "error": f"LangConnect API error: {response.status_code}",
-                    "message": response.text
-                }]
-            
-            data = response.json()
-            results = []
-            
-            # 결과 포맷팅
-            for item in data.get("results", []):
-                result = SearchResult(
-                    title=item.get("metadata", {}).get("title", "제목 없음"),
-                    content=item.get("content", ""),
-                    source="vector",
-                    score=item.get("score", 0.0),
-                    metadata={
-                        "collection": collection,
-                        "document_id": item.get("id", ""),
-                        "created_at": item.get("metadata", {}).get("created_at", "")
-                    }
-                )
-                results.append(result.dict())
-            
-            return results
-            
+        # 백엔드 공정 큐 대기 후 공유 커넥션 풀 + 회로 차단기/적응형 타임아웃
+        await rate_limiter.acquire_backend("langconnect", current_caller.get())
+        return await backend_guards["langconnect"].call(
+            lambda timeout: vector_backend.search(query, collection, top_k, timeout)
+        )
+        
+    except RateLimitExceeded as e:
+        return [_rate_limit_error(e)]
+    except CircuitOpenError as e:
+        return [{
+            "error": "LangConnect 회로 차단기가 열려 있습니다",
+            "message": str(e)
+        }]
+    except httpx.TimeoutException:
+        return [{
+            "error": "LangConnect 응답 시간 초과",
+            "message": f"URL: {LANGCONNECT_API_URL}"
+        }]
+    except httpx.HTTPStatusError as e:
+        return [{
+            "error": f"LangConnect API error: {e.response.status_code}",
+            "message": e.response.text
+        }]
     except httpx.ConnectError:
         return [{
             "error": "LangConnect 서버에 연결할 수 없습니다",
@@ -106,8 +349,11 @@ async def _search_vector_impl(
 async def search_vector(
     query: str,
     collection: str = "default",
-    top_k: int = 5
-) -> List[Dict[str, Any]]:
+    top_k: int = 5,
+    compact: bool = False,
+    fields: Optional[List[str]] = None,
+    max_content_chars: Optional[int] = None
+) -> List[Dict[str, Any]] | Dict[str, Any]:
     """
     LangConnect를 통한 벡터 데이터베이스 검색
     
@@ -115,11 +361,20 @@ async def search_vector(
         query: 검색 쿼리
         collection: 검색할 컬렉션 이름
         top_k: 반환할 최대 결과 수
+        compact: True면 {"columns": {필드: [...]}} 형태의 열 단위 응답
+        fields: 포함할 필드 목록 (예: ["title", "url", "score"], "metadata.x"로 하위 필드 지정)
+        max_content_chars: 내용 최대 길이 (쿼리 단어 주변 스니펫으로 자름)
     
     Returns:
-        검색 결과 목록
+        검색 결과 목록 (compact=True면 열 단위 딕셔너리)
     """
-    return await _search_vector_impl(query, collection, top_k)
+    try:
+        _enter_request()
+    except RateLimitExceeded as e:
+        return format_results([_rate_limit_error(e)], query, compact, fields, max_content_chars)
+    
+    results = await _search_vector_impl(query, collection, top_k)
+    return format_results(results, query, compact, fields, max_content_chars)
 
 
 async def _search_web_impl(
@@ -127,64 +382,54 @@ async def _search_web_impl(
     max_results: int = 5,
     search_depth: str = "basic"
 ) -> List[Dict[str, Any]]:
-    """웹 검색 내부 구현"""
-    if not TAVILY_API_KEY:
+    """웹 검색 내부 구현 (캐시 적용)"""
+    key = make_cache_key(
+        "search_web", query, limit=max_results, search_depth=search_depth
+    )
+    return await search_cache.get_or_load(
+        "web",
+        key,
+        lambda: _fetch_web_results(query, max_results, search_depth),
+        should_cache=_is_cacheable,
+    )
+
+
+async def _fetch_web_results(
+    query: str,
+    max_results: int = 5,
+    search_depth: str = "basic"
+) -> List[Dict[str, Any]]:
+    """웹 검색 백엔드 호출"""
+    if not web_backend.configured:
         return [{
             "error": "Tavily API 키가 설정되지 않았습니다",
             "message": "환경 변수 TAVILY_API_KEY를 설정하세요"
         }]
     
     try:
-        async with httpx.AsyncClient() as client:
-            # Tavily API 호출
-            response = await client.post(
-                TAVILY_API_URL,
-                json={
-                    "api_key": TAVILY_API_KEY,
-                    "query": query,
-                    "max_results": max_results,
-                    "search_depth": search_depth,
-                    "include_answer": True,
-                    "include_raw_content": False
-                }
-            )
-            
-            if response.status_code != 200:
-                return [{
-                    "error": f"Tavily API error: {response.status_code}",
-                    "message": response.text
-                }]
-            
-            data = response.json()
-            results = []
-            
-            # 결과 포맷팅
-            for item in data.get("results", []):
-                result = SearchResult(
-                    title=item.get("title", ""),
-                    content=item.get("content", ""),
-                    url=item.get("url", ""),
-                    source="web",
-                    score=item.get("score", 0.0),
-                    metadata={
-                        "published_date": item.get("published_date", ""),
-                        "search_date": datetime.now().isoformat()
-                    }
-                )
-                results.append(result.dict())
-            
-            # Tavily의 AI 생성 답변도 포함
-            if data.get("answer"):
-                results.insert(0, {
-                    "title": "AI 생성 답변",
-                    "content": data["answer"],
-                    "source": "web",
-                    "score": 1.0,
-                    "metadata": {"type": "ai_answer"}
-                })
-            
-            return results
-            
+        # 백엔드 공정 큐 대기 후 공유 커넥션 풀 + 회로 차단기/적응형 타임아웃
+        await rate_limiter.acquire_backend("tavily", current_caller.get())
+        return await backend_guards["tavily"].call(
+            lambda timeout: web_backend.search(query, max_results, search_depth, timeout)
+        )
+        
+    except RateLimitExceeded as e:
+        return [_rate_limit_error(e)]
+    except CircuitOpenError as e:
+        return [{
+            "error": "Tavily 회로 차단기가 열려 있습니다",
+            "message": str(e)
+        }]
+    except httpx.TimeoutException:
+        return [{
+            "error": "Tavily API 응답 시간 초과",
+            "message": "잠시 후 다시 시도하세요"
+        }]
+    except httpx.HTTPStatusError as e:
+        return [{
+            "error": f"Tavily API error: {e.response.status_code}",
+            "message": e.response.text
+        }]
     except httpx.ConnectError:
         return [{
             "error": "Tavily API에 연결할 수 없습니다",
@@ -201,8 +446,11 @@ async def _search_web_impl(
 async def search_web(
     query: str,
     max_results: int = 5,
-    search_depth: str = "basic"
-) -> List[Dict[str, Any]]:
+    search_depth: str = "basic",
+    compact: bool = False,
+    fields: Optional[List[str]] = None,
+    max_content_chars: Optional[int] = None
+) -> List[Dict[str, Any]] | Dict[str, Any]:
     """
     Tavily API를 통한 웹 검색
     
@@ -210,89 +458,283 @@ async def search_web(
         query: 검색 쿼리
         max_results: 최대 결과 수
         search_depth: 검색 깊이 (basic/advanced)
+        compact: True면 {"columns": {필드: [...]}} 형태의 열 단위 응답
+        fields: 포함할 필드 목록 (예: ["title", "url", "score"], "metadata.x"로 하위 필드 지정)
+        max_content_chars: 내용 최대 길이 (쿼리 단어 주변 스니펫으로 자름)
     
     Returns:
-        검색 결과 목록
+        검색 결과 목록 (compact=True면 열 단위 딕셔너리)
     """
-    return await _search_web_impl(query, max_results, search_depth)
+    try:
+        _enter_request()
+    except RateLimitExceeded as e:
+        return format_results([_rate_limit_error(e)], query, compact, fields, max_content_chars)
+    
+    results = await _search_web_impl(query, max_results, search_depth)
+    return format_results(results, query, compact, fields, max_content_chars)
 
 
 @mcp.tool()
 async def search_all(
     query: str,
     collection: str = "default",
-    max_results: int = 10
+    max_results: int = 10,
+    deadline_ms: Optional[int] = None,
+    fusion: Optional[FusionMethod] = None,
+    top_n: int = 10,
+    compact: bool = False,
+    fields: Optional[List[str]] = None,
+    max_content_chars: Optional[int] = None,
+    ctx: Optional[Context] = None
 ) -> Dict[str, Any]:
     """
     벡터 검색과 웹 검색을 동시에 수행하는 통합 검색
     
+    클라이언트가 progress token을 보내면 각 백엔드의 결과가 도착하는 즉시
+    progress 알림으로 전송됩니다. deadline_ms를 지정하면 그 시간 안에 도착한
+    결과만 반환하고, 늦은 백엔드는 timed_out으로 표시합니다.
+    
+    fusion을 지정하면 두 목록을 RRF("rrf") 또는 min-max 정규화 점수("minmax")로
+    하나의 순위 목록으로 합치고 중복을 제거한 뒤 상위 top_n개만 반환합니다.
+    
+    호출자(X-Client-Id 헤더)별 요청 한도를 넘으면 검색하지 않고
+    rate_limited와 retry_after가 포함된 오류를 반환합니다.
+    
     Args:
         query: 검색 쿼리
         collection: 벡터 검색에 사용할 컬렉션
         max_results: 각 검색 유형별 최대 결과 수
+        deadline_ms: 응답 마감 시간(밀리초, 기본값: 모든 백엔드 대기)
+        fusion: 결과 융합 방식 (rrf/minmax, 기본값: 융합하지 않음)
+        top_n: 융합 시 반환할 최대 결과 수
+        compact: True면 {"columns": {필드: [...]}} 형태의 열 단위 응답
+        fields: 포함할 필드 목록 (예: ["title", "url", "score"], "metadata.x"로 하위 필드 지정)
+        max_content_chars: 내용 최대 길이 (쿼리 단어 주변 스니펫으로 자름)
     
     Returns:
         {"vector": [...], "web": [...]} 형태의 통합 검색 결과
+        (fusion 지정 시 {"results": [...], "errors": {...}} 형태)
     """
+    try:
+        _enter_request(cost=2)
+    except RateLimitExceeded as e:
+        return {
+            **_rate_limit_error(e),
+            "query": query,
+            "timestamp": datetime.now().isoformat()
+        }
+    
     # 병렬로 두 검색 실행 (내부 구현 함수들을 직접 호출)
-    vector_task = _search_vector_impl(query, collection, max_results)
-    web_task = _search_web_impl(query, max_results)
+    tasks = {
+        asyncio.ensure_future(_search_vector_impl(query, collection, max_results)): "vector",
+        asyncio.ensure_future(_search_web_impl(query, max_results)): "web",
+    }
+    results: Dict[str, List[Dict[str, Any]]] = {}
     
-    vector_results, web_results = await asyncio.gather(
-        vector_task, web_task, return_exceptions=True
-    )
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_ms / 1000 if deadline_ms else None
+    pending = set(tasks)
     
-    # 에러 처리
-    if isinstance(vector_results, Exception):
-        vector_results = [{
-            "error": "벡터 검색 실패",
-            "message": str(vector_results)
-        }]
+    while pending:
+        timeout = None if deadline is None else deadline - loop.time()
+        if timeout is not None and timeout <= 0:
+            break
+        done, pending = await asyncio.wait(
+            pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done:
+            backend = tasks[task]
+            try:
+                results[backend] = task.result()
+            except Exception as e:
+                # 에러 처리
+                results[backend] = [{
+                    "error": f"{'벡터' if backend == 'vector' else '웹'} 검색 실패",
+                    "message": str(e)
+                }]
+            await _report_partial_results(
+                ctx, backend, results, len(tasks), query, compact, fields, max_content_chars
+            )
     
-    if isinstance(web_results, Exception):
-        web_results = [{
-            "error": "웹 검색 실패",
-            "message": str(web_results)
+    # 마감 시간 내에 응답하지 않은 백엔드 처리
+    # (캐시의 single-flight 호출은 계속 진행되어 이후 요청에서 재사용됨)
+    timed_out = []
+    for task in pending:
+        task.cancel()
+        backend = tasks[task]
+        timed_out.append(backend)
+        results[backend] = [{
+            "error": f"{'벡터' if backend == 'vector' else '웹'} 검색 시간 초과",
+            "message": f"{deadline_ms}ms 안에 응답하지 않았습니다",
+            "timed_out": True
         }]
     
+    if fusion:
+        return {
+            "results": format_results(
+                fuse_results(results, method=fusion, top_n=top_n),
+                query, compact, fields, max_content_chars
+            ),
+            "errors": {
+                backend: [item for item in items if "error" in item]
+                for backend, items in results.items()
+                if any("error" in item for item in items)
+            },
+            "fusion": fusion,
+            "query": query,
+            "timed_out": sorted(timed_out),
+            "timestamp": datetime.now().isoformat()
+        }
+    
     return {
-        "vector": vector_results,
-        "web": web_results,
+        "vector": format_results(results["vector"], query, compact, fields, max_content_chars),
+        "web": format_results(results["web"], query, compact, fields, max_content_chars),
         "query": query,
+        "timed_out": sorted(timed_out),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+async def _report_partial_results(
+    ctx: Optional[Context],
+    backend: str,
+    results: Dict[str, List[Dict[str, Any]]],
+    total: int,
+    query: str,
+    compact: bool = False,
+    fields: Optional[List[str]] = None,
+    max_content_chars: Optional[int] = None
+) -> None:
+    """도착한 백엔드 결과를 최종 응답과 같은 형식(format_results)으로 progress 알림 전송"""
+    if ctx is None:
+        return
+    try:
+        await ctx.report_progress(
+            progress=len(results),
+            total=total,
+            message=json.dumps(
+                {
+                    "backend": backend,
+                    "results": format_results(results[backend], query, compact, fields, max_content_chars)
+                },
+                ensure_ascii=False,
+                default=str
+            )
+        )
+    except Exception:
+        # 알림 전송 실패가 검색 결과 반환을 막지 않도록 무시
+        pass
+
+
+async def _run_batch_query(item: BatchSearchQuery) -> Dict[str, List[Dict[str, Any]]]:
+    """배치 검색의 개별 쿼리 실행"""
+    tasks = {}
+    if item.backend in ("vector", "all"):
+        tasks["vector"] = _search_vector_impl(item.query, item.collection, item.top_k)
+    if item.backend in ("web", "all"):
+        tasks["web"] = _search_web_impl(item.query, item.max_results, item.search_depth)
+    
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    
+    output = {}
+    for backend, result in zip(tasks.keys(), results):
+        if isinstance(result, Exception):
+            result = [{
+                "error": f"{backend} 검색 실패",
+                "message": str(result)
+            }]
+        output[backend] = result
+    return output
+
+
+@mcp.tool()
+async def search_batch(
+    queries: List[BatchSearchQuery],
+    max_concurrency: int = BATCH_MAX_CONCURRENCY
+) -> Dict[str, Any]:
+    """
+    여러 쿼리를 한 번의 호출로 동시에 검색하는 배치 검색
+    
+    각 쿼리는 자신의 백엔드(vector/web/all)와 파라미터를 가지며,
+    max_concurrency 개수만큼만 동시에 실행됩니다. 결과는 queries와 같은 순서의 목록이므로
+    같은 쿼리를 다른 컬렉션이나 파라미터로 여러 번 보내도 결과가 섞이지 않습니다.
+    
+    Args:
+        queries: 검색할 쿼리 목록
+        max_concurrency: 동시에 실행할 최대 쿼리 수
+    
+    Returns:
+        {"results": [{"query": ..., "backend": ..., "vector": [...], "web": [...]}, ...], ...} 형태의
+        배치 검색 결과 (요청한 백엔드의 결과만 포함)
+    """
+    if len(queries) > BATCH_MAX_QUERIES:
+        return {
+            "error": "배치 쿼리 수 초과",
+            "message": f"한 번에 최대 {BATCH_MAX_QUERIES}개의 쿼리만 검색할 수 있습니다",
+        }
+    
+    # 배치는 백엔드 호출 수만큼 호출자 토큰을 소비
+    try:
+        _enter_request(cost=sum(2 if item.backend == "all" else 1 for item in queries))
+    except RateLimitExceeded as e:
+        return {
+            **_rate_limit_error(e),
+            "query_count": len(queries),
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    semaphore = asyncio.Semaphore(max(1, min(max_concurrency, BATCH_MAX_CONCURRENCY)))
+    
+    async def run(item: BatchSearchQuery) -> Dict[str, List[Dict[str, Any]]]:
+        async with semaphore:
+            return await _run_batch_query(item)
+    
+    outputs = await asyncio.gather(*(run(item) for item in queries))
+    results = [
+        {"query": item.query, "backend": item.backend, **output}
+        for item, output in zip(queries, outputs)
+    ]
+    
+    return {
+        "results": results,
+        "query_count": len(queries),
         "timestamp": datetime.now().isoformat()
     }
 
 
 @mcp.resource("search://status")
 async def get_search_status() -> str:
-    """검색 서버 상태 확인"""
+    """검색 서버 상태 확인 (백그라운드 헬스 체크 스냅샷 반환)"""
+    if not health_prober.running:
+        health_prober.start()
+    
+    health = health_prober.snapshot()
+    breakers = {name: guard.stats() for name, guard in backend_guards.items()}
     status = {
         "server": "All-Search MCP Server",
-        "version": "1.0.0",
+        "version": MCP_SERVER_VERSION,
         "services": {
             "langconnect": {
                 "url": LANGCONNECT_API_URL,
-                "status": "unknown"
+                "backend": type(vector_backend).__name__,
+                **health["langconnect"],
+                "circuit_breaker": breakers["langconnect"]["state"]
             },
             "tavily": {
-                "configured": bool(TAVILY_API_KEY),
-                "status": "configured" if TAVILY_API_KEY else "not configured"
+                "configured": web_backend.configured,
+                "backend": type(web_backend).__name__,
+                **health["tavily"],
+                "circuit_breaker": breakers["tavily"]["state"]
             }
         },
+        "health_check_interval": HEALTH_CHECK_INTERVAL,
+        "connection_pools": http_pool.stats(),
+        "cache": search_cache.stats(),
+        "circuit_breakers": breakers,
+        "rate_limits": rate_limiter.stats(),
         "timestamp": datetime.now().isoformat()
     }
     
-    # LangConnect 연결 테스트
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{LANGCONNECT_API_URL}/health")
-            if response.status_code == 200:
-                status["services"]["langconnect"]["status"] = "healthy"
-            else:
-                status["services"]["langconnect"]["status"] = "unhealthy"
-    except:
-        status["services"]["langconnect"]["status"] = "unreachable"
-    
     return json.dumps(status, indent=2, ensure_ascii=False)
 
 
@@ -308,7 +750,8 @@ async def search_prompt(topic: str) -> str:
 검색 도구:
 - search_vector: 내부 문서 검색
 - search_web: 웹 검색
-- search_all: 통합 검색"""
+- search_all: 통합 검색
+- search_batch: 여러 쿼리 배치 검색"""
 
 
 if __name__ == "__main__":